@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:10
+
+from django.db import migrations
+
+# canonical key -> (display name, alternative spellings)
+COMMON_SKILLS = {
+    "javascript": ("JavaScript", ["js", "ecmascript", "es6"]),
+    "typescript": ("TypeScript", ["ts"]),
+    "python": ("Python", ["py", "python3"]),
+    "react": ("React", ["reactjs", "react.js"]),
+    "node.js": ("Node.js", ["node", "nodejs"]),
+    "vue": ("Vue", ["vuejs", "vue.js"]),
+    "angular": ("Angular", ["angularjs"]),
+    "django": ("Django", ["django rest framework", "drf"]),
+    "postgresql": ("PostgreSQL", ["postgres", "psql"]),
+    "go": ("Go", ["golang"]),
+    "kubernetes": ("Kubernetes", ["k8s"]),
+    "amazon web services": ("Amazon Web Services", ["aws"]),
+    "machine learning": ("Machine Learning", ["ml"]),
+    "c++": ("C++", ["cpp"]),
+    "c#": ("C#", ["csharp", "c sharp"]),
+    "ui/ux design": ("UI/UX Design", ["ui/ux", "ux", "ui design", "ux design"]),
+}
+
+
+def seed_skills(apps, schema_editor):
+    Skill = apps.get_model("accounts", "Skill")
+    SkillAlias = apps.get_model("accounts", "SkillAlias")
+    for key, (name, alternatives) in COMMON_SKILLS.items():
+        skill, _ = Skill.objects.get_or_create(key=key, defaults={"name": name})
+        for alias in [key, *alternatives]:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={"skill": skill})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_skill_skillalias_profile_skill_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_skills, migrations.RunPython.noop),
+    ]
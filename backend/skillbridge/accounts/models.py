@@ -60,6 +60,23 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 
 
+class Skill(models.Model):
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)  # normalized lowercase form
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling of a skill, e.g. "reactjs" -> React. Every skill has an alias for its own key."""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
 class Profile(models.Model):
     TAG_CHOICES = (
         ("Unverified", "Unverified"),
@@ -73,6 +90,7 @@ class Profile(models.Model):
     location = models.CharField(max_length=255, blank=True)
     bio = models.TextField(blank=True)
     skills = models.TextField(blank=True)
+    skill_tags = models.ManyToManyField(Skill, related_name="profiles", blank=True)
     experience_level = models.CharField(max_length=50, blank=True)
     portfolio_links = models.TextField(blank=True)
     github_url = models.URLField(blank=True, null=True)
@@ -80,10 +98,33 @@ class Profile(models.Model):
 
     verification_tag = models.CharField(max_length=20, choices=TAG_CHOICES, default="Unverified")
     star_rating = models.DecimalField(max_digits=2, decimal_places=1, default=0.0)  
+    # Changes only when the profile itself is saved, i.e. edited: the feed,
+    # ETags and precomputed recommendations are all keyed on it
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.email} Profile"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+
+    def has_changes(self):
+        """Whether a field differs from what was loaded or last saved; new instances always do."""
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return True
+        return any(getattr(self, name) != value for name, value in loaded.items())
+
 class ClientCompany(models.Model):
     ONBOARDING_STAGES = (
         (0, "Registered"),
@@ -147,5 +188,8 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
+    # Persist edits made through user.profile, but never re-save an unchanged
+    # profile: a plain User.save(), such as the last_login write on every
+    # login, must not bump updated_at and invalidate the freelancer's feed
+    if User.profile.related.is_cached(instance) and instance.profile.has_changes():
         instance.profile.save()
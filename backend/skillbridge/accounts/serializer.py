@@ -2,6 +2,8 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
 from .models import *
 from django.contrib.auth.hashers import check_password
+from django.db import transaction
+from .skills import resolve_skills
 
 User = get_user_model()
 
@@ -119,7 +121,10 @@ class ProfileSerializer(serializers.ModelSerializer):
       
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            instance.save()
+            if "skills" in validated_data:
+                instance.skill_tags.set(resolve_skills(instance.skills))
         return instance
 
 
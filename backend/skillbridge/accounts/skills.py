@@ -0,0 +1,62 @@
+import re
+from .models import Skill, SkillAlias
+
+SKILL_SEPARATORS = re.compile(r"[,;|\n]+")
+MAX_SKILL_LENGTH = 100
+
+
+def normalize_skill(raw):
+    """Lowercase and collapse whitespace so "React.js " and "react.js" share a key."""
+    return re.sub(r"\s+", " ", raw.strip().lower()).strip(" .")
+
+
+def split_skills(text):
+    """Return `(key, display_name)` pairs for a comma-separated skills string, de-duplicated."""
+    seen = {}
+    for part in SKILL_SEPARATORS.split(text or ""):
+        key = normalize_skill(part)
+        if key and len(key) <= MAX_SKILL_LENGTH and key not in seen:
+            seen[key] = part.strip()
+    return list(seen.items())
+
+
+def resolve_skills(text, create=True):
+    """
+    Map free-text skills to canonical Skill IDs through the alias table.
+    Unknown skills are created (with a self alias) unless `create` is False.
+    """
+    return resolve_skills_many([text], create)[0]
+
+
+def resolve_skills_many(texts, create=True):
+    """Like `resolve_skills` for several texts at once, in a fixed number of queries."""
+    pairs_per_text = [split_skills(text) for text in texts]
+    names = {}
+    for pairs in pairs_per_text:
+        for key, name in pairs:
+            names.setdefault(key, name)
+    if not names:
+        return [[] for _ in texts]
+    aliases = dict(SkillAlias.objects.filter(alias__in=list(names)).values_list("alias", "skill_id"))
+
+    missing = [(key, name) for key, name in names.items() if key not in aliases]
+    if create and missing:
+        Skill.objects.bulk_create(
+            [Skill(key=key, name=name) for key, name in missing], ignore_conflicts=True
+        )
+        created = dict(Skill.objects.filter(key__in=[key for key, _ in missing]).values_list("key", "id"))
+        SkillAlias.objects.bulk_create(
+            [SkillAlias(alias=key, skill_id=skill_id) for key, skill_id in created.items()],
+            ignore_conflicts=True,
+        )
+        aliases.update(created)
+
+    resolved = []
+    for pairs in pairs_per_text:
+        skill_ids = []
+        for key, _ in pairs:
+            skill_id = aliases.get(key)
+            if skill_id is not None and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        resolved.append(skill_ids)
+    return resolved
@@ -1,3 +1,151 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from skillbridge.db_router import (
+    PrimaryReplicaRouter, is_pinned, pin_to_primary, read_from_replica, served_from_replica,
+    use_primary,
+)
+from .models import Profile, Skill, User
+from .skills import resolve_skills
+
+router = PrimaryReplicaRouter()
+
+
+class ReadView:
+    """Stands in for an APIView whose reads may go to a replica."""
+
+    def __init__(self, read=None):
+        self.read = read or (lambda: router.db_for_read(Profile))
+
+    @read_from_replica
+    def get(self, request):
+        response = Response()
+        response.alias = self.read()
+        return response
+
+
+@mock.patch("skillbridge.db_router.replica_aliases", return_value=["replica_1"])
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not a TestCase: reads inside a transaction are always kept on the primary
+
+    def setUp(self):
+        # Pins live in the cache, which is not reset between tests
+        cache.clear()
+        self.user = User.objects.create_user(email="freelancer@example.com", password=None, role="freelancer")
+        self.request = SimpleNamespace(user=self.user)
+
+    def test_reads_go_to_a_replica(self, replicas):
+        response = ReadView().get(self.request)
+
+        self.assertEqual(response.alias, "replica_1")
+        self.assertTrue(served_from_replica(response))
+
+    def test_reads_outside_decorated_handlers_stay_on_the_primary(self, replicas):
+        self.assertIsNone(router.db_for_read(Profile))
+
+    def test_pinned_user_reads_the_primary(self, replicas):
+        pin_to_primary(self.user.pk)
+
+        response = ReadView().get(self.request)
+
+        self.assertIsNone(response.alias)
+        self.assertFalse(served_from_replica(response))
+
+    def test_use_primary_overrides_the_replica(self, replicas):
+        def read():
+            with use_primary():
+                return router.db_for_read(Profile)
+
+        response = ReadView(read).get(self.request)
+
+        self.assertIsNone(response.alias)
+        self.assertFalse(served_from_replica(response))
+
+    def test_reads_inside_a_transaction_see_its_writes(self, replicas):
+        def read():
+            with transaction.atomic():
+                return router.db_for_read(Profile)
+
+        self.assertEqual(ReadView(read).get(self.request).alias, "default")
+
+    def test_writes_go_to_the_primary(self, replicas):
+        self.assertEqual(router.db_for_write(Profile), "default")
+
+
+class ReadYourWritesPinningTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="freelancer@example.com", password=None, role="freelancer")
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_request_that_writes_pins_the_user(self):
+        response = self.api.patch("/api/accounts/profile/update/", {"bio": "Django developer"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(is_pinned(self.user.pk))
+
+    def test_read_only_request_does_not_pin(self):
+        response = self.api.get("/api/accounts/profile/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(is_pinned(self.user.pk))
+
+    def test_pin_expires(self):
+        with self.settings(READ_YOUR_WRITES_SECONDS=0):
+            pin_to_primary(self.user.pk)
+
+        self.assertFalse(is_pinned(self.user.pk))
+
+
+class ProfileChangeTrackingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="freelancer@example.com", password=None, role="freelancer")
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_saving_the_user_leaves_an_unchanged_profile_alone(self):
+        response = self.api.get("/api/accounts/profile/")
+        updated_at = Profile.objects.get(user=self.user).updated_at
+
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        user.last_login = timezone.now()
+        user.save()
+
+        self.assertEqual(Profile.objects.get(user=self.user).updated_at, updated_at)
+        revalidated = self.api.get("/api/accounts/profile/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_profile_edits_through_the_user_are_saved(self):
+        response = self.api.get("/api/accounts/profile/")
+
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        user.profile.bio = "Django developer"
+        user.save()
+
+        self.assertEqual(Profile.objects.get(user=self.user).bio, "Django developer")
+        revalidated = self.api.get("/api/accounts/profile/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 200)
+
+
+class SkillTaxonomyTests(TestCase):
+    def test_aliases_resolve_to_one_canonical_skill(self):
+        react = Skill.objects.get(key="react")
+        python = Skill.objects.get(key="python")
+
+        self.assertEqual(resolve_skills("ReactJS, react.js ; Py, python3"), [react.pk, python.pk])
+
+    def test_unknown_skills_are_created_once_unless_lookup_only(self):
+        self.assertEqual(resolve_skills("Elixir", create=False), [])
+
+        created = resolve_skills("Elixir")
+        self.assertEqual(resolve_skills(" elixir "), created)
+        self.assertEqual(Skill.objects.get(pk=created[0]).name, "Elixir")
@@ -15,7 +15,10 @@ from .serializer import RegisterSerializer, LoginSerializer, UserDataSerializer,
 from rest_framework import viewsets, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import ClientCompany, ClientDocument, ClientContact,User
+from .models import ClientCompany, ClientDocument, ClientContact, Profile, User
+from project.conditional import conditional
+from project.utils import invalidate_feed
+from skillbridge.db_router import read_from_replica
 logger = logging.getLogger(__name__)
 
 ATTEMPT_LIMIT = 3
@@ -155,9 +158,28 @@ class LogoutView(APIView):
         except Exception as e:
             logger.error(f"Logout error: {str(e)}")
             return Response({"message": "Error during logout", "error": str(e)}, status=500)
+def own_profile_validators(request):
+    # The user row is already loaded by authentication; its fields are not
+    # timestamped, so they go into the ETag directly and no Last-Modified is sent.
+    user = request.user
+    profile_updated_at = Profile.objects.filter(user=user).values_list("updated_at", flat=True).first()
+    return (
+        "me", user.pk, user.email, user.role, user.verified, user.onboarding_stage,
+        user.is_active, profile_updated_at,
+    ), None
+
+
+def profile_validators(request, user_id):
+    updated_at = Profile.objects.filter(user_id=user_id).values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        return None
+    return ("profile", user_id, updated_at.isoformat()), updated_at
+
+
 class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional(own_profile_validators)
     def get(self, request):
         return Response({"data": UserDataSerializer(request.user).data})
 
@@ -191,6 +213,7 @@ class ProfileUpdateView(APIView):
         """
         profile = request.user.profile
         profile.delete()
+        invalidate_feed(request.user.id)
         return Response({"message": "Profile deleted successfully"}, status=204)
 
     def _update_profile(self, request, partial=False):
@@ -202,6 +225,8 @@ class ProfileUpdateView(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            # Profile text drives the freelancer's ranked project feed
+            invalidate_feed(request.user.id)
 
             # Automatically move onboarding stage forward if not already completed
             user = request.user
@@ -291,6 +316,9 @@ class ClientContactViewSet(viewsets.ModelViewSet):
 class ProfileByIdView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ProfileSerializer
+
+    @conditional(profile_validators)
+    @read_from_replica
     def get(self, request, user_id):
         """
         Return the profile details of a user by their ID.
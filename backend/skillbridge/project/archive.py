@@ -0,0 +1,87 @@
+"""
+Hot/cold split of the project tables.
+
+Closed projects that have not changed for PROJECT_ARCHIVE_AFTER_DAYS are
+copied, with their applications, into ArchivedProject/ArchivedApplication
+and deleted from the live tables, one chunk per transaction. Feeds, client
+listings, search and the matching indexes then only ever see recent rows,
+while detail lookups by id fall back to the archive.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedApplication, ArchivedProject, Application, FreelanceProject
+
+ARCHIVE_CHUNK_SIZE = 500
+ARCHIVED_FIELDS = [
+    "id", "client_company_id", "created_by_id", "title", "description", "skills_required",
+    "budget", "project_type", "is_open", "applicant_count", "created_at", "updated_at",
+]
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = getattr(settings, "PROJECT_ARCHIVE_AFTER_DAYS", 365)
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_projects(cutoff):
+    return FreelanceProject.objects.filter(is_open=False, updated_at__lt=cutoff)
+
+
+def _archive_chunk(pks, cutoff):
+    """Move the projects in `pks` that are still archivable; returns `(projects, applications)`."""
+    with transaction.atomic():
+        # Re-check inside the transaction so a project reopened meanwhile stays live
+        projects = list(
+            archivable_projects(cutoff).filter(pk__in=pks).select_for_update().values(*ARCHIVED_FIELDS)
+        )
+        pks = [project["id"] for project in projects]
+        if not pks:
+            return 0, 0
+        tags = {}
+        through = FreelanceProject.skill_tags.through.objects.filter(freelanceproject_id__in=pks)
+        for pk, skill_id in through.values_list("freelanceproject_id", "skill_id"):
+            tags.setdefault(pk, []).append(skill_id)
+        ArchivedProject.objects.bulk_create([
+            ArchivedProject(**project, skill_tags=tags.get(project["id"], [])) for project in projects
+        ])
+        applications = Application.objects.filter(project_id__in=pks)
+        ArchivedApplication.objects.bulk_create([
+            ArchivedApplication(**application)
+            for application in applications.values("project_id", "user_id", "applied_at", "match_score")
+        ], batch_size=ARCHIVE_CHUNK_SIZE)
+        # A regular delete, so the project signals keep indexes, facet counts
+        # and listing caches in step; applications and tags cascade.
+        _, deleted = FreelanceProject.objects.filter(pk__in=pks).delete()
+        return len(pks), deleted.get(Application._meta.label, 0)
+
+
+def archive_closed_projects(cutoff, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Archive every project closed and untouched since `cutoff`, yielding
+    `(projects, applications)` moved per chunk.
+    """
+    last_pk = None
+    while True:
+        candidates = archivable_projects(cutoff).order_by("pk")
+        if last_pk is not None:
+            candidates = candidates.filter(pk__gt=last_pk)
+        pks = list(candidates.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        last_pk = pks[-1]
+        yield _archive_chunk(pks, cutoff)
+
+
+def get_archived_project(pk):
+    """The archived project `pk` with its applicant ids, or None."""
+    project = ArchivedProject.objects.filter(pk=pk).first()
+    if project is not None:
+        project.applicant_ids = list(
+            project.applications.order_by("applied_at").values_list("user_id", flat=True)
+        )
+    return project
@@ -0,0 +1,44 @@
+"""
+APIView with coroutine handlers, for endpoints that mostly wait on external
+services (LLM calls, third-party APIs).
+
+DRF's APIView only dispatches synchronously, so under ASGI such a view ties
+up a worker thread for the whole outbound call. AsyncAPIView keeps DRF's
+request parsing, authentication, permissions, throttling and exception
+handling, but awaits the handler on the event loop: one ASGI worker can then
+hold many requests in flight. Authentication may query the database, so
+`initial()` runs in a thread; handlers should use the async ORM (`aget`,
+`acreate`, `asave`, ...) and async clients.
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            # OPTIONS and 405 responses come from APIView's synchronous handlers
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,244 @@
+"""
+Helpers shared by the benchmark management commands: a throwaway database,
+synthetic projects and freelancer profiles, and latency/memory reporting.
+"""
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from accounts.models import ClientCompany, Profile, Skill, SkillAlias, User
+from .models import FreelanceProject
+
+SKILLS = [
+    "Python", "Django", "Flask", "FastAPI", "JavaScript", "TypeScript", "React", "Vue",
+    "Angular", "Node.js", "Go", "Rust", "Java", "Kotlin", "Swift", "Flutter", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "Docker", "Kubernetes", "Amazon Web Services", "GCP",
+    "Terraform", "Machine Learning", "Pandas", "PyTorch", "Figma", "Photoshop",
+    "UI/UX Design", "SEO", "Copywriting", "WordPress", "Shopify", "GraphQL", "C#", "C++",
+]
+DOMAINS = [
+    "e-commerce", "fintech", "healthcare", "logistics", "education", "real estate",
+    "travel", "gaming", "social media", "analytics", "marketing", "SaaS",
+]
+ARTIFACTS = [
+    "web app", "mobile app", "REST API", "dashboard", "landing page", "data pipeline",
+    "recommendation engine", "admin panel", "chatbot", "browser extension", "CI/CD setup",
+]
+VERBS = ["Build", "Redesign", "Migrate", "Optimize", "Maintain", "Prototype", "Scale"]
+LEVELS = ["Beginner", "Intermediate", "Expert"]
+BATCH_SIZE = 5000
+SQLITE_PROFILES = ["default", "production"]
+
+
+def close_connection(connection):
+    """
+    Close `connection` for real. Django keeps in-memory SQLite test databases
+    open on close(), which would carry rows over into the next benchmark run.
+    """
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        if connection.connection is not None:
+            connection.connection.close()
+            connection.connection = None
+    else:
+        connection.close()
+
+
+@contextmanager
+def benchmark_database(path=None):
+    """
+    Run against a fresh test database so benchmarks never touch real data.
+    SQLite test databases live in memory unless `path` names a file.
+    """
+    setup_test_environment()
+    test_settings = connection.settings_dict["TEST"]
+    if path is not None:
+        connection.settings_dict["TEST"] = {**test_settings, "NAME": str(path)}
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        close_connection(connection)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict["TEST"] = test_settings
+        teardown_test_environment()
+
+
+@contextmanager
+def sqlite_profile(name):
+    """Apply the default or the SQLITE_PRODUCTION database profile to new connections."""
+    database = settings.DATABASES["default"]
+    saved = {key: database.get(key) for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS", "OPTIONS")}
+    if name == "production":
+        database.update(CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True, OPTIONS={"transaction_mode": "IMMEDIATE"})
+    else:
+        database.update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False, OPTIONS={})
+    try:
+        with override_settings(SQLITE_PRODUCTION=name == "production"):
+            yield
+    finally:
+        database.update(saved)
+
+
+class SyntheticData:
+    """Deterministic generator of realistic-looking projects and profiles."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self._skill_ids = None
+
+    def _skills(self, low, high):
+        return self.rng.sample(SKILLS, self.rng.randint(low, high))
+
+    def project_fields(self):
+        skills = self._skills(2, 5)
+        domain, artifact = self.rng.choice(DOMAINS), self.rng.choice(ARTIFACTS)
+        return skills, {
+            "title": f"{self.rng.choice(VERBS)} a {domain} {artifact}",
+            "description": (
+                f"We are a {domain} company looking for a freelancer to "
+                f"{self.rng.choice(VERBS).lower()} our {artifact}. You will work with "
+                f"{', '.join(skills[:-1])} and {skills[-1]}, ship in small iterations "
+                f"and collaborate with our {self.rng.choice(['product', 'design', 'data', 'ops'])} team."
+            ),
+            "skills_required": ", ".join(skills),
+            "budget": self.rng.randrange(100, 20000, 50),
+            "project_type": self.rng.choice(["fixed", "hourly"]),
+        }
+
+    def profile_fields(self):
+        skills = self._skills(3, 7)
+        return skills, {
+            "full_name": f"Freelancer {self.rng.randrange(10 ** 6)}",
+            "skills": ", ".join(skills),
+            "experience_level": self.rng.choice(LEVELS),
+            "bio": (
+                f"{self.rng.choice(LEVELS)} developer with {self.rng.randint(1, 15)} years in "
+                f"{self.rng.choice(DOMAINS)} and {self.rng.choice(DOMAINS)}, focused on "
+                f"{self.rng.choice(ARTIFACTS)}s."
+            ),
+            "star_rating": round(self.rng.uniform(0, 5), 1),
+            "verification_tag": self.rng.choice(["Unverified", *LEVELS]),
+        }
+
+    def skill_ids(self):
+        """Canonical Skill rows for the vocabulary, created once."""
+        if self._skill_ids is None:
+            Skill.objects.bulk_create(
+                [Skill(name=name, key=name.lower()) for name in SKILLS], ignore_conflicts=True
+            )
+            self._skill_ids = dict(Skill.objects.filter(key__in=[n.lower() for n in SKILLS]).values_list("name", "id"))
+            SkillAlias.objects.bulk_create(
+                [SkillAlias(alias=name.lower(), skill_id=self._skill_ids[name]) for name in SKILLS],
+                ignore_conflicts=True,
+            )
+        return self._skill_ids
+
+    def create_projects(self, count):
+        """Bulk insert `count` open projects (with skill tags) for one synthetic client."""
+        client, _ = User.objects.get_or_create(email="bench-client@example.com", defaults={"role": "client"})
+        company, _ = ClientCompany.objects.get_or_create(user=client, defaults={"company_name": "Bench Co"})
+        skill_ids = self.skill_ids()
+        through = FreelanceProject.skill_tags.through
+        for start in range(0, count, BATCH_SIZE):
+            projects, tags = [], []
+            for _ in range(min(BATCH_SIZE, count - start)):
+                skills, fields = self.project_fields()
+                project = FreelanceProject(client_company=company, created_by=client, **fields)
+                projects.append(project)
+                tags.extend((project.pk, skill_ids[name]) for name in skills)
+            FreelanceProject.objects.bulk_create(projects)
+            through.objects.bulk_create(
+                [through(freelanceproject_id=pk, skill_id=skill_id) for pk, skill_id in tags]
+            )
+
+    def create_freelancers(self, count):
+        """Bulk insert `count` freelancers with profiles; returns their users."""
+        skill_ids = self.skill_ids()
+        through = Profile.skill_tags.through
+        offset = User.objects.count()
+        users = []
+        for start in range(0, count, BATCH_SIZE):
+            batch = User.objects.bulk_create([
+                User(email=f"bench-freelancer-{offset + start + i}@example.com", role="freelancer")
+                for i in range(min(BATCH_SIZE, count - start))
+            ])
+            profiles, skills = [], []
+            for user in batch:
+                names, fields = self.profile_fields()
+                profiles.append(Profile(user=user, **fields))
+                skills.append(names)
+            profiles = Profile.objects.bulk_create(profiles)
+            through.objects.bulk_create([
+                through(profile_id=profile.pk, skill_id=skill_ids[name])
+                for profile, names in zip(profiles, skills) for name in names
+            ])
+            users.extend(batch)
+        return users
+
+
+def latency_summary(samples):
+    """Percentiles in milliseconds for a list of durations in seconds."""
+    ms = np.asarray(samples) * 1000
+    return {
+        "count": int(ms.size),
+        "mean": round(float(ms.mean()), 3),
+        "p50": round(float(np.percentile(ms, 50)), 3),
+        "p90": round(float(np.percentile(ms, 90)), 3),
+        "p99": round(float(np.percentile(ms, 99)), 3),
+        "max": round(float(ms.max()), 3),
+    }
+
+
+@contextmanager
+def traced_memory():
+    """
+    Trace the allocations made inside the block and fill the yielded dict with
+    `peak_mb` and `retained_mb` (still allocated on exit). Unlike the process's
+    peak RSS this starts from zero for every block, so runs sharing a process
+    can be compared. numpy buffers are traced, memory-mapped files are not.
+    Tracing slows allocation down, so keep timed code outside the block.
+    """
+    usage = {}
+    tracemalloc.start()
+    try:
+        yield usage
+    finally:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        usage.update(peak_mb=round(peak / 2 ** 20, 1), retained_mb=round(retained / 2 ** 20, 1))
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def report(name, results, **extra):
+    """Machine-readable envelope so runs can be diffed between commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return json.dumps({
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        **extra,
+        "results": results,
+    }, indent=2)
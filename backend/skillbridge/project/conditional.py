@@ -0,0 +1,61 @@
+"""
+Conditional GET support for APIView handlers.
+
+A view declares a `validators(request, *args, **kwargs)` function that reads
+only timestamps and version counters, typically a single indexed row or
+aggregate, and returns `(etag_parts, last_modified)`. When the client's
+If-None-Match / If-Modified-Since still matches, a 304 is returned before
+the handler runs any query or serializer.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from skillbridge.db_router import served_from_replica, use_primary
+
+
+def make_etag(*parts):
+    """Strong ETag value identifying one representation of a resource."""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def conditional(validators):
+    """
+    Decorate an APIView `get` so it honors conditional requests.
+
+    `validators` may return None when the resource cannot be validated (for
+    example because it does not exist); the handler then runs unconditionally
+    and produces its usual error. `last_modified` may be None for resources
+    whose changes are not all timestamped, such as lists that lose rows.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            def run(request, *args, **kwargs):
+                return handler(view, request, *args, **kwargs)
+
+            # Validators are compared with what clients saw from the primary
+            with use_primary():
+                state = validators(request, *args, **kwargs)
+            if state is None:
+                response = run(request, *args, **kwargs)
+            else:
+                parts, last_modified = state
+                etag = make_etag(*parts)
+                response = condition(
+                    etag_func=lambda *args, **kwargs: etag,
+                    last_modified_func=lambda *args, **kwargs: last_modified,
+                )(run)(request, *args, **kwargs)
+                # Validators describe the resource as on the primary, not an
+                # error about it or a possibly older copy from a replica
+                stale = served_from_replica(response)
+                if stale or (response.status_code >= 300 and response.status_code != 304):
+                    response.headers.pop("ETag", None)
+                    response.headers.pop("Last-Modified", None)
+            # Responses are per user: never share them, always revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
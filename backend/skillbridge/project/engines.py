@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .matching import profile_text, project_index
+
+_engines = {}
+
+
+def get_project_engine():
+    """
+    Return the matching backend used for the freelancer project feed, chosen
+    by the PROJECT_MATCHING_ENGINE setting ("tfidf" or "embedding").
+    """
+    name = getattr(settings, "PROJECT_MATCHING_ENGINE", "tfidf")
+    if name == "tfidf":
+        return project_index
+    if name == "embedding":
+        if name not in _engines:
+            from .vector_store import EmbeddingMatchEngine
+
+            options = getattr(settings, "PROJECT_EMBEDDING_STORE", {})
+            _engines[name] = EmbeddingMatchEngine(
+                path=options.get("PATH", settings.BASE_DIR / "vector_store" / "projects"),
+                dim=options.get("DIM", 256),
+                search=options.get("SEARCH", "ivf"),
+                nprobe=options.get("NPROBE", 8),
+            )
+        return _engines[name]
+    raise ImproperlyConfigured(f"Unknown PROJECT_MATCHING_ENGINE: {name!r}")
+
+
+@receiver(setting_changed)
+def reset_project_engines(setting, **kwargs):
+    """Drop engines built from the old settings, e.g. when override_settings exits."""
+    if setting in ("PROJECT_MATCHING_ENGINE", "PROJECT_EMBEDDING_STORE"):
+        _engines.clear()
+
+
+def application_match_score(profile, project_id, warm_only=False):
+    """
+    Similarity between an applicant's profile and the project, as ranked by
+    the feed, or None when there is no profile or the project is not indexed.
+    With `warm_only` it is also None when this process has not loaded the
+    engine yet, rather than loading it.
+    """
+    engine = get_project_engine()
+    if profile is None or (warm_only and not engine.is_warm()):
+        return None
+    return engine.similarity(profile_text(profile), project_id)
@@ -0,0 +1,144 @@
+"""
+CSV exports of projects and their applicants.
+
+Rows are read with a chunked server-side iterator over `values_list`, so
+no model instances are built, and each row is encoded and handed to a
+StreamingHttpResponse as soon as it is read. Memory stays constant and
+the first bytes go out before the query has been fully consumed.
+
+Archived projects and applications (see project.archive) are exported
+after the live ones, with `archived` set to True.
+"""
+import csv
+from datetime import datetime
+
+from django.db.models import Value
+from django.http import StreamingHttpResponse
+
+from .models import Application, ArchivedApplication, ArchivedProject, FreelanceProject
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into each chunk sent to the client; bounds per-chunk overhead
+# without holding back the first bytes
+FLUSH_ROWS = 100
+
+PROJECT_COLUMNS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("skills_required", "skills_required"),
+    ("budget", "budget"),
+    ("project_type", "project_type"),
+    ("is_open", "is_open"),
+    ("applicant_count", "applicant_count"),
+    ("client_company", "client_company__company_name"),
+    ("created_by", "created_by__email"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+    ("archived", "archived"),
+]
+
+APPLICANT_COLUMNS = [
+    ("project_id", "project_id"),
+    ("project_title", "project__title"),
+    ("applicant_id", "user_id"),
+    ("email", "user__email"),
+    ("full_name", "user__profile__full_name"),
+    ("location", "user__profile__location"),
+    ("experience_level", "user__profile__experience_level"),
+    ("skills", "user__profile__skills"),
+    ("verification_tag", "user__profile__verification_tag"),
+    ("star_rating", "user__profile__star_rating"),
+    ("match_score", "match_score"),
+    ("applied_at", "applied_at"),
+    ("archived", "archived"),
+]
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = frozenset("=+-@\t\r")
+
+
+class Echo:
+    """File-like object whose write() returns the line csv.writer produced."""
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if type(value) is str:
+        return "'" + value if value[:1] in FORMULA_PREFIXES else value
+    if type(value) is datetime:
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(columns, *querysets):
+    """CSV lines for the rows of each of `querysets` in turn, under one header row."""
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in columns])
+    buffer = []
+    for queryset in querysets:
+        rows = queryset.values_list(*[field for _, field in columns])
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            buffer.append(writer.writerow([_cell(value) for value in row]))
+            if len(buffer) >= FLUSH_ROWS:
+                yield "".join(buffer)
+                buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def _streaming_csv(lines, filename):
+    response = StreamingHttpResponse(lines, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_projects(projects, archived):
+    """Stream live `projects`, then `archived` ones, as CSV, each newest first."""
+    return _streaming_csv(
+        _csv_lines(
+            PROJECT_COLUMNS,
+            projects.annotate(archived=Value(False)).order_by("-created_at", "-id"),
+            archived.annotate(archived=Value(True)).order_by("-created_at", "-id"),
+        ),
+        "projects.csv",
+    )
+
+
+def export_applicants(applications, archived):
+    """
+    Stream live `applications`, then `archived` ones, with applicant profile
+    details as CSV, grouped by project.
+    """
+    return _streaming_csv(
+        _csv_lines(
+            APPLICANT_COLUMNS,
+            applications.annotate(archived=Value(False)).order_by("project_id", "-applied_at"),
+            archived.annotate(archived=Value(True)).order_by("project_id", "-applied_at"),
+        ),
+        "applicants.csv",
+    )
+
+
+def exportable_projects(user, is_admin):
+    """
+    `(live, archived)` projects `user` may export: admins get every project,
+    clients their own.
+    """
+    if is_admin:
+        return FreelanceProject.objects.all(), ArchivedProject.objects.all()
+    return (
+        FreelanceProject.objects.filter(created_by=user),
+        ArchivedProject.objects.filter(created_by=user),
+    )
+
+
+def exportable_applications(user, is_admin):
+    """`(live, archived)` applications to the projects `user` may export."""
+    if is_admin:
+        return Application.objects.all(), ArchivedApplication.objects.all()
+    return (
+        Application.objects.filter(project__created_by=user),
+        ArchivedApplication.objects.filter(project__created_by=user),
+    )
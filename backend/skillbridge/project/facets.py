@@ -0,0 +1,235 @@
+"""
+Facets of the open project catalog: project type, budget range and skill.
+
+`ProjectFilters` parses the filter query parameters once and applies them
+either to a queryset or, as a boolean mask over the feature columns, to the
+in-memory match index. Counts per facet value live in ProjectFacetCount and
+are adjusted with F() updates as projects open, close or change, through
+project.signals for single saves and deletes and through the queryset's
+update() and bulk_update(), so the facet sidebar is a single small read.
+Counts cover every open project; they ignore the filters currently applied.
+Writes that bypass both, such as raw SQL, are repaired by
+`rebuild_facet_counts`.
+"""
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from accounts.models import Skill
+from accounts.skills import resolve_skills
+from .models import FreelanceProject, ProjectFacetCount
+from .utils import bump_listings_version_on_commit
+
+PROJECT_TYPE = "project_type"
+BUDGET = "budget"
+SKILL = "skill"
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+BUDGET_RANGES = [
+    ("under-500", "Under $500", None, 500),
+    ("500-2000", "$500 - $2,000", 500, 2000),
+    ("2000-10000", "$2,000 - $10,000", 2000, 10000),
+    ("10000-plus", "$10,000+", 10000, None),
+    ("unspecified", "Not specified", None, None),
+]
+BUDGET_KEYS = [key for key, *_ in BUDGET_RANGES]
+MAX_SKILL_FACETS = 50
+
+
+class FilterError(ValueError):
+    pass
+
+
+def budget_range(budget):
+    if budget is None:
+        return "unspecified"
+    budget = float(budget)
+    for key, _, low, high in BUDGET_RANGES[:-1]:
+        if (low is None or budget >= low) and (high is None or budget < high):
+            return key
+
+
+class ProjectFilters:
+    """Filters from `?project_type=hourly&budget=500-2000,2000-10000&skills=python,react`."""
+
+    def __init__(self, project_types=(), budgets=(), skill_ids=None):
+        self.project_types = list(project_types)
+        self.budgets = list(budgets)
+        # None means no skill filter; [] means skills were given but none are known
+        self.skill_ids = skill_ids
+
+    @classmethod
+    def from_request(cls, request):
+        params = request.query_params
+
+        def values(name):
+            return [value.strip() for value in params.get(name, "").split(",") if value.strip()]
+
+        project_types = values("project_type")
+        choices = [choice for choice, _ in FreelanceProject.PROJECT_TYPE_CHOICES]
+        if any(value not in choices for value in project_types):
+            raise FilterError(f"project_type must be one of: {', '.join(choices)}.")
+        budgets = values("budget")
+        if any(value not in BUDGET_KEYS for value in budgets):
+            raise FilterError(f"budget must be one of: {', '.join(BUDGET_KEYS)}.")
+        skill_ids = None
+        if params.get("skills", "").strip():
+            skill_ids = resolve_skills(params["skills"], create=False)
+        return cls(project_types, budgets, skill_ids)
+
+    def __bool__(self):
+        return bool(self.project_types or self.budgets or self.skill_ids is not None)
+
+    def _budget_q(self):
+        condition = Q()
+        for key, _, low, high in BUDGET_RANGES:
+            if key not in self.budgets:
+                continue
+            if key == "unspecified":
+                condition |= Q(budget__isnull=True)
+                continue
+            bounds = Q()
+            if low is not None:
+                bounds &= Q(budget__gte=low)
+            if high is not None:
+                bounds &= Q(budget__lt=high)
+            condition |= bounds
+        return condition
+
+    def apply(self, queryset):
+        if self.project_types:
+            queryset = queryset.filter(project_type__in=self.project_types)
+        if self.budgets:
+            queryset = queryset.filter(self._budget_q())
+        if self.skill_ids is not None:
+            tagged = FreelanceProject.skill_tags.through.objects.filter(skill_id__in=self.skill_ids)
+            queryset = queryset.filter(pk__in=tagged.values("freelanceproject_id"))
+        return queryset
+
+    def mask(self, columns):
+        """Boolean mask over match index rows for the type and budget filters."""
+        mask = np.ones(columns["budget"].shape[0], dtype=bool)
+        if self.project_types:
+            hourly = columns["hourly"] == 1
+            wanted = np.zeros_like(mask)
+            if "hourly" in self.project_types:
+                wanted |= hourly
+            if "fixed" in self.project_types:
+                wanted |= ~hourly
+            mask &= wanted
+        if self.budgets:
+            budget = columns["budget"]
+            known = ~np.isnan(budget)
+            wanted = np.zeros_like(mask)
+            for key, _, low, high in BUDGET_RANGES:
+                if key not in self.budgets:
+                    continue
+                if key == "unspecified":
+                    wanted |= ~known
+                    continue
+                in_range = known.copy()
+                if low is not None:
+                    in_range &= np.where(known, budget, 0) >= low
+                if high is not None:
+                    in_range &= np.where(known, budget, 0) < high
+                wanted |= in_range
+            mask &= wanted
+        return mask
+
+
+# ---------- incremental counts ----------
+def facet_values(is_open, project_type, budget, skill_ids=()):
+    """The (facet, value) pairs a project contributes to; none while it is closed."""
+    if not is_open:
+        return []
+    values = [(PROJECT_TYPE, project_type), (BUDGET, budget_range(budget))]
+    values.extend((SKILL, str(skill_id)) for skill_id in skill_ids)
+    return values
+
+
+def stored_facet_values(pks):
+    """The (facet, value) pairs the stored projects `pks` contribute to, all in one list."""
+    skills = defaultdict(list)
+    links = FreelanceProject.skill_tags.through.objects.filter(freelanceproject_id__in=pks)
+    for project_id, skill_id in links.values_list("freelanceproject_id", "skill_id"):
+        skills[project_id].append(skill_id)
+    values = []
+    rows = FreelanceProject.objects.filter(pk__in=pks).values_list("pk", "is_open", "project_type", "budget")
+    for pk, is_open, project_type, budget in rows:
+        values.extend(facet_values(is_open, project_type, budget, skills[pk]))
+    return values
+
+
+def apply_deltas(deltas):
+    """Add `{(facet, value): delta}` to the stored counts, creating rows as needed."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        ProjectFacetCount.objects.bulk_create(
+            [ProjectFacetCount(facet=facet, value=value) for facet, value in deltas],
+            ignore_conflicts=True,
+        )
+        for (facet, value), delta in deltas.items():
+            ProjectFacetCount.objects.filter(facet=facet, value=value).update(count=F("count") + delta)
+
+
+def diff(old_values, new_values):
+    deltas = Counter(new_values)
+    deltas.subtract(Counter(old_values))
+    return deltas
+
+
+def rebuild_facet_counts():
+    """Recompute every count from the projects table; returns the number of facet values."""
+    open_projects = FreelanceProject.objects.filter(is_open=True)
+    counts = Counter()
+    for project_type, total in open_projects.values_list("project_type").annotate(total=Count("pk")).order_by():
+        counts[(PROJECT_TYPE, project_type)] += total
+    budgets = Counter()
+    for budget, total in open_projects.values_list("budget").annotate(total=Count("pk")).order_by():
+        budgets[budget_range(budget)] += total
+    counts.update({(BUDGET, key): total for key, total in budgets.items()})
+    skills = (
+        FreelanceProject.skill_tags.through.objects.filter(freelanceproject__is_open=True)
+        .values_list("skill_id").annotate(total=Count("pk")).order_by()
+    )
+    counts.update({(SKILL, str(skill_id)): total for skill_id, total in skills})
+
+    with transaction.atomic():
+        ProjectFacetCount.objects.all().delete()
+        ProjectFacetCount.objects.bulk_create([
+            ProjectFacetCount(facet=facet, value=value, count=total)
+            for (facet, value), total in counts.items()
+        ])
+    bump_listings_version_on_commit()
+    return len(counts)
+
+
+def facet_counts():
+    """Sidebar payload: counts per project type, budget range and the most common skills."""
+    rows = ProjectFacetCount.objects.filter(count__gt=0)
+    by_facet = {PROJECT_TYPE: {}, BUDGET: {}}
+    skills = []
+    for facet, value, count in rows.exclude(facet=SKILL).values_list("facet", "value", "count"):
+        by_facet.setdefault(facet, {})[value] = count
+    skill_rows = rows.filter(facet=SKILL).order_by("-count")[:MAX_SKILL_FACETS]
+    skill_counts = [(int(value), count) for value, count in skill_rows.values_list("value", "count")]
+    names = Skill.objects.in_bulk([skill_id for skill_id, _ in skill_counts])
+    for skill_id, count in skill_counts:
+        if skill_id in names:
+            skills.append({"value": names[skill_id].name, "id": skill_id, "count": count})
+
+    return {
+        PROJECT_TYPE: [
+            {"value": value, "label": label, "count": by_facet[PROJECT_TYPE].get(value, 0)}
+            for value, label in FreelanceProject.PROJECT_TYPE_CHOICES
+        ],
+        BUDGET: [
+            {"value": key, "label": label, "count": by_facet[BUDGET].get(key, 0)}
+            for key, label, *_ in BUDGET_RANGES
+        ],
+        "skills": skills,
+    }
@@ -0,0 +1,131 @@
+"""
+Bulk project import from CSV or JSON Lines uploads.
+
+The upload is read one row at a time, each row is validated with
+FreelanceProjectSerializer, and valid rows are inserted with bulk_create
+in batches together with their skill tags and facet counts; the matching
+index picks them up through FreelanceProjectQuerySet.bulk_create. Memory is
+bounded by the batch size and the capped error report, whatever the size
+of the file.
+"""
+import csv
+import io
+import json
+from collections import Counter
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from accounts.skills import resolve_skills_many
+from .facets import apply_deltas, facet_values
+from .models import FreelanceProject
+from .serializer import FreelanceProjectSerializer
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+FORMATS = {
+    "csv": "csv",
+    "text/csv": "csv",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(upload, requested=None):
+    """Pick the reader from an explicit file_type, else the extension, else the content type."""
+    candidates = [requested] if requested else [upload.name.rsplit(".", 1)[-1], upload.content_type]
+    for candidate in candidates:
+        file_format = FORMATS.get((candidate or "").lower())
+        if file_format is not None:
+            return file_format
+    raise ImportFormatError("file_type must be csv or jsonl.")
+
+
+def read_rows(upload, file_format):
+    """
+    Yield `(line, data, error)` for each row of the upload without loading
+    it whole. A row is either parsed into `data` or carries an `error`.
+    """
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    line = 0
+    try:
+        if file_format == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                line = reader.line_num
+                # CSV has no nulls: empty cells fall back to the field defaults
+                yield line, {key: value for key, value in row.items() if key and value not in (None, "")}, None
+        else:
+            for line, raw in enumerate(text, start=1):
+                if not raw.strip():
+                    continue
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    yield line, None, "Invalid JSON."
+                    continue
+                if not isinstance(data, dict):
+                    yield line, None, "Each line must be a JSON object."
+                    continue
+                yield line, data, None
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The rest of the file cannot be read reliably; report where it broke
+        yield line + 1, None, f"Unreadable input, import stopped: {e}"
+    finally:
+        text.detach()
+
+
+def _insert(batch):
+    Tag = FreelanceProject.skill_tags.through
+    deltas = Counter()
+    with transaction.atomic():
+        skills = resolve_skills_many([project.skills_required for project in batch])
+        FreelanceProject.objects.bulk_create(batch)
+        Tag.objects.bulk_create([
+            Tag(freelanceproject_id=project.pk, skill_id=skill_id)
+            for project, skill_ids in zip(batch, skills) for skill_id in skill_ids
+        ])
+        for project, skill_ids in zip(batch, skills):
+            deltas.update(facet_values(project.is_open, project.project_type, project.budget, skill_ids))
+        apply_deltas(deltas)
+    return len(batch)
+
+
+def import_projects(rows, created_by, client_company):
+    """
+    Validate and insert projects from `(line, data, error)` rows. Returns a
+    report with the created and failed counts and the first errors by line.
+    """
+    report = {"created": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    # One serializer validates every row, as ListSerializer does with its
+    # child, so its fields are built once rather than per row
+    serializer = FreelanceProjectSerializer()
+    batch = []
+    for line, data, error in rows:
+        if error is None:
+            try:
+                validated_data = serializer.run_validation(data)
+            except ValidationError as e:
+                error = e.detail
+            else:
+                batch.append(FreelanceProject(
+                    **validated_data, created_by=created_by, client_company=client_company
+                ))
+        if error is not None:
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"line": line, "errors": error})
+            else:
+                report["errors_truncated"] = True
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            report["created"] += _insert(batch)
+            batch = []
+    if batch:
+        report["created"] += _insert(batch)
+    return report
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from project.archive import ARCHIVE_CHUNK_SIZE, archive_closed_projects, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Move closed projects untouched for PROJECT_ARCHIVE_AFTER_DAYS, with their applications, "
+        "from the live tables into the archive tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override PROJECT_ARCHIVE_AFTER_DAYS.")
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE,
+                            help="Projects moved per transaction.")
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options["days"])
+        projects = applications = 0
+        for moved, moved_applications in archive_closed_projects(cutoff, options["chunk_size"]):
+            projects += moved
+            applications += moved_applications
+            self.stdout.write(f"Archived {projects} projects...")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {projects} projects and {applications} applications closed before {cutoff:%Y-%m-%d}."
+        ))
@@ -0,0 +1,144 @@
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from project.benchmarks import (
+    BATCH_SIZE, SyntheticData, benchmark_database, close_connection, latency_summary, report,
+    sqlite_profile, timed,
+)
+from project.management.commands.benchmark_matching import parse_size
+from project.models import Application, FreelanceProject
+from project.views import FreelanceProjectApplyView
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test FreelanceProjectApplyView against projects with a growing number "
+        "of existing applicants, including concurrent duplicate applies, and print JSON results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applicants", default="5,5k,50k",
+                            help="Comma-separated existing applicant counts, e.g. 5,5k,50k.")
+        parser.add_argument("--requests", type=int, default=200,
+                            help="New and duplicate applies timed per size.")
+        parser.add_argument("--concurrency", type=int, default=8,
+                            help="Freelancers double-clicking apply at the same moment.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        sizes = [parse_size(size) for size in options["applicants"].split(",")]
+        sqlite = connection.vendor == "sqlite"
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for size in sizes:
+                # A file-backed database with the production profile, so concurrent
+                # writers wait on the busy timeout like they would in a deployment
+                path = Path(directory) / f"bench-apply-{size}.sqlite3" if sqlite else None
+                with benchmark_database(path), sqlite_profile("production") if sqlite else nullcontext():
+                    results.append(self._run(size, options))
+
+        output = report("apply", results, requests=options["requests"],
+                        concurrency=options["concurrency"])
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+    def _run(self, size, options):
+        data = SyntheticData(options["seed"])
+        data.create_projects(1)
+        project = FreelanceProject.objects.get()
+        # Freelancers with profiles, so applies go through match scoring
+        existing = data.create_freelancers(size)
+        for start in range(0, size, BATCH_SIZE):
+            Application.objects.bulk_create([
+                Application(project_id=project.pk, user_id=user.pk)
+                for user in existing[start:start + BATCH_SIZE]
+            ])
+        FreelanceProject.objects.recount_applicants()
+        newcomers = data.create_freelancers(options["requests"])
+        self.stderr.write(f"Seeded a project with {size} applicants")
+
+        view = FreelanceProjectApplyView.as_view()
+        factory = APIRequestFactory()
+        path = f"/api/projects/{project.pk}/apply/"
+
+        def apply(user):
+            request = factory.post(path)
+            force_authenticate(request, user=user)
+            return view(request, project_id=project.pk)
+
+        # Timed requests reconnect with the profile's options
+        close_connection(connection)
+        samples = {"new": [], "duplicate": []}
+        for user in newcomers:
+            elapsed, response = timed(apply, user)
+            if response.status_code != 200:
+                raise CommandError(f"Apply returned {response.status_code}: {response.data}")
+            samples["new"].append(elapsed)
+        for user in existing[:options["requests"]]:
+            elapsed, response = timed(apply, user)
+            if response.status_code != 400:
+                raise CommandError(f"Duplicate apply returned {response.status_code}: {response.data}")
+            samples["duplicate"].append(elapsed)
+
+        return {
+            "applicants": size,
+            "latency_ms": {kind: latency_summary(values) for kind, values in samples.items()},
+            "double_click": self._double_click(data, apply, options["concurrency"], project),
+        }
+
+    def _double_click(self, data, apply, concurrency, project):
+        """Fire two applies per freelancer at once; exactly one of each pair may succeed."""
+        users = data.create_freelancers(concurrency)
+        before = FreelanceProject.objects.get(pk=project.pk).applicant_count
+        barrier = threading.Barrier(concurrency * 2)
+        statuses = Counter()
+        lock = threading.Lock()
+
+        def click(user):
+            try:
+                barrier.wait()
+                try:
+                    code = apply(user).status_code
+                except Exception as e:
+                    code = type(e).__name__
+                with lock:
+                    statuses[code] += 1
+            finally:
+                close_connection(connection)
+
+        threads = [threading.Thread(target=click, args=(user,)) for user in users for _ in range(2)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        stored = Application.objects.filter(project_id=project.pk, user__in=users).count()
+        counted = FreelanceProject.objects.get(pk=project.pk).applicant_count - before
+        return {
+            "freelancers": concurrency,
+            "statuses": {str(code): count for code, count in sorted(statuses.items(), key=str)},
+            "applications_stored": stored,
+            "applicant_count_delta": counted,
+            # Every pair must end as one 200 and one 400 (already applied): any
+            # other status, such as a locked-database error, fails the run, and
+            # the counter must match the stored rows.
+            "consistent": (
+                statuses == Counter({200: concurrency, 400: concurrency})
+                and stored == concurrency and counted == stored
+            ),
+            "seconds": round(elapsed, 3),
+        }
@@ -0,0 +1,110 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from project.benchmarks import BATCH_SIZE, SyntheticData, benchmark_database, latency_summary, report
+from project.models import Application, FreelanceProject
+from project.pagination import MAX_PAGE_SIZE
+from project.views import ApplicantDetails, FreelanceProjectListView, ListAppliedProjectsView
+from skillbridge import renderers
+from skillbridge.renderers import FastJSONParser, FastJSONRenderer
+
+
+def sample(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSON renderer and parser with the orjson-backed ones on "
+        "full pages of the project list, applicant list and applied-projects responses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=500)
+        parser.add_argument("--applicants", type=int, default=500,
+                            help="Freelancers applying to every listed project page.")
+        parser.add_argument("--repeat", type=int, default=500, help="Renders and parses timed per payload.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer is the stdlib renderer.")
+        with benchmark_database():
+            results = [self._compare(name, data, options["repeat"]) for name, data in self._payloads(options)]
+
+        output = report("json", results, repeat=options["repeat"], orjson=renderers.orjson.__version__)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+    def _payloads(self, options):
+        """The `data` of real responses, before rendering."""
+        data = SyntheticData(options["seed"])
+        data.create_projects(options["projects"])
+        freelancers = data.create_freelancers(options["applicants"])
+        projects = list(FreelanceProject.objects.order_by("-created_at", "-id")[:MAX_PAGE_SIZE])
+        for start in range(0, len(freelancers), BATCH_SIZE):
+            Application.objects.bulk_create([
+                Application(project_id=project.pk, user_id=user.pk, match_score=0.5)
+                for user in freelancers[start:start + BATCH_SIZE] for project in projects[:1]
+            ])
+        Application.objects.bulk_create([
+            Application(project_id=project.pk, user_id=freelancers[0].pk) for project in projects[1:]
+        ])
+        FreelanceProject.objects.recount_applicants()
+        self.stderr.write(f"Seeded {options['projects']} projects and {len(freelancers)} freelancers")
+
+        factory = APIRequestFactory()
+        client = projects[0].created_by
+
+        def get(view_class, user, path, **kwargs):
+            request = factory.get(path, {"page_size": MAX_PAGE_SIZE, "limit": MAX_PAGE_SIZE})
+            force_authenticate(request, user=user)
+            response = view_class.as_view()(request, **kwargs)
+            if response.status_code != 200:
+                raise CommandError(f"{path} returned {response.status_code}: {response.data}")
+            return response.data
+
+        yield "project_list", get(FreelanceProjectListView, client, "/api/projects/")
+        yield "applicants", get(
+            ApplicantDetails, client, f"/api/projects/{projects[0].pk}/applicants/", project_id=projects[0].pk
+        )
+        yield "applied_projects", get(ListAppliedProjectsView, freelancers[0], "/api/projects/applied/")
+
+    def _compare(self, name, data, repeat):
+        stdlib_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+        stdlib_bytes = stdlib_renderer.render(data, "application/json")
+        fast_bytes = fast_renderer.render(data, "application/json")
+
+        timings = {
+            "render": {
+                "stdlib": sample(lambda: stdlib_renderer.render(data, "application/json"), repeat),
+                "orjson": sample(lambda: fast_renderer.render(data, "application/json"), repeat),
+            },
+            "parse": {
+                "stdlib": sample(lambda: stdlib_parser.parse(io.BytesIO(stdlib_bytes)), repeat),
+                "orjson": sample(lambda: fast_parser.parse(io.BytesIO(stdlib_bytes)), repeat),
+            },
+        }
+        result = {"payload": name, "bytes": len(stdlib_bytes), "identical_output": stdlib_bytes == fast_bytes}
+        for step, pair in timings.items():
+            summaries = {impl: latency_summary(values) for impl, values in pair.items()}
+            result[step] = {
+                "latency_ms": summaries,
+                "speedup_p50": round(summaries["stdlib"]["p50"] / max(summaries["orjson"]["p50"], 1e-6), 2),
+            }
+        return result
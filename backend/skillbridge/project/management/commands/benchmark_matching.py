@@ -0,0 +1,119 @@
+import random
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from project.benchmarks import (
+    SyntheticData, benchmark_database, latency_summary, report, timed, traced_memory
+)
+from project.engines import get_project_engine
+from project.utils import feed_cache_key
+from project.views import FreelanceProjectListView
+
+ENGINES = ("tfidf", "embedding")
+# Feed requests made while tracing memory
+MEMORY_REQUESTS = 20
+
+
+def parse_size(value):
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the freelancer branch of FreelanceProjectListView on synthetic "
+        "projects and profiles, for each matching engine, and print JSON results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1k,10k,100k",
+                            help="Comma-separated project counts, e.g. 1k,10k,1m.")
+        parser.add_argument("--profiles", default="1k", help="Number of freelancer profiles.")
+        parser.add_argument("--requests", type=int, default=200, help="Feed requests per size.")
+        parser.add_argument("--engines", default="tfidf", help=f"Comma-separated subset of {ENGINES}.")
+        parser.add_argument("--limit", type=int, default=20, help="Page size requested from the feed.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        engines = [name.strip() for name in options["engines"].split(",")]
+        unknown = set(engines) - set(ENGINES)
+        if unknown:
+            raise CommandError(f"Unknown engines: {', '.join(sorted(unknown))}")
+        sizes = [parse_size(size) for size in options["sizes"].split(",")]
+        profiles = parse_size(options["profiles"])
+
+        results = []
+        for size in sizes:
+            with benchmark_database():
+                data = SyntheticData(options["seed"])
+                seed_time, _ = timed(data.create_projects, size)
+                _, freelancers = timed(data.create_freelancers, profiles)
+                self.stderr.write(f"Seeded {size} projects and {profiles} profiles in {seed_time:.1f}s")
+                for engine_name in engines:
+                    results.append(self._run(engine_name, size, freelancers, options))
+
+        output = report("matching", results, profiles=profiles, requests=options["requests"])
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+    def _run(self, engine_name, size, freelancers, options):
+        with tempfile.TemporaryDirectory() as store_dir, override_settings(
+            PROJECT_MATCHING_ENGINE=engine_name,
+            PROJECT_EMBEDDING_STORE={"PATH": f"{store_dir}/projects"},
+        ):
+            # Overriding the settings drops cached engines, so each run gets a fresh one
+            build_time, _ = timed(self._build, engine_name)
+            samples, total = self._feed(freelancers, options["requests"], options)
+
+            # Memory is traced in a separate pass over a freshly built engine,
+            # since tracing would slow down the timed build and requests above
+            with traced_memory() as memory:
+                self._build(engine_name)
+                self._feed(freelancers, min(options["requests"], MEMORY_REQUESTS), options)
+
+        return {
+            "engine": engine_name,
+            "projects": size,
+            "profiles": len(freelancers),
+            "build_seconds": round(build_time, 3),
+            "latency_ms": latency_summary(samples),
+            "throughput_rps": round(len(samples) / total, 2),
+            "memory_mb": memory,
+        }
+
+    def _build(self, engine_name):
+        engine = get_project_engine()
+        if engine_name == "tfidf":
+            engine.reset()
+            engine.count()
+        else:
+            engine.rebuild()
+
+    def _feed(self, freelancers, requests, options):
+        """Time `requests` feed requests; return the samples and the total seconds."""
+        view = FreelanceProjectListView.as_view()
+        factory = APIRequestFactory()
+        rng = random.Random(options["seed"])
+        samples = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            user = rng.choice(freelancers)
+            # Measure live scoring, not the per-freelancer cache
+            cache.delete(feed_cache_key(user.id))
+            request = factory.get("/api/projects/", {"limit": options["limit"]})
+            force_authenticate(request, user=user)
+            elapsed, response = timed(view, request)
+            if response.status_code != 200:
+                raise CommandError(f"Feed returned {response.status_code}: {response.data}")
+            samples.append(elapsed)
+        return samples, time.perf_counter() - started
@@ -0,0 +1,67 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from project.benchmarks import (
+    ARTIFACTS, DOMAINS, SKILLS, SyntheticData, benchmark_database, latency_summary, report, timed,
+)
+from project.management.commands.benchmark_matching import parse_size
+from project.models import FreelanceProject
+from project.views import ProjectSearchView
+
+
+class Command(BaseCommand):
+    help = "Benchmark ProjectSearchView on synthetic projects and print JSON results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10k,100k,1m",
+                            help="Comma-separated project counts, e.g. 10k,1m.")
+        parser.add_argument("--requests", type=int, default=200, help="Searches per size.")
+        parser.add_argument("--limit", type=int, default=20, help="Page size requested.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        sizes = [parse_size(size) for size in options["sizes"].split(",")]
+        vocabulary = SKILLS + DOMAINS + ARTIFACTS
+        results = []
+        for size in sizes:
+            with benchmark_database():
+                data = SyntheticData(options["seed"])
+                seed_time, _ = timed(data.create_projects, size)
+                self.stderr.write(f"Seeded {size} projects in {seed_time:.1f}s")
+                user = FreelanceProject.objects.values_list("created_by", flat=True).first()
+                results.append(self._run(size, user, vocabulary, options))
+
+        output = report("search", results, requests=options["requests"])
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+    def _run(self, size, user_id, vocabulary, options):
+        from accounts.models import User
+
+        user = User.objects.get(pk=user_id)
+        view = ProjectSearchView.as_view()
+        factory = APIRequestFactory()
+        rng = random.Random(options["seed"])
+        samples = []
+        started = time.perf_counter()
+        for _ in range(options["requests"]):
+            query = " ".join(rng.sample(vocabulary, rng.randint(1, 2)))
+            request = factory.get("/api/projects/search/", {"q": query, "limit": options["limit"]})
+            force_authenticate(request, user=user)
+            elapsed, response = timed(view, request)
+            if response.status_code != 200:
+                raise CommandError(f"Search returned {response.status_code}: {response.data}")
+            samples.append(elapsed)
+        total = time.perf_counter() - started
+        return {
+            "projects": size,
+            "latency_ms": latency_summary(samples),
+            "throughput_rps": round(len(samples) / total, 2),
+        }
@@ -0,0 +1,142 @@
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.utils import get_tokens_for_user
+from project.benchmarks import (
+    SQLITE_PROFILES, SyntheticData, benchmark_database, close_connection, latency_summary, report,
+    sqlite_profile, timed,
+)
+from project.models import Application, FreelanceProject
+from project.views import FreelanceProjectApplyView, FreelanceProjectDetailView
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent applies, logins and project reads against a file-backed SQLite "
+        "database with the default and the production (WAL) profile, and print JSON results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", default=",".join(SQLITE_PROFILES),
+                            help="Comma-separated profiles to compare: default, production.")
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent workers.")
+        parser.add_argument("--operations", type=int, default=100,
+                            help="Apply/login/read rounds per worker.")
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("benchmark_sqlite needs the SQLite backend.")
+        profiles = options["profiles"].split(",")
+        unknown = set(profiles) - set(SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            for name in profiles:
+                path = Path(directory) / f"bench-{name}.sqlite3"
+                with benchmark_database(path), sqlite_profile(name):
+                    results.append(self._run(name, options))
+
+        output = report("sqlite", results, threads=options["threads"],
+                        operations=options["operations"])
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+    def _run(self, name, options):
+        data = SyntheticData(options["seed"])
+        data.create_projects(options["projects"])
+        project_ids = list(FreelanceProject.objects.values_list("pk", flat=True))
+        workers = [data.create_freelancers(options["operations"]) for _ in range(options["threads"])]
+        close_connection(connection)
+        self.stderr.write(f"Seeded {len(project_ids)} projects for the {name} profile")
+
+        factory = APIRequestFactory()
+        apply_view = FreelanceProjectApplyView.as_view()
+        detail_view = FreelanceProjectDetailView.as_view()
+
+        def apply(user, project_id):
+            request = factory.post(f"/api/projects/{project_id}/apply/")
+            force_authenticate(request, user=user)
+            return apply_view(request, project_id=project_id)
+
+        def login(user):
+            # The writes LoginView makes: last_login and an outstanding refresh token
+            user.last_login = timezone.now()
+            user.save()
+            return get_tokens_for_user(user)
+
+        def read(user, project_id):
+            request = factory.get(f"/api/projects/{project_id}/")
+            force_authenticate(request, user=user)
+            return detail_view(request, project_id=project_id)
+
+        samples = {"apply": [], "login": [], "read": []}
+        errors = Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(workers))
+
+        def work(index, users):
+            rng = random.Random(options["seed"] + index)
+            local = {kind: [] for kind in samples}
+            failed = Counter()
+            try:
+                barrier.wait()
+                for user in users:
+                    project_id = rng.choice(project_ids)
+                    for kind, call in (
+                        ("apply", lambda: apply(user, project_id)),
+                        ("login", lambda: login(user)),
+                        ("read", lambda: read(user, project_id)),
+                    ):
+                        try:
+                            elapsed, _ = timed(call)
+                        except OperationalError as e:
+                            failed[f"{kind}: {e}"] += 1
+                        else:
+                            local[kind].append(elapsed)
+                        # What request_started/request_finished do between requests
+                        close_old_connections()
+            finally:
+                close_connection(connection)
+                with lock:
+                    for kind, values in local.items():
+                        samples[kind].extend(values)
+                    errors.update(failed)
+
+        threads = [threading.Thread(target=work, args=(i, users)) for i, users in enumerate(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        completed = sum(len(values) for values in samples.values())
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+        return {
+            "profile": name,
+            "journal_mode": journal_mode,
+            "seconds": round(elapsed, 3),
+            "completed": completed,
+            "throughput_ops_per_s": round(completed / elapsed, 1),
+            "errors": dict(errors),
+            "applications_stored": Application.objects.count(),
+            "latency_ms": {kind: latency_summary(values) for kind, values in samples.items() if values},
+        }
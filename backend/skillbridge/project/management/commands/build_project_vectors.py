@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from project.engines import get_project_engine
+from project.vector_store import EmbeddingMatchEngine
+
+
+class Command(BaseCommand):
+    help = "Rebuild the memory-mapped project vector store and its IVF lists."
+
+    def handle(self, *args, **options):
+        engine = get_project_engine()
+        if not isinstance(engine, EmbeddingMatchEngine):
+            raise CommandError('PROJECT_MATCHING_ENGINE must be "embedding" to build the vector store.')
+        engine.rebuild()
+        meta = engine.store.view()["meta"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {meta['count']} project vectors in {meta['nlist']} IVF lists."
+        ))
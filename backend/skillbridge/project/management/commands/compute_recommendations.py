@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from project.recommendations import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_TOP_N, compute_recommendations
+)
+
+
+class Command(BaseCommand):
+    help = "Precompute the top-N open projects for every freelancer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N,
+                            help="Number of projects stored per freelancer.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Freelancer profiles scored per worker task.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Worker processes (defaults to the CPU count).")
+        parser.add_argument("--resume", action="store_true",
+                            help="Continue the most recent unfinished run.")
+        parser.add_argument("--changed-only", action="store_true",
+                            help="Only score profiles changed since the last finished run.")
+
+    def handle(self, *args, **options):
+        run = compute_recommendations(
+            top_n=options["top_n"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            resume=options["resume"],
+            changed_only=options["changed_only"],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored recommendations for {run.processed} freelancers."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from project.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the open project facet counts (project type, budget range, skill) from scratch."
+
+    def handle(self, *args, **options):
+        values = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counts for {values} facet values."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from project.models import FreelanceProject
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized applicant_count of every project from the applicants table."
+
+    def handle(self, *args, **options):
+        fixed = FreelanceProject.objects.recount_applicants()
+        self.stdout.write(self.style.SUCCESS(f"Corrected applicant_count on {fixed} projects."))
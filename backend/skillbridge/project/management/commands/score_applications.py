@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from project.engines import application_match_score
+from project.models import Application
+
+CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Compute match scores for applications that have none, or for all of them with --all."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true",
+                            help="Rescore every application, e.g. after profiles changed.")
+
+    def handle(self, *args, **options):
+        applications = Application.objects.filter(project__is_open=True).select_related("user__profile")
+        if not options["all"]:
+            applications = applications.filter(match_score__isnull=True)
+
+        scored = 0
+        chunk = []
+        for application in applications.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+            profile = getattr(application.user, "profile", None)
+            application.match_score = application_match_score(profile, application.project_id)
+            chunk.append(application)
+            if len(chunk) >= CHUNK_SIZE:
+                scored += Application.objects.bulk_update(chunk, ["match_score"])
+                chunk = []
+        if chunk:
+            scored += Application.objects.bulk_update(chunk, ["match_score"])
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} applications."))
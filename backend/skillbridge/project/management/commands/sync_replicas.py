@@ -0,0 +1,34 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from skillbridge.db_router import replica_aliases
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto every configured read replica."
+
+    def handle(self, *args, **options):
+        aliases = replica_aliases()
+        if not aliases:
+            self.stdout.write("No replicas configured (set DATABASE_REPLICAS).")
+            return
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            if settings.DATABASES[alias]["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError(f"{alias} is not SQLite; use the database's own replication.")
+
+        source = sqlite3.connect(settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"])
+        try:
+            for alias in aliases:
+                target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+                try:
+                    # Online backup: consistent snapshot without blocking writers for long
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"Synced {alias}.")
+        finally:
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Synced {len(aliases)} replica(s)."))
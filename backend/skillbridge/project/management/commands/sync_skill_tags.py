@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.skills import resolve_skills
+from project.models import FreelanceProject
+from project.utils import PROFILES_VERSION_KEY, PROJECTS_VERSION_KEY, bump_version
+
+CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Rebuild skill tags for projects and profiles from their free-text skills."
+
+    def handle(self, *args, **options):
+        projects = self._sync(FreelanceProject.objects.only("pk", "skills_required"), "skills_required")
+        profiles = self._sync(Profile.objects.only("pk", "skills"), "skills")
+        # Running match indexes pick up the new tags on their next delta sync
+        bump_version(PROJECTS_VERSION_KEY)
+        bump_version(PROFILES_VERSION_KEY)
+        self.stdout.write(self.style.SUCCESS(
+            f"Synced skill tags for {projects} projects and {profiles} profiles."
+        ))
+
+    def _sync(self, queryset, field):
+        count = 0
+        chunk = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+            chunk.append(obj)
+            if len(chunk) >= CHUNK_SIZE:
+                count += self._sync_chunk(chunk, field)
+                chunk = []
+        if chunk:
+            count += self._sync_chunk(chunk, field)
+        return count
+
+    def _sync_chunk(self, chunk, field):
+        with transaction.atomic():
+            for obj in chunk:
+                obj.skill_tags.set(resolve_skills(getattr(obj, field)))
+            type(chunk[0]).objects.filter(pk__in=[obj.pk for obj in chunk]).update(updated_at=timezone.now())
+        return len(chunk)
@@ -0,0 +1,576 @@
+"""
+Long-lived TF-IDF indexes used to match freelancers and projects.
+
+Documents are tokenized once, when they are written, into hashed term counts.
+Each worker process keeps its own index as an immutable snapshot: a write
+derives a new snapshot from the previous one plus the changed rows and swaps
+it in, so scoring reads whichever snapshot it picked up and never takes a
+lock. Writes bump a global version counter in the cache and log the primary
+keys they touched under that version; a worker that notices versions it did
+not produce itself fetches exactly those rows before answering.
+"""
+import logging
+import threading
+from collections import defaultdict
+from functools import cached_property
+
+import numpy as np
+import scipy.sparse as sp
+from django.db import transaction
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from accounts.models import Profile
+from skillbridge.db_router import use_primary
+from .models import FreelanceProject
+from .utils import PROJECTS_VERSION_KEY, PROFILES_VERSION_KEY, get_logged_writes, get_version, log_writes
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 18
+LOAD_CHUNK_SIZE = 2000
+# Rows appended or superseded since the last full build are folded into a
+# new base, with a fresh IDF, once they reach this share of the base
+COMPACT_FRACTION = 0.1
+COMPACT_MIN_ROWS = 512
+
+
+def make_vectorizer():
+    return HashingVectorizer(n_features=N_FEATURES, alternate_sign=False, norm=None)
+
+
+def project_text(project):
+    return " ".join([
+        project.title or "",
+        project.description or "",
+        project.skills_required or "",
+    ])
+
+
+def profile_text(profile):
+    return " ".join([
+        profile.skills or "",
+        profile.experience_level or "",
+        profile.bio or "",
+        profile.portfolio_links or "",
+    ])
+
+
+def project_features(budget, project_type, created_at):
+    """Numeric feature row of a project: budget (NaN if unknown), hourly flag, creation timestamp."""
+    return [
+        np.nan if budget is None else float(budget),
+        1.0 if project_type == "hourly" else 0.0,
+        created_at.timestamp(),
+    ]
+
+
+def budget_reference(features):
+    """Sorted known budgets of `features` rows, against which budget percentiles are taken."""
+    budget = features[:, 0]
+    return np.sort(budget[~np.isnan(budget)])
+
+
+def project_columns(features, reference):
+    """
+    Named float arrays for the hybrid score, one entry per feature row.
+    Budgets are placed as a percentile among the `reference` budgets;
+    unknown budgets sit in the middle.
+    """
+    budget = features[:, 0]
+    budget_percentile = np.full(budget.shape[0], 0.5)
+    known = ~np.isnan(budget)
+    if reference.size > 1:
+        ranks = np.searchsorted(reference, budget[known])
+        budget_percentile[known] = np.minimum(ranks / (reference.size - 1), 1.0)
+    return {
+        "budget": budget,
+        "budget_percentile": budget_percentile,
+        "hourly": features[:, 1],
+        "created_ts": features[:, 2],
+    }
+
+
+def _tag_index(tags, n_docs):
+    """Inverted tag -> rows index, column-major so selecting tags is cheap."""
+    lengths = np.fromiter((row.size for row in tags), dtype=np.intp, count=n_docs)
+    if not lengths.sum():
+        return None
+    columns = np.concatenate(tags)
+    rows = np.repeat(np.arange(n_docs), lengths)
+    return sp.csc_matrix(
+        (np.ones(columns.size, dtype=np.int8), (rows, columns)),
+        shape=(n_docs, int(columns.max()) + 1),
+    )
+
+
+def _best(scores, k):
+    """Positions of the `k` highest `scores`, best first, by partial selection."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    winners = np.argpartition(-scores, k - 1)[:k]
+    return winners[np.argsort(-scores[winners], kind="stable")]
+
+
+class IndexBase:
+    """Rows built in one go, at load or compaction time, weighted with the IDF of that moment."""
+
+    def __init__(self, index, ids, tf, features, tags):
+        n_docs = len(ids)
+        self.ids = ids
+        self.slots = {pk: slot for slot, pk in enumerate(ids)}
+        self.tf = tf
+        self.features = features
+        self.tags = tags
+        df = np.bincount(tf.indices, minlength=N_FEATURES)
+        # Same smoothed IDF as sklearn's TfidfVectorizer defaults.
+        self.idf = sp.diags(np.log((1 + n_docs) / (1 + df)) + 1)
+        if n_docs:
+            self.matrix = normalize(tf @ self.idf, norm="l2", copy=False).tocsr()
+        else:
+            self.matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+        self.reference = index._reference(features)
+        self.columns = index._derive_columns(features, self.reference)
+        self.tag_index = _tag_index(tags, n_docs)
+
+
+class IndexSnapshot:
+    """
+    Immutable state of a TfidfMatchIndex: a base plus the rows written since.
+
+    Rows are numbered across the base and then the tail. Written rows are
+    appended to the tail with the base's IDF, and the rows they supersede are
+    only marked dead, so a write costs as much as the rows it touches. The
+    arrays spanning every row are derived once per snapshot, by its first read.
+    """
+
+    def __init__(self, base, tail_ids=(), tail_slots=None, tail_tf=None, tail_matrix=None,
+                 tail_features=None, tail_tags=(), tail_columns=None, dead=frozenset()):
+        self.base = base
+        self.tail_ids = list(tail_ids)
+        self.tail_slots = tail_slots or {}
+        empty = sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+        self.tail_tf = empty if tail_tf is None else tail_tf
+        self.tail_matrix = empty if tail_matrix is None else tail_matrix
+        if tail_features is None:
+            tail_features = np.zeros((0, base.features.shape[1]))
+        self.tail_features = tail_features
+        self.tail_tags = list(tail_tags)
+        self.tail_columns = tail_columns or {name: column[:0] for name, column in base.columns.items()}
+        self.dead = dead
+        self.n_base = len(base.ids)
+        self.size = self.n_base + len(self.tail_ids)
+        self.live_count = self.size - len(dead)
+
+    def slot_of(self, pk):
+        slot = self.tail_slots.get(pk)
+        if slot is None:
+            slot = self.base.slots.get(pk)
+            if slot in self.dead:
+                return None
+        return slot
+
+    def pk_at(self, slot):
+        return self.base.ids[slot] if slot < self.n_base else self.tail_ids[slot - self.n_base]
+
+    def needs_compaction(self):
+        return len(self.tail_ids) + len(self.dead) > max(COMPACT_MIN_ROWS, COMPACT_FRACTION * self.n_base)
+
+    @cached_property
+    def alive(self):
+        alive = np.ones(self.size, dtype=bool)
+        alive[list(self.dead)] = False
+        return alive
+
+    @cached_property
+    def columns(self):
+        return {
+            name: np.concatenate([column, self.tail_columns[name]])
+            for name, column in self.base.columns.items()
+        }
+
+    def _candidate_rows(self, tag_ids):
+        rows = []
+        index = self.base.tag_index
+        if index is not None:
+            known = [tag for tag in tag_ids if tag < index.shape[1]]
+            if known:
+                rows.append(np.unique(index[:, known].indices))
+        tail = [
+            self.n_base + offset for offset, tags in enumerate(self.tail_tags)
+            if np.isin(tags, tag_ids).any()
+        ]
+        rows.append(np.asarray(tail, dtype=np.intp))
+        rows = np.concatenate(rows).astype(np.intp)
+        return rows[self.alive[rows]]
+
+    def select_rows(self, tag_ids=None, filters=None):
+        """
+        Live rows sharing one of `tag_ids` and passing `filters`, or None for
+        every row. `filters` provides `mask(columns)` and optional `skill_ids`.
+        """
+        rows = None if tag_ids is None else self._candidate_rows(tag_ids)
+        if filters:
+            mask = filters.mask(self.columns) & self.alive
+            if filters.skill_ids is not None:
+                tagged = np.zeros_like(mask)
+                tagged[self._candidate_rows(filters.skill_ids)] = True
+                mask &= tagged
+            selected = np.flatnonzero(mask)
+            rows = selected if rows is None else np.intersect1d(rows, selected, assume_unique=True)
+        return rows
+
+    def similarities(self, queries, rows=None):
+        """Sparse `(rows, queries)` cosine similarities, over every row when `rows` is None."""
+        if rows is None:
+            base, tail = self.base.matrix, self.tail_matrix
+        else:
+            split = np.searchsorted(rows, self.n_base)
+            base = self.base.matrix[rows[:split]]
+            tail = self.tail_matrix[rows[split:] - self.n_base]
+        return sp.vstack([base @ queries.T, tail @ queries.T], format="csr")
+
+    def rank(self, similarity, rows, k, scorer=None):
+        """The `k` best `(id, score)` pairs from `similarity` over `rows` (None for every row)."""
+        if rows is None:
+            columns = self.columns
+            candidates = self.live_count
+        else:
+            columns = {name: column[rows] for name, column in self.columns.items()}
+            candidates = rows.size
+        scores = similarity if scorer is None else scorer(similarity, columns)
+        if rows is None and self.dead:
+            scores[~self.alive] = -np.inf
+        winners = _best(scores, min(k, candidates))
+        slots = winners if rows is None else rows[winners]
+        return [(self.pk_at(slot), float(scores[i])) for slot, i in zip(slots, winners)]
+
+
+class TfidfMatchIndex:
+    """
+    Incrementally maintained TF-IDF matrix over the rows of a queryset.
+
+    Subclasses provide `get_queryset()`, the `text_fields` joined into a
+    document, and the cache key of the version counter bumped on writes.
+    They may also declare `feature_fields`, kept as numeric columns aligned
+    with the matrix rows for hybrid scoring, and a `tags_field` M2M whose
+    ids are kept as an inverted index for candidate pre-filtering.
+    """
+    model = None
+    text_fields = ()
+    feature_fields = ()
+    tags_field = None
+    version_key = None
+
+    def __init__(self):
+        # Serializes writers only; readers work off self._snapshot
+        self._lock = threading.RLock()
+        self._vectorizer = make_vectorizer()
+        self._snapshot = None
+        self._version = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    # ---------- rows ----------
+    def _join(self, values):
+        return " ".join(value or "" for value in values)
+
+    def _split(self, values):
+        """Turn `text_fields + feature_fields` values into `(text, feature_row)`."""
+        n_text = len(self.text_fields)
+        return self._join(values[:n_text]), self._feature_row(values[n_text:])
+
+    def _feature_row(self, values):
+        return []
+
+    def _reference(self, features):
+        """Statistics of the base rows that derived columns are computed against."""
+        return None
+
+    def _derive_columns(self, features, reference):
+        """Named float arrays, aligned with `features` rows, computed from the raw features."""
+        return {}
+
+    def _vectorize(self, texts):
+        return self._vectorizer.transform(texts).tocsr()
+
+    def _features(self, rows):
+        return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(self.feature_fields))
+
+    def _fetch_tags(self, pks=None):
+        """Map pk -> tag ids from the `tags_field` through table, for `pks` or every indexed row."""
+        tags = defaultdict(list)
+        if self.tags_field is None:
+            return tags
+        field = self.model._meta.get_field(self.tags_field)
+        source = field.m2m_field_name()
+        rows = field.remote_field.through.objects.all()
+        if pks is None:
+            rows = rows.filter(**{f"{source}__in": self.get_queryset()})
+        else:
+            rows = rows.filter(**{f"{source}_id__in": pks})
+        pairs = rows.values_list(f"{source}_id", f"{field.m2m_reverse_field_name()}_id")
+        for pk, tag in pairs.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            tags[pk].append(tag)
+        return tags
+
+    @staticmethod
+    def skills_for(obj):
+        """Skill ids of the project or profile being matched, or None if it has none."""
+        skill_ids = list(obj.skill_tags.values_list("id", flat=True))
+        return skill_ids or None
+
+    # ---------- loading / syncing ----------
+    def _load(self, version):
+        tags = self._fetch_tags()
+        ids, blocks, texts, features = [], [], [], []
+        rows = self.get_queryset().values_list("pk", *self.text_fields, *self.feature_fields)
+        for pk, *values in rows.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            text, feature_row = self._split(values)
+            ids.append(pk)
+            texts.append(text)
+            features.append(feature_row)
+            if len(texts) >= LOAD_CHUNK_SIZE:
+                blocks.append(self._vectorize(texts))
+                texts = []
+        if texts:
+            blocks.append(self._vectorize(texts))
+
+        tf = sp.vstack(blocks, format="csr") if blocks else sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+        tags = [np.asarray(tags.get(pk, ()), dtype=np.int64) for pk in ids]
+        self._snapshot = IndexSnapshot(IndexBase(self, ids, tf, self._features(features), tags))
+        self._version = version
+        logger.info("Loaded %s with %d documents", type(self).__name__, len(ids))
+
+    def _sync(self, version):
+        """Catch up with writes made by other worker processes, from the write log."""
+        pks = get_logged_writes(self.version_key, self._version, version)
+        if pks is None:
+            self._load(version)
+            return
+        self._snapshot = self._apply(self._snapshot, self._fetch_rows(pks), pks)
+        self._version = version
+
+    def _fetch_rows(self, pks):
+        """`(pk, values, tags)` for the rows of `pks` still in the indexed queryset."""
+        rows = self.get_queryset().filter(pk__in=pks).values_list(
+            "pk", *self.text_fields, *self.feature_fields
+        )
+        rows = list(rows)
+        tags = self._fetch_tags([row[0] for row in rows])
+        return [(pk, values, tags.get(pk, ())) for pk, *values in rows]
+
+    def _apply(self, snapshot, upserts, removed):
+        """
+        Derive the snapshot after writing `upserts`, `(pk, values, tags)`
+        rows, and dropping every other pk in `removed`.
+        """
+        dead = set(snapshot.dead)
+        tail_slots = dict(snapshot.tail_slots)
+        for pk in set(removed) | {pk for pk, _, _ in upserts}:
+            slot = snapshot.slot_of(pk)
+            if slot is not None:
+                dead.add(slot)
+            tail_slots.pop(pk, None)
+
+        tail_ids = snapshot.tail_ids
+        tail_tf, tail_matrix = snapshot.tail_tf, snapshot.tail_matrix
+        tail_features, tail_tags = snapshot.tail_features, snapshot.tail_tags
+        tail_columns = snapshot.tail_columns
+        if upserts:
+            base = snapshot.base
+            texts, features = zip(*(self._split(values) for _, values, _ in upserts))
+            tf = self._vectorize(list(texts))
+            features = self._features(features)
+            for offset, (pk, _, _) in enumerate(upserts):
+                tail_slots[pk] = snapshot.size + offset
+            tail_ids = tail_ids + [pk for pk, _, _ in upserts]
+            tail_tf = sp.vstack([tail_tf, tf], format="csr")
+            tail_matrix = sp.vstack([tail_matrix, normalize(tf @ base.idf, norm="l2")], format="csr")
+            tail_features = np.vstack([tail_features, features])
+            tail_tags = tail_tags + [np.asarray(tags, dtype=np.int64) for _, _, tags in upserts]
+            columns = self._derive_columns(features, base.reference)
+            tail_columns = {
+                name: np.concatenate([tail_columns[name], column]) for name, column in columns.items()
+            }
+
+        snapshot = IndexSnapshot(
+            snapshot.base, tail_ids, tail_slots, tail_tf, tail_matrix,
+            tail_features, tail_tags, tail_columns, frozenset(dead),
+        )
+        return self._compact(snapshot) if snapshot.needs_compaction() else snapshot
+
+    def _compact(self, snapshot):
+        """Rebuild the live rows of `snapshot` into a new base, refreshing the IDF."""
+        base = snapshot.base
+        live = np.flatnonzero(snapshot.alive)
+        split = np.searchsorted(live, snapshot.n_base)
+        base_rows, tail_rows = live[:split], live[split:] - snapshot.n_base
+        ids = [base.ids[slot] for slot in base_rows] + [snapshot.tail_ids[slot] for slot in tail_rows]
+        tf = sp.vstack([base.tf[base_rows], snapshot.tail_tf[tail_rows]], format="csr")
+        features = np.vstack([base.features[base_rows], snapshot.tail_features[tail_rows]])
+        tags = [base.tags[slot] for slot in base_rows] + [snapshot.tail_tags[slot] for slot in tail_rows]
+        return IndexSnapshot(IndexBase(self, ids, tf, features, tags))
+
+    def is_warm(self):
+        """Whether this process has loaded the index, so reads need at most a delta sync."""
+        return self._snapshot is not None
+
+    def reset(self):
+        """Drop everything so the next read reloads from the database."""
+        with self._lock:
+            self._snapshot = None
+            self._version = None
+
+    def current(self):
+        """
+        The snapshot to score against, after catching up with the global
+        version. Only loading and syncing take the lock.
+        """
+        version = get_version(self.version_key)
+        snapshot = self._snapshot
+        if snapshot is not None and version == self._version:
+            return snapshot
+        # Syncs fetch rows by pk right after their commit, so they must never
+        # read a lagging replica
+        with self._lock, use_primary():
+            if self._snapshot is None:
+                self._load(version)
+            elif version != self._version:
+                self._sync(version)
+            return self._snapshot
+
+    # ---------- incremental updates ----------
+    def record_write(self, pk, values=None):
+        """
+        Apply a committed write to this worker's index and log it under a
+        new global version. Pass `values=None` when the row left the indexed
+        queryset.
+        """
+        version = log_writes(self.version_key, [pk])
+        with self._lock:
+            if self._snapshot is None:
+                return
+            upserts = [] if values is None else [(pk, values, self._fetch_tags([pk]).get(pk, ()))]
+            self._snapshot = self._apply(self._snapshot, upserts, [pk])
+            # Only claim the new version if nobody else wrote in between;
+            # otherwise the next read replays the missing versions.
+            if version == self._version + 1:
+                self._version = version
+
+    def on_commit_write(self, instance, indexed=True):
+        pk = instance.pk
+        values = None
+        if indexed:
+            values = [getattr(instance, field) for field in self.text_fields + self.feature_fields]
+        transaction.on_commit(lambda: self.record_write(pk, values))
+
+    def on_commit_rows(self, pks):
+        """
+        Re-index rows written in bulk, which send no signals (bulk_create,
+        queryset update). Every worker, this one included, fetches them on
+        its next read.
+        """
+        pks = list(pks)
+        if pks:
+            transaction.on_commit(lambda: log_writes(self.version_key, pks))
+
+    def on_commit_bulk_create(self, instances):
+        self.on_commit_rows([instance.pk for instance in instances])
+
+    # ---------- scoring ----------
+    def _queries(self, snapshot, texts):
+        return normalize(self._vectorize(texts) @ snapshot.base.idf, norm="l2")
+
+    def count(self, tag_ids=None, filters=None):
+        """Number of indexed documents, optionally only those sharing one of `tag_ids` and passing `filters`."""
+        snapshot = self.current()
+        if tag_ids is None and not filters:
+            return snapshot.live_count
+        return len(snapshot.select_rows(tag_ids, filters))
+
+    def similarity(self, text, pk):
+        """Cosine similarity between `text` and the document `pk`, or None if it is not indexed."""
+        snapshot = self.current()
+        slot = snapshot.slot_of(pk)
+        if slot is None:
+            return None
+        rows = np.asarray([slot])
+        return float(snapshot.similarities(self._queries(snapshot, [text]), rows).toarray()[0, 0])
+
+    def top_k(self, text, k, tag_ids=None, scorer=None, filters=None):
+        """
+        Return the `k` best `(id, score)` pairs for `text`, best first, using
+        a partial selection instead of sorting every score.
+
+        When `tag_ids` is given only documents sharing one of them are scored,
+        and `filters` narrows the candidates further (see `select_rows`).
+        `scorer(similarity, columns)` may combine the cosine similarity with
+        the derived feature columns into the final score.
+        """
+        snapshot = self.current()
+        if not snapshot.live_count or k <= 0:
+            return []
+        rows = snapshot.select_rows(tag_ids, filters)
+        if rows is not None and not rows.size:
+            return []
+        similarity = snapshot.similarities(self._queries(snapshot, [text]), rows).toarray().ravel()
+        return snapshot.rank(similarity, rows, k, scorer)
+
+    def top_k_many(self, texts, k, tag_ids=None, scorers=None):
+        """
+        `top_k` for many texts at once, with `tag_ids` and `scorers` aligned
+        with `texts`. Every text is scored against every document with one
+        sparse matrix product; the per-text results equal those of `top_k`.
+        """
+        snapshot = self.current()
+        if not snapshot.live_count or k <= 0 or not texts:
+            return [[] for _ in texts]
+        similarities = snapshot.similarities(self._queries(snapshot, texts)).tocsc()
+        rankings = []
+        for i in range(len(texts)):
+            rows = snapshot.select_rows(tag_ids[i] if tag_ids else None)
+            if rows is not None and not rows.size:
+                rankings.append([])
+                continue
+            similarity = similarities[:, i].toarray().ravel()
+            if rows is not None:
+                similarity = similarity[rows]
+            rankings.append(snapshot.rank(similarity, rows, k, scorers[i] if scorers else None))
+        return rankings
+
+
+class ProjectMatchIndex(TfidfMatchIndex):
+    model = FreelanceProject
+    text_fields = ("title", "description", "skills_required")
+    feature_fields = ("budget", "project_type", "created_at")
+    tags_field = "skill_tags"
+    version_key = PROJECTS_VERSION_KEY
+
+    def get_queryset(self):
+        return FreelanceProject.objects.filter(is_open=True)
+
+    def _feature_row(self, values):
+        return project_features(*values)
+
+    def _reference(self, features):
+        return budget_reference(features)
+
+    def _derive_columns(self, features, reference):
+        return project_columns(features, reference)
+
+
+class ProfileMatchIndex(TfidfMatchIndex):
+    model = Profile
+    text_fields = ("skills", "experience_level", "bio", "portfolio_links")
+    tags_field = "skill_tags"
+    version_key = PROFILES_VERSION_KEY
+
+    def get_queryset(self):
+        return Profile.objects.filter(user__role="freelancer")
+
+
+project_index = ProjectMatchIndex()
+profile_index = ProfileMatchIndex()
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_profile_updated_at'),
+        ('project', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('changed_only', models.BooleanField(default=False)),
+                ('top_n', models.PositiveIntegerField()),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectRecommendation',
+            fields=[
+                ('freelancer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='project_recommendation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('project_ids', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
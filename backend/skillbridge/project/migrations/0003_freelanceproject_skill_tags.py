@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_skill_skillalias_profile_skill_tags'),
+        ('project', '0002_projectrecommendation_matchingrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelanceproject',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='projects', to='accounts.skill'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_seed_skill_aliases'),
+        ('project', '0003_freelanceproject_skill_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='freelanceproject',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='project_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='freelanceproject',
+            index=models.Index(fields=['is_open', '-created_at', '-id'], name='project_open_created_idx'),
+        ),
+    ]
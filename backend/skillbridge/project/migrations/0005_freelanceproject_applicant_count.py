@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:24
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_applicant_count(apps, schema_editor):
+    FreelanceProject = apps.get_model("project", "FreelanceProject")
+    applications = (
+        FreelanceProject.applicants.through.objects
+        .filter(freelanceproject_id=models.OuterRef("pk"))
+        .values("freelanceproject_id")
+        .annotate(total=models.Count("pk"))
+        .values("total")
+    )
+    FreelanceProject.objects.update(applicant_count=Coalesce(models.Subquery(applications), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_freelanceproject_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelanceproject',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_applicant_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Adopt the auto-created applicants through table as the Application model
+    without touching the table, then add the new columns and indexes.
+    """
+
+    dependencies = [
+        ('project', '0005_freelanceproject_applicant_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Application',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('project', models.ForeignKey(db_column='freelanceproject_id', on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='project.freelanceproject')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'project_freelanceproject_applicants',
+                        'unique_together': {('project', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='freelanceproject',
+                    name='applicants',
+                    field=models.ManyToManyField(blank=True, limit_choices_to={'role': 'freelancer'}, related_name='applied_projects', through='project.Application', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='applied_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['project', '-match_score'], name='application_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['project', '-applied_at'], name='application_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:42
+
+from django.conf import settings
+from collections import Counter
+
+from django.db import migrations, models
+
+# Frozen copies of project.facets as of this migration: later changes to the
+# module must not change what this migration does
+PROJECT_TYPE = "project_type"
+BUDGET = "budget"
+SKILL = "skill"
+BUDGET_RANGES = [
+    ("under-500", None, 500),
+    ("500-2000", 500, 2000),
+    ("2000-10000", 2000, 10000),
+    ("10000-plus", 10000, None),
+]
+
+
+def budget_range(budget):
+    if budget is None:
+        return "unspecified"
+    budget = float(budget)
+    for key, low, high in BUDGET_RANGES:
+        if (low is None or budget >= low) and (high is None or budget < high):
+            return key
+
+
+def backfill_facet_counts(apps, schema_editor):
+    FreelanceProject = apps.get_model("project", "FreelanceProject")
+    ProjectFacetCount = apps.get_model("project", "ProjectFacetCount")
+    counts = Counter()
+    open_projects = FreelanceProject.objects.filter(is_open=True)
+    for project_type, budget in open_projects.values_list("project_type", "budget").iterator():
+        counts[(PROJECT_TYPE, project_type)] += 1
+        counts[(BUDGET, budget_range(budget))] += 1
+    links = FreelanceProject.skill_tags.through.objects.filter(freelanceproject__is_open=True)
+    for skill_id in links.values_list("skill_id", flat=True).iterator():
+        counts[(SKILL, str(skill_id))] += 1
+    ProjectFacetCount.objects.bulk_create([
+        ProjectFacetCount(facet=facet, value=value, count=total)
+        for (facet, value), total in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_seed_skill_aliases'),
+        ('project', '0006_application'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=64)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='freelanceproject',
+            index=models.Index(fields=['is_open', 'project_type', '-created_at', '-id'], name='project_open_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='freelanceproject',
+            index=models.Index(fields=['is_open', 'budget'], name='project_open_budget_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectfacetcount',
+            index=models.Index(fields=['facet', '-count'], name='project_facet_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectfacetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='unique_project_facet_value'),
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_seed_skill_aliases'),
+        ('project', '0007_projectfacetcount'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='freelanceproject',
+            index=models.Index(fields=['is_open', 'updated_at'], name='project_open_updated_idx'),
+        ),
+    ]
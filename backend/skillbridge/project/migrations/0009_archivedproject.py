@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_seed_skill_aliases'),
+        ('project', '0008_freelanceproject_open_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('skills_required', models.TextField()),
+                ('skill_tags', models.JSONField(default=list)),
+                ('budget', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('project_type', models.CharField(choices=[('fixed', 'Fixed Price'), ('hourly', 'Hourly')], default='fixed', max_length=20)),
+                ('is_open', models.BooleanField(default=False)),
+                ('applicant_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('client_company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_projects', to='accounts.clientcompany')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_projects', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applied_at', models.DateTimeField()),
+                ('match_score', models.FloatField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='project.archivedproject')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedproject',
+            index=models.Index(fields=['created_by', '-created_at'], name='archived_owner_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedapplication',
+            unique_together={('project', 'user')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0009_archivedproject'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectrecommendation',
+            name='projects_version',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
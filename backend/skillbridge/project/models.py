@@ -1,7 +1,97 @@
 import uuid
 from django.db import models
 from django.conf import settings
-from accounts.models import ClientCompany
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from accounts.models import ClientCompany, Skill
+from accounts.skills import resolve_skills
+from .utils import bump_listings_version_on_commit
+
+class FreelanceProjectQuerySet(models.QuerySet):
+    # Fields the project matching indexes are built from
+    INDEXED_FIELDS = frozenset({
+        "title", "description", "skills_required", "budget", "project_type", "created_at", "is_open",
+    })
+    # Written on every apply; listings pick them up when their cache entries expire
+    COUNTER_FIELDS = frozenset({"applicant_count", "updated_at"})
+    # Fields the open project facet counts are bucketed by
+    FACET_FIELDS = frozenset({"is_open", "project_type", "budget"})
+
+    # Bulk writes skip the model signals, so they expire the shared listing
+    # cache, re-index the rows and adjust the facet counts themselves; save()
+    # and delete() are covered by project.signals. bulk_update() writes
+    # through update(), one batch at a time.
+    def update(self, **kwargs):
+        indexed = self.INDEXED_FIELDS.intersection(kwargs)
+        # Collected first: the filter may select on the very fields being updated
+        pks = list(self.values_list("pk", flat=True)) if indexed else []
+        facets = self._facets(pks) if self.FACET_FIELDS.intersection(kwargs) else None
+        rows = super().update(**kwargs)
+        if rows and not self.COUNTER_FIELDS.issuperset(kwargs):
+            bump_listings_version_on_commit()
+            self._reindex(pks)
+            if facets is not None:
+                self._recount_facets(pks, facets)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_listings_version_on_commit()
+        self._reindex([obj.pk for obj in objs])
+        return objs
+
+    def _reindex(self, pks):
+        from .engines import get_project_engine
+
+        get_project_engine().on_commit_rows(pks)
+
+    def _facets(self, pks):
+        from .facets import stored_facet_values
+
+        return stored_facet_values(pks)
+
+    def _recount_facets(self, pks, before):
+        from .facets import apply_deltas, diff, stored_facet_values
+
+        apply_deltas(diff(before, stored_facet_values(pks)))
+
+    def requiring_skills(self, skills, match="any"):
+        """
+        Filter to projects tagged with any (or all) of `skills`, given as
+        free text or a list of names; aliases are resolved to canonical skills.
+        """
+        if isinstance(skills, str):
+            skills = [skills]
+        skill_ids = resolve_skills(",".join(skills), create=False)
+        if not skill_ids:
+            return self.none()
+        through = FreelanceProject.skill_tags.through.objects.filter(skill_id__in=skill_ids)
+        if match == "all":
+            through = (
+                through.values("freelanceproject_id")
+                .annotate(matched=models.Count("skill_id"))
+                .filter(matched=len(skill_ids))
+            )
+        return self.filter(pk__in=through.values("freelanceproject_id"))
+
+    def recount_applicants(self):
+        """
+        Recompute the denormalized `applicant_count` from the applicants
+        through table for rows where it drifted; returns how many were fixed.
+        """
+        applications = (
+            Application.objects
+            .filter(project_id=models.OuterRef("pk"))
+            .values("project_id")
+            .annotate(total=models.Count("pk"))
+            .values("total")
+        )
+        actual = Coalesce(models.Subquery(applications), 0)
+        stale = self.annotate(actual=actual).exclude(applicant_count=models.F("actual"))
+        return self.model.objects.filter(pk__in=stale.values("pk")).update(
+            applicant_count=actual, updated_at=timezone.now()
+        )
+
 
 class FreelanceProject(models.Model):
     PROJECT_TYPE_CHOICES = [
@@ -25,11 +115,15 @@ class FreelanceProject(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     skills_required = models.TextField(help_text="Comma-separated list of required skills")
+    skill_tags = models.ManyToManyField(Skill, related_name="projects", blank=True)
     budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     project_type = models.CharField(max_length=20, choices=PROJECT_TYPE_CHOICES, default="fixed")
     is_open = models.BooleanField(default=True)
+    # Denormalized size of `applicants`, kept in step by project.signals
+    applicant_count = models.PositiveIntegerField(default=0)
     applicants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through="Application",
         related_name="applied_projects",
         blank=True,
         limit_choices_to={"role": "freelancer"}
@@ -38,5 +132,162 @@ class FreelanceProject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FreelanceProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination: newest first, per client and over open projects
+            models.Index(fields=["created_by", "-created_at", "-id"], name="project_owner_created_idx"),
+            models.Index(fields=["is_open", "-created_at", "-id"], name="project_open_created_idx"),
+            # Faceted filtering of open projects
+            models.Index(fields=["is_open", "project_type", "-created_at", "-id"], name="project_open_type_idx"),
+            models.Index(fields=["is_open", "budget"], name="project_open_budget_idx"),
+            # Max(updated_at) over open projects validates the feed
+            models.Index(fields=["is_open", "updated_at"], name="project_open_updated_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # applicant_count is only written through F() updates; a plain save of
+        # an instance loaded earlier must not overwrite concurrent changes.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "applicant_count"
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.client_company.company_name})"
+
+
+class Application(models.Model):
+    """
+    A freelancer's application to a project: the `applicants` through table,
+    plus when they applied and how well their profile matched the project.
+    """
+    project = models.ForeignKey(
+        FreelanceProject, on_delete=models.CASCADE, db_column="freelanceproject_id",
+        related_name="applications"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="applications"
+    )
+    applied_at = models.DateTimeField(auto_now_add=True)
+    # Text similarity between the applicant's profile and the project, set when applying
+    match_score = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = "project_freelanceproject_applicants"
+        unique_together = [("project", "user")]
+        indexes = [
+            models.Index(fields=["project", "-match_score"], name="application_match_idx"),
+            models.Index(fields=["project", "-applied_at"], name="application_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"Application({self.user_id} -> {self.project_id})"
+
+
+class ProjectFacetCount(models.Model):
+    """
+    Number of open projects per facet value (project type, budget range or
+    skill id), maintained incrementally by project.facets.
+    """
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=64)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["facet", "value"], name="unique_project_facet_value"),
+        ]
+        indexes = [
+            models.Index(fields=["facet", "-count"], name="project_facet_count_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+class ProjectRecommendation(models.Model):
+    """Precomputed top-N open projects for a freelancer, best first."""
+    freelancer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="project_recommendation"
+    )
+    project_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField(db_index=True)
+    # Projects version the ranking was computed against; any project write
+    # since then makes it stale
+    projects_version = models.BigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Recommendations({self.freelancer_id}) - {len(self.project_ids)} projects"
+
+
+class MatchingRun(models.Model):
+    """Bookkeeping for the batch recommendation job, used to resume and to find changed profiles."""
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    changed_only = models.BooleanField(default=False)
+    top_n = models.PositiveIntegerField()
+    last_user_id = models.BigIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        state = "finished" if self.finished_at else "in progress"
+        return f"MatchingRun({self.started_at:%Y-%m-%d %H:%M:%S}) - {state}"
+
+
+class ArchivedProject(models.Model):
+    """
+    A closed project moved out of the live table by `archive_projects`, with
+    the same columns so the detail view can serve it unchanged. Skill tags
+    are kept as a list of Skill ids.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    client_company = models.ForeignKey(
+        ClientCompany, on_delete=models.CASCADE, related_name="archived_projects"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_projects"
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    skills_required = models.TextField()
+    skill_tags = models.JSONField(default=list)
+    budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    project_type = models.CharField(
+        max_length=20, choices=FreelanceProject.PROJECT_TYPE_CHOICES, default="fixed"
+    )
+    is_open = models.BooleanField(default=False)
+    applicant_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_by", "-created_at"], name="archived_owner_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class ArchivedApplication(models.Model):
+    """An Application row moved to the archive along with its project."""
+    project = models.ForeignKey(ArchivedProject, on_delete=models.CASCADE, related_name="applications")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_applications"
+    )
+    applied_at = models.DateTimeField()
+    match_score = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [("project", "user")]
+
+    def __str__(self):
+        return f"ArchivedApplication({self.user_id} -> {self.project_id})"
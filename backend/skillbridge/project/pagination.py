@@ -0,0 +1,123 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def _non_negative_int(value, name):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError(f"{name} must be an integer.")
+    if number < 0:
+        raise PaginationError(f"{name} must not be negative.")
+    return number
+
+
+def get_limit_offset(request, default_limit=DEFAULT_PAGE_SIZE, max_limit=MAX_PAGE_SIZE):
+    """Read `limit`/`offset` from the query string, clamping limit to `max_limit`."""
+    limit = _non_negative_int(request.query_params.get("limit", default_limit), "limit")
+    offset = _non_negative_int(request.query_params.get("offset", 0), "offset")
+    return max(1, min(limit, max_limit)), offset
+
+
+def limit_offset_payload(request, results, count, limit, offset):
+    url = request.build_absolute_uri()
+    next_url = None
+    if offset + limit < count:
+        next_url = replace_query_param(replace_query_param(url, "limit", limit), "offset", offset + limit)
+    previous_url = None
+    if offset > 0:
+        previous_url = replace_query_param(url, "limit", limit)
+        if offset - limit > 0:
+            previous_url = replace_query_param(previous_url, "offset", offset - limit)
+        else:
+            previous_url = remove_query_param(previous_url, "offset")
+    return {
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": results,
+    }
+
+
+# ---------- keyset (cursor) pagination on (created_at, id), newest first ----------
+def get_page_size(request, default_size=DEFAULT_PAGE_SIZE, max_size=MAX_PAGE_SIZE):
+    size = _non_negative_int(request.query_params.get("page_size", default_size), "page_size")
+    return max(1, min(size, max_size))
+
+
+def encode_cursor(obj, reverse=False):
+    position = {"t": obj.created_at.isoformat(), "i": str(obj.pk)}
+    if reverse:
+        position["r"] = 1
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return `(created_at, pk, reverse)` for an opaque cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json.loads(raw)
+        created_at = parse_datetime(position["t"])
+        pk = uuid.UUID(position["i"])
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError("Invalid cursor.")
+    if created_at is None:
+        raise PaginationError("Invalid cursor.")
+    return created_at, pk, bool(position.get("r"))
+
+
+def cursor_page(request, queryset, page_size):
+    """
+    Return `(items, next_cursor, previous_cursor)` for the page of `queryset`
+    selected by the `cursor` query parameter. Each page is a single indexed
+    range scan of `page_size + 1` rows, however deep it is.
+    """
+    token = request.query_params.get("cursor")
+    reverse = False
+    if token:
+        created_at, pk, reverse = decode_cursor(token)
+        if reverse:
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            ).order_by("created_at", "pk")
+        else:
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            ).order_by("-created_at", "-pk")
+    else:
+        queryset = queryset.order_by("-created_at", "-pk")
+
+    items = list(queryset[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if reverse:
+        items.reverse()
+        has_next, has_previous = bool(items), has_more
+    else:
+        has_next, has_previous = has_more, bool(token) and bool(items)
+
+    next_cursor = encode_cursor(items[-1]) if has_next else None
+    previous_cursor = encode_cursor(items[0], reverse=True) if has_previous else None
+    return items, next_cursor, previous_cursor
+
+
+def cursor_payload(request, results, next_cursor, previous_cursor):
+    url = request.build_absolute_uri()
+    return {
+        "next": replace_query_param(url, "cursor", next_cursor) if next_cursor else None,
+        "previous": replace_query_param(url, "cursor", previous_cursor) if previous_cursor else None,
+        "results": results,
+    }
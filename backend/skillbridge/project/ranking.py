@@ -0,0 +1,53 @@
+"""
+Hybrid feed score: text similarity blended with budget fit, recency and
+project type.
+
+The project columns are precomputed by the match index and aligned with its
+rows, so a whole candidate set is scored with one vectorized expression.
+"""
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULT_WEIGHTS = {
+    "similarity": 1.0,
+    "budget_fit": 0.15,
+    "recency": 0.1,
+    "hourly": 0.0,
+}
+RECENCY_HALF_LIFE_DAYS = 14
+TAG_LEVELS = {"Unverified": 0, "Beginner": 1, "Intermediate": 2, "Expert": 3}
+
+
+def get_weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, "PROJECT_RANKING_WEIGHTS", {})}
+
+
+def seniority(star_rating, verification_tag):
+    """Place a freelancer on a 0..1 scale from their rating and verified level."""
+    rating = float(star_rating or 0) / 5
+    level = TAG_LEVELS.get(verification_tag, 0) / (len(TAG_LEVELS) - 1)
+    return 0.5 * rating + 0.5 * level
+
+
+def hybrid_scores(similarity, columns, seniority, weights, now):
+    """
+    Score projects for one freelancer. Senior freelancers are pushed towards
+    the higher budget percentiles and juniors towards the lower ones.
+    """
+    age_days = (now - columns["created_ts"]) / 86400
+    decay = np.log(2) / RECENCY_HALF_LIFE_DAYS
+    return (
+        weights["similarity"] * similarity
+        + weights["budget_fit"] * (1 - np.abs(columns["budget_percentile"] - seniority))
+        + weights["recency"] * np.exp(-decay * np.maximum(age_days, 0))
+        + weights["hourly"] * columns["hourly"]
+    )
+
+
+def hybrid_scorer(profile):
+    """Return a `scorer(similarity, columns)` for TfidfMatchIndex.top_k."""
+    level = seniority(profile.star_rating, profile.verification_tag)
+    weights = get_weights()
+    now = timezone.now().timestamp()
+    return lambda similarity, columns: hybrid_scores(similarity, columns, level, weights, now)
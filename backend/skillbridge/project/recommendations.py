@@ -0,0 +1,178 @@
+"""
+Offline freelancer -> project recommendations.
+
+`compute_recommendations` ranks every freelancer profile with the configured
+project matching engine, in chunks spread over a process pool, and stores the
+top-N project IDs per freelancer in ProjectRecommendation. Each chunk of
+freelancers is scored against every project with one sparse matrix product
+(`top_k_many`), using the live feed's skill pre-filter and hybrid score, so
+the feed can serve those rows in place of ranking on demand while they are
+fresh: computed against the current projects version and after the
+profile's last edit.
+"""
+import logging
+import multiprocessing
+import os
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import Profile
+from .engines import get_project_engine
+from .matching import ProfileMatchIndex
+from .models import MatchingRun, ProjectRecommendation
+from .ranking import get_weights, hybrid_scores, seniority
+from .utils import get_projects_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_N = 50
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_AGE = 6 * 60 * 60  # seconds
+
+
+def _rank_chunk(user_ids, texts, skill_ids, levels, weights, now, top_n):
+    """Return `(user_ids, rankings)` with project IDs, best first, as the live feed ranks them."""
+    scorers = [
+        lambda similarity, columns, level=level: hybrid_scores(similarity, columns, level, weights, now)
+        for level in levels
+    ]
+    winners = get_project_engine().top_k_many(texts, top_n, skill_ids, scorers)
+    return user_ids, [[pk.hex for pk, _ in ranking] for ranking in winners]
+
+
+def _chunks(queryset, chunk_size):
+    fields = ProfileMatchIndex.text_fields
+    rows = queryset.values_list("pk", "user_id", "star_rating", "verification_tag", *fields)
+    chunk = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield _chunk_args(chunk)
+            chunk = []
+    if chunk:
+        yield _chunk_args(chunk)
+
+
+def _chunk_args(rows):
+    skills = defaultdict(list)
+    through = Profile.skill_tags.through.objects.filter(profile_id__in=[row[0] for row in rows])
+    for profile_id, skill_id in through.values_list("profile_id", "skill_id"):
+        skills[profile_id].append(skill_id)
+    # Same inputs as profile_text, engine.skills_for and hybrid_scorer
+    return (
+        [row[1] for row in rows],
+        [" ".join(value or "" for value in row[4:]) for row in rows],
+        [skills.get(row[0]) or None for row in rows],
+        [seniority(row[2], row[3]) for row in rows],
+    )
+
+
+def freelancer_queryset(run, projects_version, last_finished=None):
+    queryset = Profile.objects.filter(user__role="freelancer", user_id__gt=run.last_user_id)
+    if run.changed_only and last_finished is not None:
+        # Profiles edited since the previous complete run, plus anyone never
+        # scored or scored against other projects. Profile.updated_at only
+        # moves when profile content changes.
+        queryset = queryset.filter(
+            Q(updated_at__gte=last_finished.started_at)
+            | Q(user__project_recommendation__isnull=True)
+            | ~Q(user__project_recommendation__projects_version=projects_version)
+        )
+    return queryset.order_by("user_id")
+
+
+def compute_recommendations(top_n=DEFAULT_TOP_N, chunk_size=DEFAULT_CHUNK_SIZE,
+                            workers=None, resume=False, changed_only=False, stdout=None):
+    """
+    Run (or resume) a batch matching pass and return the MatchingRun record.
+
+    With more than one worker the pool is forked after the engine has loaded,
+    so every worker ranks against the same in-memory index.
+    """
+    run = None
+    if resume:
+        run = MatchingRun.objects.filter(finished_at__isnull=True).order_by("-started_at").first()
+    if run is None:
+        run = MatchingRun.objects.create(top_n=top_n, changed_only=changed_only)
+    last_finished = (
+        MatchingRun.objects.filter(finished_at__isnull=False, started_at__lt=run.started_at)
+        .order_by("-started_at").first()
+    )
+
+    # Read before the engine catches up, so a write racing the run leaves
+    # its rankings stale rather than passing them off as current
+    projects_version = get_projects_version()
+    queryset = freelancer_queryset(run, projects_version, last_finished)
+    workers = workers or os.cpu_count() or 1
+    options = (get_weights(), timezone.now().timestamp(), run.top_n)
+    get_project_engine().count()
+
+    if workers == 1:
+        for chunk in _chunks(queryset, chunk_size):
+            _store(run, projects_version, *_rank_chunk(*chunk, *options))
+            if stdout:
+                stdout.write(f"Processed {run.processed} freelancers")
+    else:
+        # Forked workers must open their own database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            in_flight = []
+            for chunk in _chunks(queryset, chunk_size):
+                in_flight.append(pool.submit(_rank_chunk, *chunk, *options))
+                # Keep a bounded number of chunks queued and write them back in order,
+                # so last_user_id is always a safe resume point.
+                if len(in_flight) >= workers * 2:
+                    _store(run, projects_version, *in_flight.pop(0).result())
+                    if stdout:
+                        stdout.write(f"Processed {run.processed} freelancers")
+            for future in in_flight:
+                _store(run, projects_version, *future.result())
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=["finished_at"])
+    return run
+
+
+def _store(run, projects_version, user_ids, rankings):
+    computed_at = timezone.now()
+    ProjectRecommendation.objects.bulk_create(
+        [
+            ProjectRecommendation(
+                freelancer_id=user_id, project_ids=ranking, computed_at=computed_at,
+                projects_version=projects_version,
+            )
+            for user_id, ranking in zip(user_ids, rankings)
+        ],
+        update_conflicts=True,
+        unique_fields=["freelancer"],
+        update_fields=["project_ids", "computed_at", "projects_version"],
+    )
+    run.last_user_id = user_ids[-1]
+    run.processed += len(user_ids)
+    run.save(update_fields=["last_user_id", "processed"])
+
+
+def get_fresh_recommendations(user, profile, projects_version):
+    """
+    Return the precomputed ranked project IDs for `user`, or None when there
+    are none, they were ranked against other projects than `projects_version`
+    (a project opened, closed or changed since), or they predate the
+    profile's last edit or the maximum age.
+    """
+    recommendation = ProjectRecommendation.objects.filter(freelancer=user).first()
+    if recommendation is None or recommendation.projects_version != projects_version:
+        return None
+    max_age = getattr(settings, "PROJECT_RECOMMENDATIONS_MAX_AGE", DEFAULT_MAX_AGE)
+    if recommendation.computed_at < timezone.now() - timedelta(seconds=max_age):
+        return None
+    if recommendation.computed_at < profile.updated_at:
+        return None
+    return [uuid.UUID(pk) for pk in recommendation.project_ids]
@@ -0,0 +1,51 @@
+"""
+Shared cache of rendered responses for listings that look the same to every
+user, such as the open project list, search results and facet counts.
+
+Entries hold the rendered bytes and are tagged with the listings version, so
+any project write makes them stale at once. Applies only move applicant
+counters, which leave the version alone; entries expire after
+LISTING_CACHE_TIMEOUT so those show up shortly after. Between writes every
+user is served from the cache without touching the project tables. Both live in the default cache, which must be shared by all workers
+(see CACHES in settings): with a per-process cache a worker that missed the
+version bump would keep serving the old listing.
+"""
+from functools import wraps
+
+from django.http import HttpResponse
+
+from skillbridge.db_router import use_primary
+from .utils import get_cached_listing, listing_cache_key, set_cached_listing
+
+
+def shared_response_cache(when=None):
+    """
+    Decorate an APIView `get` whose successful responses depend only on the
+    URL. `when(request)` may restrict caching to non-personalized requests.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if when is not None and not when(request):
+                return handler(view, request, *args, **kwargs)
+
+            # Negotiation already ran in APIView.initial(), so the renderer is known
+            key = listing_cache_key(request.build_absolute_uri(), request.accepted_media_type)
+            version, cached = get_cached_listing(key)
+            if cached is not None:
+                content_type, content = cached
+                return HttpResponse(content, content_type=content_type)
+
+            # Entries are tagged with the current version, so they must be
+            # rendered from the primary rather than a lagging replica
+            with use_primary():
+                response = handler(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.accepted_renderer = request.accepted_renderer
+                response.accepted_media_type = request.accepted_media_type
+                response.renderer_context = view.get_renderer_context()
+                response.render()
+                set_cached_listing(key, version, response["Content-Type"], response.content)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,206 @@
+"""
+Full-text search over project title, description and skills.
+
+SQLite uses a contentless FTS5 table kept in sync by triggers and ranked
+with BM25. Its rowids come from `project_search_ids`, whose INTEGER PRIMARY
+KEY maps each project id to a stable integer: the project table has a UUID
+primary key, so its own rowids may be renumbered by VACUUM or a table
+rebuild. PostgreSQL uses a partial GIN index on a weighted `tsvector`
+expression, ranked with `ts_rank_cd`. Only open projects are indexed, and
+both indexes are maintained by the database itself, so bulk inserts and
+queryset updates stay searchable too.
+
+The schema is (re)created by `ensure_search_index` after every `migrate`.
+Django rebuilds SQLite tables for many schema changes, which drops their
+triggers, so the index is rebuilt whenever its triggers had to be recreated.
+"""
+import logging
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import FreelanceProject
+
+logger = logging.getLogger(__name__)
+
+PROJECT_TABLE = FreelanceProject._meta.db_table
+FTS_TABLE = "project_search"
+IDS_TABLE = "project_search_ids"
+PG_INDEX = "project_search_gin"
+# Column weights for BM25 / tsvector: title, description, skills_required
+WEIGHTS = (10.0, 1.0, 5.0)
+MAX_TERMS = 16
+
+SQLITE_TABLES = {
+    IDS_TABLE: f"""
+        CREATE TABLE {IDS_TABLE} (
+            id INTEGER PRIMARY KEY,
+            project_id char(32) NOT NULL UNIQUE
+        )""",
+    FTS_TABLE: f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            title, description, skills_required, content='', tokenize='porter unicode61'
+        )""",
+}
+
+# Only open projects are indexed, so matching never has to consult the
+# project table and closed projects cost nothing. A contentless table needs
+# the indexed values to delete a row, which the triggers have at hand.
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {PROJECT_TABLE} BEGIN
+            INSERT INTO {IDS_TABLE}(project_id) VALUES (new.id);
+            INSERT INTO {FTS_TABLE}(rowid, title, description, skills_required)
+            SELECT id, new.title, new.description, new.skills_required
+            FROM {IDS_TABLE} WHERE project_id = new.id AND new.is_open;
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {PROJECT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, skills_required)
+            SELECT 'delete', id, old.title, old.description, old.skills_required
+            FROM {IDS_TABLE} WHERE project_id = old.id AND old.is_open;
+            DELETE FROM {IDS_TABLE} WHERE project_id = old.id;
+        END""",
+    # Counter and timestamp updates leave the index alone
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, description, skills_required, is_open
+        ON {PROJECT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, skills_required)
+            SELECT 'delete', id, old.title, old.description, old.skills_required
+            FROM {IDS_TABLE} WHERE project_id = old.id AND old.is_open;
+            INSERT INTO {FTS_TABLE}(rowid, title, description, skills_required)
+            SELECT id, new.title, new.description, new.skills_required
+            FROM {IDS_TABLE} WHERE project_id = new.id AND new.is_open;
+        END""",
+}
+
+PG_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(skills_required, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+def _normalize(sql):
+    return " ".join(sql.split())
+
+
+def ensure_search_index(using=connection):
+    """Create the full-text index for the current backend if it is missing."""
+    if using.vendor == "sqlite":
+        with using.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE name IN (%s, %s)", [IDS_TABLE, FTS_TABLE]
+            )
+            tables = {name: sql for name, sql in cursor.fetchall()}
+            # Tables from an older layout are replaced and refilled below
+            for name in (FTS_TABLE, IDS_TABLE):
+                if name in tables and _normalize(tables[name]) != _normalize(SQLITE_TABLES[name]):
+                    cursor.execute(f"DROP TABLE {name}")
+                    del tables[name]
+            for name, sql in SQLITE_TABLES.items():
+                if name not in tables:
+                    cursor.execute(sql)
+
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [PROJECT_TABLE],
+            )
+            existing = {name: sql for name, sql in cursor.fetchall() if name in SQLITE_TRIGGERS}
+            missing = [
+                name for name, sql in SQLITE_TRIGGERS.items()
+                if _normalize(existing.get(name) or "") != _normalize(sql)
+            ]
+            for name in missing:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if missing or len(tables) < len(SQLITE_TABLES):
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+                cursor.execute(
+                    f"DELETE FROM {IDS_TABLE} WHERE project_id NOT IN (SELECT id FROM {PROJECT_TABLE})"
+                )
+                cursor.execute(f"INSERT OR IGNORE INTO {IDS_TABLE}(project_id) SELECT id FROM {PROJECT_TABLE}")
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, description, skills_required) "
+                    f"SELECT ids.id, p.title, p.description, p.skills_required FROM {PROJECT_TABLE} AS p "
+                    f"JOIN {IDS_TABLE} AS ids ON ids.project_id = p.id WHERE p.is_open"
+                )
+                logger.info("Rebuilt %s full-text index", FTS_TABLE)
+    elif using.vendor == "postgresql":
+        with using.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON {PROJECT_TABLE} "
+                f"USING gin (({PG_VECTOR})) WHERE is_open"
+            )
+
+
+def _terms(query):
+    terms = re.findall(r"\w+", query.lower())[:MAX_TERMS]
+    if not terms:
+        raise SearchQueryError("q must contain at least one word.")
+    return terms
+
+
+def _fts5_query(terms):
+    # Quote every term so user input can never be parsed as FTS5 syntax;
+    # the last one is a prefix so results show up while typing.
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_projects(query, limit, offset):
+    """
+    Return `(ranked_ids, total)` for open projects matching every word of
+    `query`, best match first.
+    """
+    terms = _terms(query)
+    if connection.vendor == "sqlite":
+        match = _fts5_query(terms)
+        weights = ", ".join(str(weight) for weight in WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+            total = cursor.fetchone()[0]
+            # Rank inside the index and map only the requested page back to
+            # project ids; bm25() is lower for better matches.
+            cursor.execute(
+                f"SELECT ids.project_id FROM ("
+                f"  SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE}"
+                f"  WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s OFFSET %s"
+                f") AS hits JOIN {IDS_TABLE} AS ids ON ids.id = hits.rowid ORDER BY hits.score",
+                [match, limit, offset],
+            )
+            rows = cursor.fetchall()
+    elif connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        source = (
+            f"FROM {PROJECT_TABLE}, to_tsquery('english', %s) AS query "
+            f"WHERE ({PG_VECTOR}) @@ query AND is_open"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) {source}", [tsquery])
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT id {source} ORDER BY ts_rank_cd(({PG_VECTOR}), query) DESC, created_at DESC "
+                f"LIMIT %s OFFSET %s",
+                [tsquery, limit, offset],
+            )
+            rows = cursor.fetchall()
+    else:
+        # No full-text support wired up for this backend: fall back to a scan
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(title__icontains=term) | Q(description__icontains=term)
+                | Q(skills_required__icontains=term)
+            )
+        queryset = FreelanceProject.objects.filter(condition, is_open=True).order_by("-created_at")
+        return list(queryset.values_list("pk", flat=True)[offset:offset + limit]), queryset.count()
+
+    field = FreelanceProject._meta.pk
+    return [field.to_python(row[0]) for row in rows], total
@@ -1,6 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
+from accounts.skills import resolve_skills
 from accounts.models import User, Profile
-from .models import FreelanceProject
+from .models import ArchivedProject, FreelanceProject
 
 class FreelancerProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,8 +16,51 @@ class DetailedApplicantSerializer(serializers.ModelSerializer):
         model = User
         fields = ["id", "email", "profile"]
 
+class FreelanceProjectListSerializer(serializers.ModelSerializer):
+    """
+    Compact project representation for list endpoints; applicant IDs are
+    only exposed by the detail view.
+    """
+    class Meta:
+        model = FreelanceProject
+        fields = [
+            "id", "title", "description", "skills_required", "budget", "project_type",
+            "is_open", "client_company", "created_by", "created_at", "updated_at",
+            "applicant_count",
+        ]
+        read_only_fields = fields
+
+
 class FreelanceProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = FreelanceProject
         fields = "__all__"
-        read_only_fields = ["id", "created_by", "client_company", "created_at", "updated_at", "applicants"]
+        read_only_fields = [
+            "id", "created_by", "client_company", "created_at", "updated_at", "applicants",
+            "applicant_count", "skill_tags",
+        ]
+
+    # Skill tags are saved in the same transaction so the matching index and
+    # feed caches only see the project once its tags are in place.
+    def create(self, validated_data):
+        with transaction.atomic():
+            project = super().create(validated_data)
+            project.skill_tags.set(resolve_skills(project.skills_required))
+        return project
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            project = super().update(instance, validated_data)
+            if "skills_required" in validated_data:
+                project.skill_tags.set(resolve_skills(project.skills_required))
+        return project
+
+
+class ArchivedProjectSerializer(serializers.ModelSerializer):
+    """Same shape as FreelanceProjectSerializer, plus when the project was archived."""
+    applicants = serializers.ListField(source="applicant_ids", child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = ArchivedProject
+        fields = "__all__"
+        read_only_fields = [field.name for field in ArchivedProject._meta.fields]
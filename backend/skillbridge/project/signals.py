@@ -0,0 +1,158 @@
+from django.db.models import F
+from django.db import connections
+from django.db.models.signals import (
+    m2m_changed, post_migrate, post_save, post_delete, pre_delete, pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Profile
+from .models import Application, FreelanceProject
+from .engines import get_project_engine
+from .facets import SKILL, apply_deltas, diff, facet_values
+from .matching import profile_index
+from .search import ensure_search_index
+from .utils import bump_listings_version_on_commit, invalidate_feed
+
+
+@receiver(post_save, sender=FreelanceProject)
+def index_saved_project(sender, instance, **kwargs):
+    # Closed projects drop out of the freelancer feed, reopened ones come back.
+    get_project_engine().on_commit_write(instance, indexed=instance.is_open)
+
+
+@receiver(post_delete, sender=FreelanceProject)
+def unindex_deleted_project(sender, instance, **kwargs):
+    get_project_engine().on_commit_write(instance, indexed=False)
+
+
+@receiver([post_save, post_delete], sender=FreelanceProject)
+def expire_project_listings(sender, **kwargs):
+    bump_listings_version_on_commit()
+
+
+# ---------- facet counts ----------
+@receiver(pre_save, sender=FreelanceProject)
+def remember_project_facets(sender, instance, **kwargs):
+    instance._facets_before = (False, None, None)
+    if not instance._state.adding:
+        row = (
+            FreelanceProject.objects.filter(pk=instance.pk)
+            .values_list("is_open", "project_type", "budget").first()
+        )
+        if row is not None:
+            instance._facets_before = row
+
+
+@receiver(post_save, sender=FreelanceProject)
+def count_project_facets(sender, instance, **kwargs):
+    was_open, project_type, budget = getattr(instance, "_facets_before", (False, None, None))
+    # Skill counts only move when the project opens or closes; tag edits on
+    # an open project are counted by count_skill_facets.
+    skill_ids = ()
+    if was_open != instance.is_open and not instance._state.adding:
+        skill_ids = list(instance.skill_tags.values_list("id", flat=True))
+    apply_deltas(diff(
+        facet_values(was_open, project_type, budget, skill_ids),
+        facet_values(instance.is_open, instance.project_type, instance.budget, skill_ids),
+    ))
+
+
+@receiver(pre_delete, sender=FreelanceProject)
+def remember_deleted_project_facets(sender, instance, **kwargs):
+    # The skill links are gone by post_delete, so collect them first
+    skill_ids = []
+    if instance.is_open:
+        skill_ids = list(instance.skill_tags.values_list("id", flat=True))
+    instance._facets_before = facet_values(instance.is_open, instance.project_type, instance.budget, skill_ids)
+
+
+@receiver(post_delete, sender=FreelanceProject)
+def uncount_deleted_project_facets(sender, instance, **kwargs):
+    apply_deltas(diff(getattr(instance, "_facets_before", []), []))
+
+
+@receiver(m2m_changed, sender=FreelanceProject.skill_tags.through)
+def count_skill_facets(sender, instance, action, reverse, pk_set, **kwargs):
+    """Adjust skill facet counts as open projects gain or lose skill tags, from either side."""
+    links = sender.objects.filter(freelanceproject__is_open=True)
+    if action in ("pre_remove", "pre_clear"):
+        links = links.filter(**{"skill_id" if reverse else "freelanceproject_id": instance.pk})
+        if action == "pre_remove":
+            links = links.filter(**{"freelanceproject_id__in" if reverse else "skill_id__in": pk_set})
+        instance._removed_skill_links = list(links.values_list("skill_id", flat=True))
+        return
+    if action in ("post_remove", "post_clear"):
+        removed = getattr(instance, "_removed_skill_links", [])
+        instance._removed_skill_links = []
+        apply_deltas(diff([(SKILL, str(skill_id)) for skill_id in removed], []))
+        if removed:
+            bump_listings_version_on_commit()
+        return
+    # post_add only receives the ids that were actually inserted
+    if action == "post_add" and pk_set:
+        added = links.filter(**{"skill_id" if reverse else "freelanceproject_id": instance.pk})
+        added = added.filter(**{"freelanceproject_id__in" if reverse else "skill_id__in": pk_set})
+        added = list(added.values_list("skill_id", flat=True))
+        apply_deltas(diff([], [(SKILL, str(skill_id)) for skill_id in added]))
+        if added:
+            bump_listings_version_on_commit()
+
+
+@receiver(post_save, sender=Profile)
+def index_saved_profile(sender, instance, **kwargs):
+    profile_index.on_commit_write(instance, indexed=instance.user.role == "freelancer")
+    # Rating and verification level feed into the hybrid ranking
+    invalidate_feed(instance.user_id)
+
+
+@receiver(post_delete, sender=Profile)
+def unindex_deleted_profile(sender, instance, **kwargs):
+    profile_index.on_commit_write(instance, indexed=False)
+
+
+def _add_applicant_counts(project_ids, delta):
+    FreelanceProject.objects.filter(pk__in=project_ids).update(
+        applicant_count=F("applicant_count") + delta, updated_at=timezone.now()
+    )
+
+
+@receiver(m2m_changed, sender=Application)
+def count_applicants(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep FreelanceProject.applicant_count in step with the applicants M2M,
+    from either side of the relation, with single UPDATE ... SET n = n + d
+    statements. Removals are counted before they happen because `pk_set`
+    may name rows that were never linked.
+    """
+    if action in ("pre_remove", "pre_clear"):
+        links = sender.objects.filter(**{"user_id" if reverse else "project_id": instance.pk})
+        if action == "pre_remove":
+            links = links.filter(**{"project_id__in" if reverse else "user_id__in": pk_set})
+        instance._removed_applications = list(links.values_list("project_id", flat=True))
+        return
+    if action in ("post_remove", "post_clear"):
+        removed = getattr(instance, "_removed_applications", [])
+        instance._removed_applications = []
+        if not removed:
+            return
+        if reverse:
+            _add_applicant_counts(removed, -1)
+        else:
+            _add_applicant_counts([instance.pk], -len(removed))
+            instance.applicant_count -= len(removed)
+        return
+    # For post_add Django only passes the ids that were actually inserted
+    if action == "post_add" and pk_set:
+        if reverse:
+            _add_applicant_counts(pk_set, 1)
+        else:
+            _add_applicant_counts([instance.pk], len(pk_set))
+            instance.applicant_count += len(pk_set)
+
+
+@receiver(post_migrate)
+def create_search_index(sender, using, **kwargs):
+    # The full-text index lives outside the migration graph; see project.search
+    if sender.name == "project":
+        ensure_search_index(connections[using])
@@ -1,3 +1,910 @@
-from django.test import TestCase
+import csv
+import io
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import ClientCompany, User
+from accounts.skills import resolve_skills
+from .archive import archive_closed_projects
+from .engines import get_project_engine
+from .facets import facet_counts, rebuild_facet_counts
+from .matching import ProjectMatchIndex, profile_text, project_index
+from .models import Application, ArchivedProject, FreelanceProject, ProjectRecommendation
+from .ranking import RECENCY_HALF_LIFE_DAYS, hybrid_scorer, hybrid_scores
+from .recommendations import compute_recommendations, get_fresh_recommendations
+from .search import FTS_TABLE, ensure_search_index
+from .utils import (
+    PROJECTS_VERSION_KEY, get_listings_version, get_projects_version, get_version, write_log_key,
+)
+from .vector_store import VectorStore
+
+
+def make_user(email, role):
+    return User.objects.create_user(email=email, password=None, role=role)
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def make_project(client_user, **fields):
+    company, _ = ClientCompany.objects.get_or_create(user=client_user, defaults={"company_name": "Acme"})
+    defaults = {
+        "title": "Build a Django REST API",
+        "description": "Python backend for a marketplace",
+        "skills_required": "Python, Django",
+        "budget": 1000,
+    }
+    return FreelanceProject.objects.create(
+        client_company=company, created_by=client_user, **{**defaults, **fields}
+    )
+
+
+class ProjectTestCase(TestCase):
+    def setUp(self):
+        # Version counters, feeds and pins live in the cache, which outlives transactions
+        cache.clear()
+        self.client_user = make_user("client@example.com", "client")
+        self.freelancer = make_user("freelancer@example.com", "freelancer")
+        self.project = make_project(self.client_user)
+
+
+class SkillFilterTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        api = client_for(self.client_user)
+        self.ids = {}
+        for title, skills in [("Web app", "ReactJS, Node"), ("Scraper", "Python3"), ("Dashboard", "react.js, py")]:
+            response = api.post("/api/projects/create/", {
+                "title": title, "description": "Build it", "skills_required": skills, "budget": 500,
+            }, format="json")
+            self.assertEqual(response.status_code, 201)
+            self.ids[title] = uuid.UUID(response.data["project"]["id"])
+        project_index.reset()
+        self.addCleanup(project_index.reset)
+
+    def test_projects_are_found_by_any_spelling_of_a_skill(self):
+        tagged = FreelanceProject.objects.requiring_skills("reactjs").values_list("pk", flat=True)
+        self.assertCountEqual(tagged, [self.ids["Web app"], self.ids["Dashboard"]])
+
+        both = FreelanceProject.objects.requiring_skills(["React", "Python"], match="all")
+        self.assertEqual(list(both.values_list("pk", flat=True)), [self.ids["Dashboard"]])
+
+    def test_matching_only_scores_projects_sharing_a_skill(self):
+        react = resolve_skills("React", create=False)
+
+        ranked = [pk for pk, _ in project_index.top_k("build it", 10, react)]
+        self.assertCountEqual(ranked, [self.ids["Web app"], self.ids["Dashboard"]])
+        self.assertEqual(project_index.count(react), 2)
+
+
+class HybridRankingTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        # Same text, so only budget fit, recency and type tell them apart
+        self.cheap = make_project(self.client_user, budget=100)
+        self.pricey = make_project(self.client_user, budget=50000)
+        project_index.reset()
+        self.addCleanup(project_index.reset)
+
+    def ranked(self, star_rating, verification_tag):
+        profile = self.freelancer.profile
+        profile.star_rating = star_rating
+        profile.verification_tag = verification_tag
+        return [pk for pk, _ in project_index.top_k("django rest api", 3, scorer=hybrid_scorer(profile))]
+
+    def test_budget_fit_follows_seniority(self):
+        self.assertEqual(self.ranked(5, "Expert")[0], self.pricey.pk)
+        self.assertEqual(self.ranked(0, "Unverified")[0], self.cheap.pk)
+
+    def test_budget_percentiles_and_recency(self):
+        snapshot = project_index.current()
+        percentile = {
+            snapshot.pk_at(slot): value for slot, value in enumerate(snapshot.columns["budget_percentile"])
+        }
+        self.assertEqual(
+            [percentile[pk] for pk in (self.cheap.pk, self.project.pk, self.pricey.pk)], [0, 0.5, 1]
+        )
+
+        now = timezone.now().timestamp()
+        weights = {"similarity": 0, "budget_fit": 0, "recency": 1, "hourly": 0}
+        fresh, old = hybrid_scores(
+            np.zeros(2), {"budget_percentile": np.zeros(2), "hourly": np.zeros(2),
+                          "created_ts": np.array([now, now - RECENCY_HALF_LIFE_DAYS * 86400])},
+            0.5, weights, now,
+        )
+        self.assertAlmostEqual(fresh, 1)
+        self.assertAlmostEqual(old, 0.5)
+
+
+class ApplyTests(ProjectTestCase):
+    def apply(self, user, project=None):
+        project = project or self.project
+        return client_for(user).post(f"/api/projects/{project.pk}/apply/")
+
+    def test_apply_stores_one_application_and_counts_it(self):
+        response = self.apply(self.freelancer)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Application.objects.filter(project=self.project, user=self.freelancer).exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.applicant_count, 1)
+
+    def test_second_apply_is_rejected_without_changing_the_counter(self):
+        self.apply(self.freelancer)
+        response = self.apply(self.freelancer)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"message": "You already applied."})
+        self.assertEqual(Application.objects.filter(project=self.project).count(), 1)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.applicant_count, 1)
+
+    def test_counter_follows_every_freelancer(self):
+        others = [make_user(f"freelancer{i}@example.com", "freelancer") for i in range(3)]
+        for user in [self.freelancer, *others]:
+            self.assertEqual(self.apply(user).status_code, 200)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.applicant_count, 4)
+        self.assertEqual(self.project.applicant_count, Application.objects.filter(project=self.project).count())
+
+    def add_applicants(self, project, total):
+        users = User.objects.bulk_create([
+            User(email=f"applicant{project.pk.hex[:8]}-{i}@example.com", role="freelancer")
+            for i in range(total)
+        ])
+        Application.objects.bulk_create([Application(project=project, user=user) for user in users])
+        FreelanceProject.objects.filter(pk=project.pk).update(applicant_count=total)
+
+    def apply_queries(self, project):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.apply(self.freelancer, project).status_code, 200)
+        return len(queries)
+
+    def test_apply_cost_does_not_grow_with_applicants(self):
+        few = make_project(self.client_user, title="Few applicants")
+        self.add_applicants(few, 5)
+        many = make_project(self.client_user, title="Many applicants")
+        self.add_applicants(many, 500)
+        # Both applies are scored against the same loaded index
+        project_index.reset()
+        self.addCleanup(project_index.reset)
+        project_index.count()
+
+        expected = self.apply_queries(few)
+        with self.assertNumQueries(expected):
+            self.assertEqual(self.apply(self.freelancer, many).status_code, 200)
+        many.refresh_from_db()
+        self.assertEqual(many.applicant_count, 501)
+
+    def test_applies_leave_the_listings_version_alone(self):
+        version = get_listings_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apply(self.freelancer)
+        self.assertEqual(get_listings_version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelanceProject.objects.filter(pk=self.project.pk).update(is_open=False)
+        self.assertNotEqual(get_listings_version(), version)
+
+    def test_closed_project_rejects_applies(self):
+        self.project.is_open = False
+        self.project.save()
+
+        response = self.apply(self.freelancer)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.applicant_count, 0)
+
+    def test_only_freelancers_can_apply(self):
+        response = self.apply(self.client_user)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Application.objects.exists())
+
+
+class ApplicantListTests(ProjectTestCase):
+    def list_applicants(self, **params):
+        return client_for(self.client_user).get(f"/api/projects/{self.project.pk}/applicants/", params)
+
+    def test_listing_applicants_does_not_score_them(self):
+        application = Application.objects.create(project=self.project, user=self.freelancer)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.list_applicants(ordering="match")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["results"][0]["match_score"])
+        self.assertFalse([query for query in queries if not query["sql"].startswith("SELECT")])
+
+        call_command("score_applications", stdout=io.StringIO())
+        application.refresh_from_db()
+        self.assertIsNotNone(application.match_score)
+
+
+class ApplicantCounterTests(ProjectTestCase):
+    def assertCount(self, expected, project=None):
+        project = project or self.project
+        project.refresh_from_db()
+        self.assertEqual(project.applicant_count, expected)
+        self.assertEqual(project.applicant_count, project.applications.count())
+
+    def test_counter_follows_adds_and_removes_from_both_sides(self):
+        second = make_user("second@example.com", "freelancer")
+        other = make_project(self.client_user, title="Other")
+
+        self.project.applicants.add(self.freelancer, second)
+        self.assertCount(2)
+        self.project.applicants.add(second)
+        self.assertCount(2)
+        self.freelancer.applied_projects.add(other)
+        self.assertCount(1, other)
+
+        self.project.applicants.remove(second)
+        self.assertCount(1)
+        self.freelancer.applied_projects.clear()
+        self.assertCount(0)
+        self.assertCount(0, other)
+
+    def test_saving_a_stale_instance_keeps_the_counter(self):
+        stale = FreelanceProject.objects.get(pk=self.project.pk)
+        self.project.applicants.add(self.freelancer)
+
+        stale.title = "Renamed"
+        stale.save()
+        self.assertCount(1)
+
+    def test_recount_repairs_drift(self):
+        self.project.applicants.add(self.freelancer)
+        FreelanceProject.objects.filter(pk=self.project.pk).update(applicant_count=7)
+
+        self.assertEqual(FreelanceProject.objects.recount_applicants(), 1)
+        self.assertCount(1)
+        self.assertEqual(FreelanceProject.objects.recount_applicants(), 0)
+
+
+class ProjectListTests(ProjectTestCase):
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = client_for(self.client_user).get("/api/projects/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_list_shows_applicant_counts_without_a_query_per_row(self):
+        self.project.applicants.add(self.freelancer, make_user("second@example.com", "freelancer"))
+        _, few = self.list_queries()
+
+        for i in range(5):
+            make_project(self.client_user, title=f"Project {i}")
+        response, many = self.list_queries()
+
+        self.assertEqual(few, many)
+        row = next(row for row in response.data["results"] if row["id"] == str(self.project.pk))
+        self.assertEqual(row["applicant_count"], 2)
+        self.assertNotIn("applicants", row)
+
+
+class CursorPaginationTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            make_project(self.client_user, title=f"Project {i}")
+        self.expected = [
+            str(pk) for pk in FreelanceProject.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)
+        ]
+        self.api = client_for(self.client_user)
+
+    def ids(self, response):
+        return [project["id"] for project in response.json()["results"]]
+
+    def test_next_links_walk_every_project_once_newest_first(self):
+        response = self.api.get("/api/projects/", {"page_size": 3})
+        seen = self.ids(response)
+        self.assertIsNone(response.json()["previous"])
+        while response.json()["next"]:
+            response = self.api.get(response.json()["next"])
+            self.assertEqual(response.status_code, 200)
+            seen += self.ids(response)
+
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.api.get("/api/projects/", {"page_size": 3})
+        second = self.api.get(first.json()["next"])
+        back = self.api.get(second.json()["previous"])
+
+        self.assertEqual(self.ids(second), self.expected[3:6])
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertIsNone(back.json()["previous"])
+
+    def test_pages_do_not_shift_when_projects_are_added(self):
+        first = self.api.get("/api/projects/", {"page_size": 3})
+        make_project(self.client_user, title="Newer project")
+        second = self.api.get(first.json()["next"])
+
+        self.assertEqual(self.ids(second), self.expected[3:6])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.api.get("/api/projects/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid cursor."})
+
+
+class ConditionalGetTests(ProjectTestCase):
+    def revalidate(self, api, url, response):
+        return api.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_unchanged_project_is_not_modified(self):
+        api = client_for(self.freelancer)
+        url = f"/api/projects/{self.project.pk}/"
+        response = api.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        again = self.revalidate(api, url, response)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again["ETag"], response["ETag"])
+
+    def test_edited_project_is_sent_again(self):
+        api = client_for(self.freelancer)
+        url = f"/api/projects/{self.project.pk}/"
+        response = api.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = "Build a GraphQL API"
+            self.project.save()
+
+        again = self.revalidate(api, url, response)
+
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json()["title"], "Build a GraphQL API")
+        self.assertNotEqual(again["ETag"], response["ETag"])
+
+    def test_client_list_changes_with_applies(self):
+        api = client_for(self.client_user)
+        response = api.get("/api/projects/")
+        self.assertEqual(self.revalidate(api, "/api/projects/", response).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client_for(self.freelancer).post(f"/api/projects/{self.project.pk}/apply/")
+
+        self.assertEqual(self.revalidate(api, "/api/projects/", response).status_code, 200)
+
+    def test_freelancer_feed_changes_with_projects_and_profile(self):
+        api = client_for(self.freelancer)
+        response = api.get("/api/projects/")
+        self.assertEqual(self.revalidate(api, "/api/projects/", response).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_project(self.client_user, title="Design a logo")
+        response_after_project = self.revalidate(api, "/api/projects/", response)
+        self.assertEqual(response_after_project.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self.freelancer.profile
+            profile.bio = "Django developer"
+            profile.save()
+        self.assertEqual(self.revalidate(api, "/api/projects/", response_after_project).status_code, 200)
+
+    def test_missing_project_has_no_validators(self):
+        response = client_for(self.freelancer).get(
+            "/api/projects/00000000-0000-0000-0000-000000000000/"
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class FacetCountTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hourly = make_project(self.client_user, title="Logo design", project_type="hourly", budget=5000)
+
+    def counts(self):
+        payload = facet_counts()
+        return {
+            facet: {row["value"]: row["count"] for row in payload[facet]}
+            for facet in ("project_type", "budget")
+        }
+
+    def assertCountsMatchRebuild(self):
+        counts = self.counts()
+        rebuild_facet_counts()
+        self.assertEqual(counts, self.counts())
+
+    def test_counts_follow_create_close_and_delete(self):
+        self.assertEqual(self.counts()["project_type"], {"fixed": 1, "hourly": 1})
+        self.assertEqual(self.counts()["budget"]["2000-10000"], 1)
+
+        self.hourly.is_open = False
+        self.hourly.save()
+        self.assertEqual(self.counts()["project_type"], {"fixed": 1, "hourly": 0})
+        self.assertEqual(self.counts()["budget"]["2000-10000"], 0)
+
+        self.project.delete()
+        self.assertEqual(self.counts()["project_type"], {"fixed": 0, "hourly": 0})
+        self.assertCountsMatchRebuild()
+
+    def test_queryset_writes_keep_counts_in_step(self):
+        FreelanceProject.objects.filter(is_open=True, project_type="hourly").update(is_open=False)
+        self.assertEqual(self.counts()["project_type"], {"fixed": 1, "hourly": 0})
+
+        self.project.budget = 50
+        FreelanceProject.objects.bulk_update([self.project], ["budget"])
+        self.assertEqual(self.counts()["budget"]["under-500"], 1)
+        self.assertEqual(self.counts()["budget"]["500-2000"], 0)
+        self.assertCountsMatchRebuild()
+
+
+class ArchiveTests(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.old = make_project(self.client_user, title="Old project", is_open=False)
+        self.old.applicants.add(self.freelancer)
+        self.recent = make_project(self.client_user, title="Recently closed", is_open=False)
+        FreelanceProject.objects.filter(pk__in=[self.project.pk, self.old.pk]).update(
+            updated_at=timezone.now() - timedelta(days=90)
+        )
+
+    def archive(self):
+        call_command("archive_projects", days=30, stdout=io.StringIO())
+
+    def test_old_closed_projects_move_to_the_archive(self):
+        self.archive()
+
+        self.assertCountEqual(
+            FreelanceProject.objects.values_list("pk", flat=True), [self.project.pk, self.recent.pk]
+        )
+        archived = ArchivedProject.objects.get()
+        self.assertEqual((archived.pk, archived.title, archived.applicant_count), (self.old.pk, "Old project", 1))
+        self.assertEqual(list(archived.applications.values_list("user_id", flat=True)), [self.freelancer.pk])
+        self.assertFalse(Application.objects.filter(project_id=self.old.pk).exists())
+
+    def test_detail_view_falls_back_to_the_archive(self):
+        before = client_for(self.client_user).get(f"/api/projects/{self.old.pk}/").data
+        self.archive()
+
+        response = client_for(self.client_user).get(f"/api/projects/{self.old.pk}/")
+        self.assertEqual(response.status_code, 200)
+        for field in ("id", "title", "description", "budget", "is_open", "applicants", "created_at"):
+            self.assertEqual(response.data[field], before[field])
+        self.assertIn("archived_at", response.data)
+
+        revalidated = client_for(self.client_user).get(
+            f"/api/projects/{self.old.pk}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        missing = client_for(self.client_user).get(f"/api/projects/{uuid.uuid4()}/")
+        self.assertEqual(missing.status_code, 404)
+
+
+class ImportTests(ProjectTestCase):
+    def upload(self, name, content, user=None):
+        upload = SimpleUploadedFile(name, content.encode())
+        return client_for(user or self.client_user).post(
+            "/api/projects/import/", {"file": upload}, format="multipart"
+        )
+
+    def test_csv_rows_are_validated_and_created(self):
+        response = self.upload("projects.csv", (
+            "title,description,skills_required,budget,project_type\n"
+            "Mobile app,iOS and Android,ReactJS,1500,fixed\n"
+            ",Missing title,Python,100,fixed\n"
+            "Bad budget,Numbers only,Python,lots,hourly\n"
+            "Data pipeline,ETL jobs,Py,,hourly\n"
+        ))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 2))
+        self.assertEqual([error["line"] for error in response.data["errors"]], [3, 4])
+        self.assertIn("title", response.data["errors"][0]["errors"])
+        self.assertIn("budget", response.data["errors"][1]["errors"])
+
+        pipeline = FreelanceProject.objects.get(title="Data pipeline")
+        self.assertIsNone(pipeline.budget)
+        self.assertEqual(pipeline.created_by, self.client_user)
+        self.assertEqual(list(pipeline.skill_tags.values_list("key", flat=True)), ["python"])
+        counts = {row["value"]: row["count"] for row in facet_counts()["project_type"]}
+        self.assertEqual(counts, {"fixed": 2, "hourly": 1})
+
+    def test_jsonl_rows_that_do_not_parse_are_reported(self):
+        response = self.upload("projects.jsonl", (
+            '{"title": "API", "description": "REST", "skills_required": "Django"}\n'
+            "not json\n"
+            '["a list"]\n'
+        ))
+
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 2))
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 3])
+
+    def test_files_without_valid_rows_or_format_are_rejected(self):
+        self.assertEqual(self.upload("projects.csv", "title\n\"\"\n").status_code, 400)
+        self.assertEqual(self.upload("projects.xlsx", "title\nx\n").status_code, 400)
+        self.assertEqual(self.upload("projects.csv", "title\nx\n", self.freelancer).status_code, 403)
+        self.assertEqual(FreelanceProject.objects.count(), 1)
+
+
+class ExportTests(ProjectTestCase):
+    def export(self, user, path="/api/projects/export/"):
+        response = client_for(user).get(path)
+        if response.status_code != 200:
+            return response, None
+        content = b"".join(response.streaming_content).decode()
+        return response, list(csv.DictReader(io.StringIO(content)))
+
+    def test_cells_are_escaped_against_formula_injection(self):
+        make_project(self.client_user, title='=HYPERLINK("http://evil.example","x")', description="@SUM(A1)")
+
+        _, rows = self.export(self.client_user)
+
+        row = next(row for row in rows if "HYPERLINK" in row["title"])
+        self.assertEqual(row["title"], "'=HYPERLINK(\"http://evil.example\",\"x\")")
+        self.assertEqual(row["description"], "'@SUM(A1)")
+
+    def test_archived_projects_and_applications_are_included(self):
+        archived = make_project(self.client_user, title="Old project", is_open=False)
+        Application.objects.create(project=archived, user=self.freelancer, match_score=0.5)
+        list(archive_closed_projects(timezone.now() + timedelta(days=1)))
+
+        _, rows = self.export(self.client_user)
+        self.assertEqual(
+            [(row["id"], row["archived"]) for row in rows],
+            [(str(self.project.pk), "False"), (str(archived.pk), "True")],
+        )
+        _, rows = self.export(self.client_user, f"/api/projects/export/applicants/?project={archived.pk}")
+        self.assertEqual([(row["email"], row["archived"]) for row in rows], [(self.freelancer.email, "True")])
+
+    def test_only_staff_export_every_client(self):
+        other_client = make_user("other@example.com", "client")
+        make_project(other_client)
+        admin = User.objects.create_superuser(email="admin@example.com", password="secret")
+
+        self.assertEqual(len(self.export(other_client)[1]), 1)
+        self.assertEqual(len(self.export(admin)[1]), 2)
+        self.assertEqual(self.export(self.freelancer)[0].status_code, 403)
+
+
+class SearchIndexSyncTests(ProjectTestCase):
+    # Search responses are cached until the listings version is bumped on
+    # commit, so writes run their on_commit callbacks
+
+    def search(self, query):
+        response = client_for(self.freelancer).get("/api/projects/search/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [project["id"] for project in response.json()["results"]]
+
+    def test_created_project_is_searchable(self):
+        self.assertEqual(self.search("django"), [str(self.project.pk)])
+        self.assertEqual(self.search("marketplace"), [str(self.project.pk)])
+
+    def test_edits_replace_the_indexed_text(self):
+        self.project.title = "Build a Flask API"
+        self.project.skills_required = "Python, Flask"
+        self.project.save()
+
+        self.assertEqual(self.search("django"), [])
+        self.assertEqual(self.search("flask"), [str(self.project.pk)])
+
+    def test_closing_and_reopening_updates_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.is_open = False
+            self.project.save()
+        self.assertEqual(self.search("django"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.is_open = True
+            self.project.save()
+        self.assertEqual(self.search("django"), [str(self.project.pk)])
+
+    def test_deleted_project_leaves_the_index(self):
+        self.project.delete()
+
+        self.assertEqual(self.search("django"), [])
+
+    def test_bulk_writes_are_indexed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            projects = FreelanceProject.objects.bulk_create([
+                FreelanceProject(
+                    client_company=self.project.client_company, created_by=self.client_user,
+                    title=f"Kotlin app {i}", description="Android", skills_required="Kotlin",
+                )
+                for i in range(3)
+            ])
+        self.assertCountEqual(self.search("kotlin"), [str(project.pk) for project in projects])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelanceProject.objects.filter(pk=projects[0].pk).update(is_open=False)
+        self.assertCountEqual(self.search("kotlin"), [str(project.pk) for project in projects[1:]])
+
+    def test_counter_updates_leave_results_alone(self):
+        FreelanceProject.objects.filter(pk=self.project.pk).update(applicant_count=5)
+
+        self.assertEqual(self.search("django"), [str(self.project.pk)])
+
+    def test_index_is_rebuilt_when_its_triggers_are_missing(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {FTS_TABLE}_ai")
+        other = make_project(self.client_user, title="Django dashboard")
+        ensure_search_index(connection)
+
+        self.assertCountEqual(self.search("django"), [str(self.project.pk), str(other.pk)])
+
+
+class MatchIndexTests(TransactionTestCase):
+    # Writes reach the index from on_commit callbacks, so they must really commit
+
+    def setUp(self):
+        cache.clear()
+        project_index.reset()
+        self.client_user = make_user("client@example.com", "client")
+        self.project = make_project(self.client_user)
+        project_index.count()
+        self.base = project_index.current().base
+
+    def tearDown(self):
+        project_index.reset()
+
+    def ids(self, index=project_index, text="python django api"):
+        return [pk for pk, _ in index.top_k(text, 10)]
+
+    def assertNotReloaded(self, index=project_index):
+        self.assertIs(index.current().base, self.base)
+
+    def test_new_projects_are_picked_up_without_a_reload(self):
+        other = make_project(self.client_user, title="Django dashboard")
+
+        self.assertCountEqual(self.ids(), [self.project.pk, other.pk])
+        self.assertEqual(project_index.count(), 2)
+        self.assertNotReloaded()
+
+    def test_closed_and_deleted_projects_are_dropped_without_a_reload(self):
+        other = make_project(self.client_user, title="Django dashboard")
+        self.project.is_open = False
+        self.project.save()
+        self.assertEqual(self.ids(), [other.pk])
+
+        other.delete()
+        self.assertEqual(self.ids(), [])
+        self.assertEqual(project_index.count(), 0)
+        self.assertNotReloaded()
+
+    def test_edits_replace_the_indexed_text(self):
+        self.project.title = "Kotlin Android app"
+        self.project.description = "Mobile"
+        self.project.skills_required = "Kotlin"
+        self.project.save()
+
+        self.assertEqual(project_index.similarity("python django", self.project.pk), 0)
+        self.assertGreater(project_index.similarity("kotlin android", self.project.pk), 0)
+        self.assertNotReloaded()
+
+    def test_other_workers_replay_the_logged_writes(self):
+        worker = ProjectMatchIndex()
+        worker.count()
+        base = worker.current().base
+
+        other = make_project(self.client_user, title="Django dashboard")
+        FreelanceProject.objects.filter(pk=self.project.pk).update(is_open=False)
+
+        self.assertEqual(self.ids(worker), [other.pk])
+        self.assertIs(worker.current().base, base)
+
+    def test_workers_reload_when_the_log_is_gone(self):
+        worker = ProjectMatchIndex()
+        worker.count()
+        other = make_project(self.client_user, title="Django dashboard")
+        cache.delete(write_log_key(PROJECTS_VERSION_KEY, get_version(PROJECTS_VERSION_KEY)))
+
+        self.assertCountEqual(self.ids(worker), [self.project.pk, other.pk])
+
+    def test_bulk_writes_are_indexed(self):
+        projects = FreelanceProject.objects.bulk_create([
+            FreelanceProject(
+                client_company=self.project.client_company, created_by=self.client_user,
+                title=f"Django app {i}", description="Python", skills_required="Django",
+            )
+            for i in range(3)
+        ])
+        self.assertEqual(project_index.count(), 4)
+
+        FreelanceProject.objects.filter(pk__in=[project.pk for project in projects]).update(is_open=False)
+        self.assertEqual(self.ids(), [self.project.pk])
+
+    @mock.patch("project.matching.COMPACT_MIN_ROWS", 2)
+    def test_compaction_matches_a_fresh_load(self):
+        projects = [make_project(self.client_user, title=f"Django API {i}") for i in range(4)]
+        projects[0].delete()
+        self.assertIsNot(project_index.current().base, self.base)
+
+        fresh = ProjectMatchIndex()
+        for project in [self.project, *projects[1:]]:
+            self.assertAlmostEqual(
+                project_index.similarity("django api", project.pk), fresh.similarity("django api", project.pk)
+            )
+
+    def test_batch_ranking_matches_single_queries(self):
+        for i in range(5):
+            make_project(self.client_user, title=f"Project {i}", skills_required="Python, React", budget=100 * i)
+        texts = ["python react", "django api", "marketplace backend"]
+        scorer = hybrid_scorer(self.client_user.profile)
+
+        self.assertEqual(
+            project_index.top_k_many(texts, 3, scorers=[scorer] * len(texts)),
+            [project_index.top_k(text, 3, scorer=scorer) for text in texts],
+        )
+
+
+class FeedCacheTests(TransactionTestCase):
+    # Version bumps and feed invalidation run in on_commit callbacks
+
+    def setUp(self):
+        cache.clear()
+        project_index.reset()
+        self.client_user = make_user("client@example.com", "client")
+        self.freelancer = make_user("freelancer@example.com", "freelancer")
+        profile = self.freelancer.profile
+        profile.skills = "Python, Django"
+        profile.save()
+        self.project = make_project(self.client_user)
+        self.api = client_for(self.freelancer)
+
+    def tearDown(self):
+        project_index.reset()
+
+    def feed(self):
+        with mock.patch.object(project_index, "top_k", wraps=project_index.top_k) as top_k:
+            response = self.api.get("/api/projects/")
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]], top_k.call_count
+
+    def test_repeat_requests_reuse_the_ranking(self):
+        self.assertEqual(self.feed(), ([str(self.project.pk)], 1))
+        self.assertEqual(self.feed(), ([str(self.project.pk)], 0))
+
+    def test_new_projects_invalidate_the_ranking(self):
+        self.feed()
+        other = make_project(self.client_user, title="Django dashboard")
+
+        ids, rankings = self.feed()
+        self.assertCountEqual(ids, [str(self.project.pk), str(other.pk)])
+        self.assertEqual(rankings, 1)
+
+    def test_profile_edits_invalidate_only_that_feed(self):
+        other_api = client_for(make_user("other@example.com", "freelancer"))
+        other_api.get("/api/projects/")
+        self.feed()
+
+        profile = self.freelancer.profile
+        profile.bio = "Django REST APIs"
+        profile.save()
+
+        self.assertEqual(self.feed()[1], 1)
+        with mock.patch.object(project_index, "top_k", wraps=project_index.top_k) as top_k:
+            other_api.get("/api/projects/")
+        self.assertEqual(top_k.call_count, 0)
+
+
+class RecommendationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        project_index.reset()
+        self.client_user = make_user("client@example.com", "client")
+        self.freelancer = make_user("freelancer@example.com", "freelancer")
+        profile = self.freelancer.profile
+        profile.skills = "Python, Django"
+        profile.bio = "Django REST APIs"
+        profile.save()
+        self.projects = [
+            make_project(self.client_user, title=title, budget=budget)
+            for title, budget in [("Django REST API", 900), ("Python scripts", 300), ("Django admin", 2000)]
+        ]
+
+    def tearDown(self):
+        project_index.reset()
+
+    def stored_ids(self):
+        return ProjectRecommendation.objects.get(freelancer=self.freelancer).project_ids
+
+    def test_batch_rankings_match_the_live_feed(self):
+        compute_recommendations(top_n=10, workers=1)
+
+        profile = self.freelancer.profile
+        live = get_project_engine().top_k(
+            profile_text(profile), 10, project_index.skills_for(profile), hybrid_scorer(profile)
+        )
+        self.assertEqual(self.stored_ids(), [pk.hex for pk, _ in live])
+        self.assertEqual(
+            get_fresh_recommendations(self.freelancer, profile, get_projects_version()),
+            [pk for pk, _ in live],
+        )
+
+    def test_rankings_from_an_older_project_set_are_not_served(self):
+        compute_recommendations(top_n=10, workers=1)
+        self.projects[0].is_open = False
+        self.projects[0].save()
+
+        profile = self.freelancer.profile
+        self.assertIsNone(get_fresh_recommendations(self.freelancer, profile, get_projects_version()))
+        response = client_for(self.freelancer).get("/api/projects/")
+        self.assertEqual(response.data["count"], 2)
+        self.assertNotIn(str(self.projects[0].pk), [row["id"] for row in response.data["results"]])
+
+        # A changed-only run re-ranks everyone scored against the older set
+        compute_recommendations(top_n=10, workers=1, changed_only=True)
+        self.assertNotIn(self.projects[0].pk.hex, self.stored_ids())
+        self.assertIsNotNone(get_fresh_recommendations(self.freelancer, profile, get_projects_version()))
+
+
+class EmbeddingEngineTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(store_dir.cleanup)
+        settings = override_settings(
+            PROJECT_MATCHING_ENGINE="embedding",
+            PROJECT_EMBEDDING_STORE={"PATH": f"{store_dir.name}/projects", "DIM": 64},
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client_user = make_user("client@example.com", "client")
+        self.project = make_project(self.client_user)
+        self.engine = get_project_engine()
+        self.engine.ensure_ready()
+
+    def test_writes_are_looked_up_through_the_id_map(self):
+        other = make_project(self.client_user, title="Kotlin Android app", skills_required="Kotlin")
+        self.project.title = "Build a Flask API"
+        self.project.save()
+
+        # A second process opens the same files and only has the on-disk map
+        store = VectorStore(self.engine.store.path, self.engine.store.dim)
+        view = store.view()
+        rows = store.rows_for(view, np.frombuffer(self.project.pk.bytes + other.pk.bytes, dtype="V16"))
+        self.assertEqual(sorted(rows.tolist()), [1, 2])
+        self.assertEqual(view["meta"]["alive"], 2)
+
+        other.is_open = False
+        other.save()
+        self.assertIsNone(self.engine.similarity("kotlin", other.pk))
+        self.assertIsNotNone(self.engine.similarity("flask", self.project.pk))
+
+    def test_top_k_ranks_the_closest_projects(self):
+        other = make_project(self.client_user, title="Kotlin Android app", description="Mobile", skills_required="Kotlin")
+
+        self.assertEqual([pk for pk, _ in self.engine.top_k("kotlin android mobile", 1)], [other.pk])
+        self.assertEqual(self.engine.count(), 2)
+
+    def test_scorer_ranks_with_the_stored_features(self):
+        hourly = make_project(self.client_user, title="Kotlin Android app", project_type="hourly", budget=50)
+        favour_hourly = lambda similarity, columns: similarity + 10 * columns["hourly"]
+
+        self.assertEqual(self.engine.top_k("python django api", 1)[0][0], self.project.pk)
+        self.assertEqual(self.engine.top_k("python django api", 1, scorer=favour_hourly)[0][0], hourly.pk)
+
+        self.engine.rebuild()
+        self.assertEqual(self.engine.top_k("python django api", 1, scorer=favour_hourly)[0][0], hourly.pk)
+
+    def test_stores_without_an_id_map_are_rebuilt(self):
+        (self.engine.store.path / "ids.sqlite3").unlink()
+
+        self.assertFalse(self.engine.is_warm())
+        self.assertIsNotNone(self.engine.similarity("django", self.project.pk))
+        self.assertTrue(self.engine.is_warm())
@@ -2,17 +2,25 @@ from django.urls import path
 from .views import (
     FreelanceProjectCreateView, FreelanceProjectUpdateView, FreelanceProjectDetailView,
     FreelanceProjectListView, FreelanceProjectDeleteView, FreelanceProjectApplyView,ApplicantDetails,
-    OpenProjectView, CloseProjectView,AcceptApplicantView,RejectApplicantView,ListAppliedProjectsView
+    OpenProjectView, CloseProjectView,AcceptApplicantView,RejectApplicantView,ListAppliedProjectsView,
+    SuggestedFreelancersView, ProjectSearchView, ProjectFacetsView, FreelanceProjectImportView,
+    ProjectExportView, ApplicantExportView
 )
 
 urlpatterns = [
     path("", FreelanceProjectListView.as_view(), name="project-list"),
     path("create/", FreelanceProjectCreateView.as_view(), name="project-create"),
+    path("import/", FreelanceProjectImportView.as_view(), name="project-import"),
+    path("export/", ProjectExportView.as_view(), name="project-export"),
+    path("export/applicants/", ApplicantExportView.as_view(), name="applicant-export"),
+    path("search/", ProjectSearchView.as_view(), name="project-search"),
+    path("facets/", ProjectFacetsView.as_view(), name="project-facets"),
     path("<uuid:project_id>/", FreelanceProjectDetailView.as_view(), name="project-detail"),
     path("<uuid:project_id>/update/", FreelanceProjectUpdateView.as_view(), name="project-update"),
     path("<uuid:project_id>/delete/", FreelanceProjectDeleteView.as_view(), name="project-delete"),
     path("<uuid:project_id>/apply/", FreelanceProjectApplyView.as_view(), name="project-apply"),
     path("<uuid:project_id>/applicants/", ApplicantDetails.as_view(), name="project-apply"),
+    path("<uuid:project_id>/suggested-freelancers/", SuggestedFreelancersView.as_view(), name="suggested-freelancers"),
     path("<uuid:project_id>/accept/<int:applicant_id>/", AcceptApplicantView.as_view(), name="accept-applicant"),
     path("<uuid:project_id>/reject/<int:applicant_id>/", RejectApplicantView.as_view(), name="reject-applicant"),
     path("open/", OpenProjectView.as_view(), name="open-projects"),
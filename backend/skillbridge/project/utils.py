@@ -0,0 +1,159 @@
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+PROJECTS_VERSION_KEY = "projects:version"
+PROFILES_VERSION_KEY = "profiles:version"
+# Bumped on every write that changes what project listings show, except
+# applicant counter updates, which would otherwise expire every cached
+# listing on each apply (see LISTING_CACHE_TIMEOUT)
+LISTINGS_VERSION_KEY = "projects:listings_version"
+
+
+def _seed_version():
+    # Seed from the clock so a cache flush never hands out a version number
+    # that a worker has already seen.
+    return int(time.time() * 1000)
+
+
+def get_version(key):
+    """Return the current value of a global version counter."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Atomically increment a global version counter and return the new value."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed_version(), timeout=None)
+        return cache.incr(key)
+
+
+def get_projects_version():
+    return get_version(PROJECTS_VERSION_KEY)
+
+
+def bump_projects_version():
+    return bump_version(PROJECTS_VERSION_KEY)
+
+
+def get_listings_version():
+    return get_version(LISTINGS_VERSION_KEY)
+
+
+def bump_listings_version():
+    return bump_version(LISTINGS_VERSION_KEY)
+
+
+def bump_listings_version_on_commit():
+    transaction.on_commit(bump_listings_version)
+
+
+# ---------- write logs ----------
+# Every version of a matching index is logged with the primary keys written
+# under it, so other workers replay exactly those rows instead of rescanning
+WRITE_LOG_TIMEOUT = 60 * 60
+# A worker further behind than this reloads its index from scratch
+WRITE_LOG_LIMIT = 1000
+
+
+def write_log_key(key, version):
+    return f"{key}:writes:{version}"
+
+
+def log_writes(key, pks):
+    """Bump the version counter `key` and log `pks` as written under the new version."""
+    version = bump_version(key)
+    cache.set(write_log_key(key, version), list(pks), timeout=WRITE_LOG_TIMEOUT)
+    return version
+
+
+def get_logged_writes(key, since, until):
+    """
+    Primary keys written after version `since` up to `until`, or None when
+    the log cannot account for every version in between (it expired, the
+    cache was flushed, or the counter was bumped without logging).
+    """
+    if since is None or not 0 < until - since <= WRITE_LOG_LIMIT:
+        return None
+    keys = [write_log_key(key, version) for version in range(since + 1, until + 1)]
+    entries = cache.get_many(keys)
+    if len(entries) != len(keys):
+        return None
+    return {pk for pks in entries.values() for pk in pks}
+
+
+# ---------- per-freelancer ranked feed ----------
+FEED_CACHE_TIMEOUT = 60 * 60
+
+
+def feed_cache_key(user_id):
+    return f"project_feed:{user_id}"
+
+
+def get_cached_feed(user_id):
+    """
+    Return `(projects_version, entry)` where `entry` is the cached
+    `(ranked_ids, total)` for the freelancer, or None when it is missing or
+    was computed against an older set of projects. `ranked_ids` may only hold
+    the leading part of the ranking. Costs a single cache round trip.
+    """
+    key = feed_cache_key(user_id)
+    values = cache.get_many([PROJECTS_VERSION_KEY, key])
+    version = values.get(PROJECTS_VERSION_KEY)
+    if version is None:
+        version = get_projects_version()
+    entry = values.get(key)
+    if entry is not None and entry[0] == version:
+        return version, entry[1:]
+    return version, None
+
+
+def set_cached_feed(user_id, version, ranked_ids, total):
+    cache.set(feed_cache_key(user_id), (version, ranked_ids, total), timeout=FEED_CACHE_TIMEOUT)
+
+
+def invalidate_feed(user_id):
+    cache.delete(feed_cache_key(user_id))
+
+
+# ---------- shared listing responses ----------
+# Applicant counters do not bump the listings version, so cached listings
+# and their ETags show them up to this many seconds late
+LISTING_CACHE_TIMEOUT = 60
+
+
+def listing_epoch():
+    """Current LISTING_CACHE_TIMEOUT-long period, for validators of cached listings."""
+    return int(time.time() // LISTING_CACHE_TIMEOUT)
+
+
+def listing_cache_key(url, media_type):
+    digest = hashlib.sha1(f"{media_type}|{url}".encode()).hexdigest()
+    return f"project_listing:{digest}"
+
+
+def get_cached_listing(key):
+    """
+    Return `(listings_version, entry)` where `entry` is the cached
+    `(content_type, content)` rendered at that version, or None. Costs a
+    single cache round trip.
+    """
+    values = cache.get_many([LISTINGS_VERSION_KEY, key])
+    version = values.get(LISTINGS_VERSION_KEY)
+    if version is None:
+        version = get_listings_version()
+    entry = values.get(key)
+    if entry is not None and entry[0] == version:
+        return version, entry[1:]
+    return version, None
+
+
+def set_cached_listing(key, version, content_type, content):
+    cache.set(key, (version, content_type, content), timeout=LISTING_CACHE_TIMEOUT)
@@ -0,0 +1,524 @@
+"""
+Dense-embedding matching backend backed by a memory-mapped vector store.
+
+Projects are embedded into fixed-width float32 vectors with a local hashing
++ sparse random projection model (no network, no fitted vocabulary). The
+vectors live in flat files under the store directory and every worker maps
+them read-only, so the OS page cache holds a single shared copy and worker
+memory does not grow with the catalog.
+
+Layout of the store directory:
+    meta.json         dim, capacity, count, built, alive, nlist
+    vectors.f32       capacity x dim float32, L2-normalized
+    ids.u8            capacity x 16 bytes (project UUIDs)
+    alive.u1          capacity flags, 0 for superseded or removed rows
+    features.f64      capacity x 3 float64 project features for the hybrid score
+    budgets.npy       sorted known budgets at build time, for budget percentiles
+    ids.sqlite3       project UUID -> row of its live entry, looked up on disk
+    centroids.npy     IVF coarse centroids (nlist x dim)
+    offsets.npy       start row of each IVF list inside the built region
+
+Rows [0, built) are grouped by IVF list when the store is built. Rows
+written afterwards are appended to a tail that is always scanned exactly,
+until the next `build_project_vectors` run folds them in.
+"""
+import fcntl
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from django.db import transaction
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.random_projection import SparseRandomProjection
+
+from .matching import (
+    LOAD_CHUNK_SIZE, ProjectMatchIndex, budget_reference, project_columns, project_features,
+    project_text,
+)
+from .models import FreelanceProject
+from .utils import bump_projects_version
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_FEATURES = 2 ** 16
+# Each hashed term lands on ~dim/16 output dimensions; sklearn's default
+# 1/sqrt(n_features) density would leave most terms on a single dimension.
+PROJECTION_DENSITY = 1 / 16
+MAX_IVF_LISTS = 4096
+KMEANS_SAMPLE = 50000
+FEATURE_WIDTH = len(ProjectMatchIndex.feature_fields)
+# Ids looked up per query of the id map
+ID_LOOKUP_CHUNK = 900
+# Filtered searches check at most this many probed ids per `pk__in` query,
+# under SQLite's 999 bound parameters; larger probes stream the candidates
+CANDIDATE_CHECK_CHUNK = 900
+CANDIDATE_CHECK_LIMIT = 8 * CANDIDATE_CHECK_CHUNK
+
+
+class HashingEmbedder:
+    """Deterministic text embedding: hashed log term counts projected to `dim` dimensions."""
+
+    def __init__(self, dim=256, seed=0):
+        self.dim = dim
+        self._vectorizer = HashingVectorizer(n_features=EMBEDDING_FEATURES, norm=None)
+        projection = SparseRandomProjection(
+            n_components=dim, density=PROJECTION_DENSITY, dense_output=True, random_state=seed
+        ).fit(sp.csr_matrix((1, EMBEDDING_FEATURES)))
+        # transform() would convert the transposed components to CSR on every
+        # call, which costs far more than embedding a query
+        self._components = projection.components_.T.tocsr()
+
+    def embed(self, texts):
+        counts = self._vectorizer.transform(texts)
+        counts.data = np.sign(counts.data) * np.log1p(np.abs(counts.data))
+        vectors = (counts @ self._components).toarray().astype(np.float32)
+        return normalize(vectors, norm="l2", copy=False)
+
+
+class VectorStore:
+    """Append-only, memory-mapped float32 vectors keyed by UUID."""
+
+    def __init__(self, path, dim):
+        self.path = Path(path)
+        self.dim = dim
+        self._local = threading.local()
+
+    # ---------- files ----------
+    def _file(self, name, path=None):
+        return (path or self.path) / name
+
+    def exists(self):
+        # Stores written before the id map moved to disk are rebuilt
+        return all(self._file(name).exists() for name in ("meta.json", "ids.sqlite3", "features.f64"))
+
+    @contextmanager
+    def lock(self):
+        """Exclusive cross-process lock for writers."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.path}.lock", "a+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_meta(self, path=None):
+        with open(self._file("meta.json", path)) as handle:
+            return json.load(handle)
+
+    def _write_meta(self, meta, path=None):
+        target = self._file("meta.json", path)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w") as handle:
+            json.dump(meta, handle)
+        os.replace(tmp, target)
+
+    def _map(self, name, dtype, rows, width=None, mode="r", path=None):
+        shape = (rows, width) if width else (rows,)
+        return np.memmap(self._file(name, path), dtype=dtype, mode=mode, shape=shape)
+
+    # ---------- reading ----------
+    def view(self):
+        """
+        Return the current read-only view of the store, remapping the files
+        only when another process has changed them since the last call.
+        """
+        stat = os.stat(self._file("meta.json"))
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        cached = getattr(self._local, "view", None)
+        if cached is not None and cached["stamp"] == stamp:
+            return cached
+
+        meta = self._read_meta()
+        count = meta["count"]
+        # Rebuilds swap in new files; upserts append to the same ones
+        view = {"stamp": stamp, "meta": meta, "generation": os.stat(self._file("vectors.f32")).st_ino}
+        if count:
+            view["vectors"] = self._map("vectors.f32", np.float32, count, meta["dim"])
+            view["ids"] = self._map("ids.u8", np.uint8, count, 16)
+            view["alive"] = self._map("alive.u1", np.uint8, count)
+            view["features"] = self._map("features.f64", np.float64, count, FEATURE_WIDTH)
+        view["budgets"] = np.load(self._file("budgets.npy"))
+        view["centroids"] = np.load(self._file("centroids.npy"))
+        view["offsets"] = np.load(self._file("offsets.npy"))
+        self._local.view = view
+        return view
+
+    def _id_map(self):
+        """
+        This thread's connection to the id map, reopened when a rebuild has
+        swapped in a new one.
+        """
+        path = self._file("ids.sqlite3")
+        inode = os.stat(path).st_ino
+        cached = getattr(self._local, "id_map", None)
+        if cached is not None and cached[0] == inode:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        connection = sqlite3.connect(path, timeout=30)
+        self._local.id_map = (inode, connection)
+        return connection
+
+    def rows_for(self, view, keys):
+        """Row of the live entry for each 16-byte key in `keys`, or -1."""
+        result = np.full(len(keys), -1, dtype=np.int64)
+        count = view["meta"]["count"]
+        if not count or not len(keys):
+            return result
+        keys = [bytes(key) for key in keys]
+        found = {}
+        connection = self._id_map()
+        for start in range(0, len(keys), ID_LOOKUP_CHUNK):
+            chunk = keys[start:start + ID_LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(connection.execute(
+                f"SELECT key, row FROM ids WHERE key IN ({placeholders})", chunk
+            ))
+        ids, alive = view["ids"], view["alive"]
+        for i, key in enumerate(keys):
+            row = found.get(key)
+            # Rows appended or swapped in after `view` was taken are not part of it
+            if row is not None and row < count and alive[row] and ids[row].tobytes() == key:
+                result[i] = row
+        return result
+
+    # ---------- writing ----------
+    def build(self, rows):
+        """
+        Rebuild the store from `(uuids, vectors, features)` batches and swap it in place.
+        Caller must hold `lock()`.
+        """
+        tmp = self.path.with_name(f"{self.path.name}.build-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        ids, vectors, features = [], [], []
+        for batch_ids, batch_vectors, batch_features in rows:
+            ids.extend(batch_ids)
+            vectors.append(batch_vectors)
+            features.append(batch_features)
+        vectors = np.vstack(vectors) if vectors else np.zeros((0, self.dim), dtype=np.float32)
+        features = np.vstack(features) if features else np.zeros((0, FEATURE_WIDTH))
+        count = vectors.shape[0]
+
+        nlist = max(1, min(MAX_IVF_LISTS, int(np.sqrt(count))))
+        if count > nlist:
+            sample = vectors[np.random.default_rng(0).permutation(count)[:KMEANS_SAMPLE]]
+            kmeans = MiniBatchKMeans(n_clusters=nlist, random_state=0, n_init=3).fit(sample)
+            centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+        else:
+            nlist = 1
+            centroids = np.zeros((1, self.dim), dtype=np.float32)
+        assign = np.argmax(vectors @ centroids.T, axis=1) if count else np.zeros(0, dtype=np.intp)
+        order = np.argsort(assign, kind="stable")
+        offsets = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+        capacity = max(count, 1024)
+        self._allocate(tmp, capacity)
+        if count:
+            self._map("vectors.f32", np.float32, count, self.dim, "r+", tmp)[:] = vectors[order]
+            id_bytes = np.frombuffer(b"".join(ids[i].bytes for i in order), dtype=np.uint8)
+            self._map("ids.u8", np.uint8, count, 16, "r+", tmp)[:] = id_bytes.reshape(count, 16)
+            self._map("alive.u1", np.uint8, count, mode="r+", path=tmp)[:] = 1
+            self._map("features.f64", np.float64, count, FEATURE_WIDTH, "r+", tmp)[:] = features[order]
+        np.save(self._file("budgets.npy", tmp), budget_reference(features))
+        np.save(self._file("centroids.npy", tmp), centroids)
+        np.save(self._file("offsets.npy", tmp), offsets)
+        with closing(self._create_id_map(tmp)) as connection, connection:
+            connection.executemany(
+                "INSERT INTO ids (key, row) VALUES (?, ?)",
+                ((ids[i].bytes, row) for row, i in enumerate(order.tolist())),
+            )
+        self._write_meta({
+            "dim": self.dim, "capacity": capacity, "count": count,
+            "built": count, "alive": count, "nlist": nlist,
+        }, tmp)
+
+        old = self.path.with_name(f"{self.path.name}.old-{os.getpid()}")
+        if self.path.exists():
+            os.replace(self.path, old)
+        os.replace(tmp, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+
+    def _create_id_map(self, path):
+        connection = sqlite3.connect(self._file("ids.sqlite3", path), timeout=30)
+        # WAL lets workers look ids up while a writer appends
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE ids (key BLOB PRIMARY KEY, row INTEGER NOT NULL) WITHOUT ROWID")
+        return connection
+
+    def _allocate(self, path, capacity):
+        widths = (("vectors.f32", self.dim * 4), ("ids.u8", 16), ("alive.u1", 1), ("features.f64", FEATURE_WIDTH * 8))
+        for name, width in widths:
+            with open(self._file(name, path), "ab") as handle:
+                handle.truncate(capacity * width)
+
+    def upsert(self, pk, vector=None, features=None):
+        """
+        Supersede any existing row for `pk` and, if `vector` is given, append
+        it with its `features` to the tail. Caller must hold `lock()`.
+        """
+        meta = self._read_meta()
+        count = meta["count"]
+        key = pk.bytes
+        connection = self._id_map()
+        stale = connection.execute("SELECT row FROM ids WHERE key = ?", (key,)).fetchone()
+        if stale is not None and stale[0] < count:
+            alive = self._map("alive.u1", np.uint8, count, mode="r+")
+            if alive[stale[0]]:
+                alive[stale[0]] = 0
+                meta["alive"] -= 1
+            alive.flush()
+
+        with connection:
+            if vector is not None:
+                if count == meta["capacity"]:
+                    meta["capacity"] *= 2
+                    self._allocate(self.path, meta["capacity"])
+                self._map("vectors.f32", np.float32, count + 1, self.dim, "r+")[count] = vector
+                self._map("ids.u8", np.uint8, count + 1, 16, "r+")[count] = np.frombuffer(key, dtype=np.uint8)
+                self._map("features.f64", np.float64, count + 1, FEATURE_WIDTH, "r+")[count] = features
+                self._map("alive.u1", np.uint8, count + 1, mode="r+")[count] = 1
+                connection.execute("INSERT OR REPLACE INTO ids (key, row) VALUES (?, ?)", (key, count))
+                meta["count"] += 1
+                meta["alive"] += 1
+            elif stale is not None:
+                connection.execute("DELETE FROM ids WHERE key = ?", (key,))
+        self._write_meta(meta)
+
+
+class EmbeddingMatchEngine:
+    """
+    Project matching over the memory-mapped store, with exact search or an
+    IVF index that only scores the `nprobe` closest lists plus the tail.
+    """
+    skills_for = staticmethod(ProjectMatchIndex.skills_for)
+
+    def __init__(self, path, dim=256, search="ivf", nprobe=8):
+        self.embedder = HashingEmbedder(dim)
+        self.store = VectorStore(path, dim)
+        self.search = search
+        self.nprobe = nprobe
+
+    def get_queryset(self):
+        return FreelanceProject.objects.filter(is_open=True)
+
+    # ---------- building / writes ----------
+    def _rows(self, queryset):
+        """`(pk, text, features)` for each project of `queryset`."""
+        n_text = len(ProjectMatchIndex.text_fields)
+        rows = queryset.values_list("pk", *ProjectMatchIndex.text_fields, *ProjectMatchIndex.feature_fields)
+        for pk, *values in rows.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            yield pk, " ".join(value or "" for value in values[:n_text]), project_features(*values[n_text:])
+
+    def rebuild(self):
+        def batches():
+            ids, texts, features = [], [], []
+            for pk, text, feature_row in self._rows(self.get_queryset()):
+                ids.append(pk)
+                texts.append(text)
+                features.append(feature_row)
+                if len(ids) >= LOAD_CHUNK_SIZE:
+                    yield ids, self.embedder.embed(texts), np.asarray(features)
+                    ids, texts, features = [], [], []
+            if ids:
+                yield ids, self.embedder.embed(texts), np.asarray(features)
+
+        with self.store.lock():
+            self.store.build(batches())
+        logger.info("Built project vector store at %s", self.store.path)
+
+    def ensure_ready(self):
+        if not self.store.exists():
+            with self.store.lock():
+                exists = self.store.exists()
+            if not exists:
+                self.rebuild()
+
+    def is_warm(self):
+        """Whether lookups by id can run without building the store."""
+        return self.store.exists()
+
+    def record_write(self, pk, text=None, features=None):
+        if self.store.exists():
+            vector = self.embedder.embed([text])[0] if text is not None else None
+            with self.store.lock():
+                self.store.upsert(pk, vector, features)
+        bump_projects_version()
+
+    def on_commit_write(self, instance, indexed=True):
+        pk = instance.pk
+        text = features = None
+        if indexed:
+            text = project_text(instance)
+            features = project_features(instance.budget, instance.project_type, instance.created_at)
+        transaction.on_commit(lambda: self.record_write(pk, text, features))
+
+    def record_rows(self, pks):
+        """Re-embed the rows of `pks` still open and drop the others, under one lock."""
+        if self.store.exists():
+            items = list(self._rows(self.get_queryset().filter(pk__in=pks)))
+            vectors = self.embedder.embed([text for _, text, _ in items]) if items else []
+            found = {pk for pk, _, _ in items}
+            with self.store.lock():
+                for (pk, _, features), vector in zip(items, vectors):
+                    self.store.upsert(pk, vector, features)
+                for pk in set(pks) - found:
+                    self.store.upsert(pk)
+        bump_projects_version()
+
+    def on_commit_rows(self, pks):
+        """Re-index rows written in bulk, which send no signals (bulk_create, queryset update)."""
+        pks = list(pks)
+        if pks:
+            transaction.on_commit(lambda: self.record_rows(pks))
+
+    def on_commit_bulk_create(self, instances):
+        self.on_commit_rows([instance.pk for instance in instances])
+
+    def top_k_many(self, texts, k, tag_ids=None, scorers=None):
+        """`top_k` for each of `texts`; IVF probes depend on the query, so each is searched on its own."""
+        return [
+            self.top_k(text, k, tag_ids[i] if tag_ids else None, scorers[i] if scorers else None)
+            for i, text in enumerate(texts)
+        ]
+
+    # ---------- searching ----------
+    def _probe(self, view, query, nprobe):
+        """Rows in the `nprobe` IVF lists closest to `query` plus the tail, and whether that is every row."""
+        meta = view["meta"]
+        if self.search != "ivf" or nprobe >= meta["nlist"]:
+            return np.arange(meta["count"]), True
+        closest = np.argpartition(-(view["centroids"] @ query), nprobe - 1)[:nprobe]
+        offsets = view["offsets"]
+        probed = [np.arange(offsets[c], offsets[c + 1]) for c in closest]
+        probed.append(np.arange(meta["built"], meta["count"]))
+        return np.concatenate(probed), False
+
+    @staticmethod
+    def _candidates(skill_ids, filters=None):
+        """
+        Open projects tagged with one of `skill_ids` and passing `filters`,
+        as a queryset, or None for no restriction.
+        """
+        if skill_ids is None and not filters:
+            return None
+        projects = FreelanceProject.objects.filter(is_open=True)
+        if skill_ids is not None:
+            tagged = FreelanceProject.skill_tags.through.objects.filter(skill_id__in=skill_ids)
+            projects = projects.filter(pk__in=tagged.values("freelanceproject_id"))
+        if filters:
+            projects = filters.apply(projects)
+        return projects
+
+    def _restrict(self, view, rows, candidates):
+        """
+        The live `rows` whose projects are in the `candidates` queryset. Only
+        the probed ids are checked, so the cost follows the probe, not the
+        catalog; when every row is probed the candidates are streamed instead.
+        """
+        rows = rows[view["alive"][rows] == 1]
+        if candidates is None or not rows.size:
+            return rows
+        if rows.size <= CANDIDATE_CHECK_LIMIT:
+            ids = view["ids"]
+            keep = np.zeros(rows.size, dtype=bool)
+            for start in range(0, rows.size, CANDIDATE_CHECK_CHUNK):
+                chunk = rows[start:start + CANDIDATE_CHECK_CHUNK]
+                pks = [uuid.UUID(bytes=ids[row].tobytes()) for row in chunk]
+                found = {pk.bytes for pk in candidates.filter(pk__in=pks).values_list("pk", flat=True)}
+                keep[start:start + chunk.size] = [pk.bytes in found for pk in pks]
+            return rows[keep]
+
+        wanted = np.zeros(view["meta"]["count"], dtype=bool)
+        batch = []
+        for pk in candidates.values_list("pk", flat=True).iterator(chunk_size=LOAD_CHUNK_SIZE):
+            batch.append(pk.bytes)
+            if len(batch) >= LOAD_CHUNK_SIZE:
+                self._mark(view, wanted, batch)
+                batch = []
+        self._mark(view, wanted, batch)
+        return rows[wanted[rows]]
+
+    def _mark(self, view, wanted, batch):
+        if batch:
+            found = self.store.rows_for(view, np.frombuffer(b"".join(batch), dtype="V16"))
+            wanted[found[found >= 0]] = True
+
+    def count(self, skill_ids=None, filters=None):
+        """
+        Number of open projects `top_k` can return for these restrictions:
+        it widens its probe until `k` are found, so every one is reachable.
+        """
+        self.ensure_ready()
+        candidates = self._candidates(skill_ids, filters)
+        if candidates is None:
+            return self.store.view()["meta"]["alive"]
+        return candidates.count()
+
+    def similarity(self, text, pk):
+        """Cosine similarity between `text` and project `pk`, or None if it is not stored."""
+        self.ensure_ready()
+        view = self.store.view()
+        row = self.store.rows_for(view, np.frombuffer(pk.bytes, dtype="V16"))[0]
+        if row < 0:
+            return None
+        return float(view["vectors"][row] @ self.embedder.embed([text])[0])
+
+    def top_k(self, text, k, skill_ids=None, scorer=None, filters=None):
+        """
+        Return the `k` best `(id, score)` pairs for `text`. As with
+        TfidfMatchIndex, `scorer(similarity, columns)` turns the vector
+        similarities into the final score using the stored project features.
+
+        With IVF search the `nprobe` closest lists are scored first; when they
+        hold fewer than `k` rows passing `skill_ids` and `filters` (checked in
+        the database for the probed ids only), the probe widens until they do
+        or every row is scored, so deep pages agree with `count()`. The scorer
+        then ranks the probed candidates.
+        """
+        self.ensure_ready()
+        view = self.store.view()
+        if not view["meta"]["count"] or k <= 0:
+            return []
+        candidates = self._candidates(skill_ids, filters)
+        query = self.embedder.embed([text])[0]
+        if self.search != "ivf" and candidates is None:
+            # Exact scan straight off the mapped file, without gathering rows
+            scores = np.asarray(view["vectors"] @ query)
+            scores[view["alive"] == 0] = -np.inf
+            rows = None
+        else:
+            nprobe = self.nprobe
+            while True:
+                rows, everything = self._probe(view, query, nprobe)
+                rows = self._restrict(view, rows, candidates)
+                if rows.size >= k or everything:
+                    break
+                nprobe *= 4
+            if not rows.size:
+                return []
+            scores = view["vectors"][rows] @ query
+        if scorer is not None:
+            features = view["features"] if rows is None else view["features"][rows]
+            scores = scorer(scores, project_columns(np.asarray(features), view["budgets"]))
+        k = min(k, scores.shape[0])
+        winners = np.argpartition(-scores, k - 1)[:k]
+        winners = winners[np.argsort(-scores[winners], kind="stable")]
+        winners = winners[np.isfinite(scores[winners])]
+        ids = view["ids"]
+        return [
+            (uuid.UUID(bytes=ids[i if rows is None else rows[i]].tobytes()), float(scores[i]))
+            for i in winners
+        ]
@@ -1,22 +1,42 @@
-from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from rest_framework import status
 import logging
-from accounts.models import ClientCompany,Profile
-from .models import FreelanceProject
-from .serializer import FreelanceProjectSerializer
-from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+import uuid
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from .models import FreelanceProject
-from .serializer import FreelanceProjectSerializer
-import logging
+from rest_framework.views import APIView
+
+from accounts.models import ClientCompany, Profile, User
+from skillbridge.db_router import read_from_replica
+from .archive import get_archived_project
+from .conditional import conditional
+from .engines import application_match_score, get_project_engine
+from .exports import exportable_applications, exportable_projects, export_applicants, export_projects
+from .facets import FilterError, ProjectFilters, facet_counts
+from .importer import ImportFormatError, detect_format, import_projects, read_rows
+from .matching import profile_index, profile_text, project_text
+from .models import Application, ArchivedProject, FreelanceProject
+from .pagination import (
+    PaginationError, cursor_page, cursor_payload, get_limit_offset, get_page_size,
+    limit_offset_payload,
+)
+from .ranking import hybrid_scorer
+from .recommendations import get_fresh_recommendations
+from .response_cache import shared_response_cache
+from .search import SearchQueryError, search_projects
+from .serializer import (
+    ArchivedProjectSerializer, DetailedApplicantSerializer, FreelanceProjectListSerializer,
+    FreelanceProjectSerializer,
+)
+from .utils import get_cached_feed, get_listings_version, listing_epoch, set_cached_feed
 
 logger = logging.getLogger(__name__)
-logger = logging.getLogger(__name__)
+
+# Minimum number of ranked project IDs selected and cached per freelancer
+FEED_PREFETCH = 100
 
 
 class FreelanceProjectCreateView(APIView):
@@ -47,6 +67,41 @@ class FreelanceProjectCreateView(APIView):
             return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class FreelanceProjectImportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Create many projects from an uploaded CSV (header row of field names)
+        or JSON Lines file in `file`; invalid rows are reported by line and skipped.
+        """
+        try:
+            if request.user.role != "client":
+                return Response({'error': 'Only clients can post projects.'}, status=status.HTTP_403_FORBIDDEN)
+
+            upload = request.FILES.get("file")
+            if upload is None:
+                return Response({'error': 'file is required.'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                file_format = detect_format(upload, request.data.get("file_type"))
+            except ImportFormatError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            client_company, _ = ClientCompany.objects.get_or_create(
+                user=request.user,
+                defaults={'company_name': f"{request.user.email.split('@')[0]}'s Company"}
+            )
+            report = import_projects(read_rows(upload, file_format), request.user, client_company)
+            return Response(
+                report,
+                status=status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST
+            )
+
+        except Exception as e:
+            logger.exception(f"Unexpected error in FreelanceProjectImportView: {str(e)}")
+            return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class FreelanceProjectUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -72,15 +127,66 @@ class FreelanceProjectUpdateView(APIView):
             return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def project_validators(request, project_id):
+    # updated_at also moves when the applicant list changes
+    updated_at = FreelanceProject.objects.filter(pk=project_id).values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        # Archived projects never change again
+        archived_at = ArchivedProject.objects.filter(pk=project_id).values_list("archived_at", flat=True).first()
+        if archived_at is None:
+            return None
+        return ("archived-project", project_id, archived_at.isoformat()), archived_at
+    return ("project", project_id, updated_at.isoformat()), updated_at
+
+
+def is_public_listing(request):
+    return request.user.role not in ("client", "freelancer")
+
+
+def project_list_validators(request):
+    """
+    Validators for the list endpoint. Listings shown to everyone and the
+    freelancer feed come from the listings version, bumped by every write
+    that changes what a listing shows, and the listing epoch, which lets
+    applicant counters through, so they cost no query over the open
+    projects; the feed adds the profile it is ranked for. A client's own
+    projects are validated by one aggregate over the created_by index: the
+    newest updated_at and the row count, so edits, applies, closures and
+    deletions all change the ETag.
+    """
+    try:
+        filters = ProjectFilters.from_request(request)
+    except FilterError:
+        return None
+    user = request.user
+    if is_public_listing(request):
+        # Same open-project listing for everyone: validated by the listings
+        # version alone, without touching the database
+        return ("projects", "public", request.get_full_path(), get_listings_version(), listing_epoch()), None
+    parts = ["projects", user.pk, user.role, request.get_full_path()]
+    if user.role == "freelancer":
+        profile_updated_at = Profile.objects.filter(user=user).values_list("updated_at", flat=True).first()
+        return parts + [get_listings_version(), listing_epoch(), profile_updated_at], None
+    projects = filters.apply(FreelanceProject.objects.filter(created_by=user))
+    latest = projects.order_by().aggregate(latest=Max("updated_at"), total=Count("pk"))
+    parts += [latest["latest"], latest["total"]]
+    # Rows can leave the list without a newer timestamp, so no Last-Modified
+    return parts, None
+
+
 class FreelanceProjectDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional(project_validators)
     def get(self, request, project_id):
         try:
             project = FreelanceProject.objects.get(id=project_id)
             serializer = FreelanceProjectSerializer(project)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except FreelanceProject.DoesNotExist:
+            archived = get_archived_project(project_id)
+            if archived is not None:
+                return Response(ArchivedProjectSerializer(archived).data, status=status.HTTP_200_OK)
             return Response({'error': 'Project not found.'}, status=status.HTTP_404_NOT_FOUND)
 
 
@@ -88,61 +194,83 @@ class FreelanceProjectDetailView(APIView):
 class FreelanceProjectListView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional(project_list_validators)
+    @shared_response_cache(when=is_public_listing)
+    @read_from_replica
     def get(self, request):
         try:
-            # Clients should see THEIR projects (Active or Closed)
-            if request.user.role == "client":
-                projects = FreelanceProject.objects.filter(created_by=request.user).order_by('-created_at')
-                serializer = FreelanceProjectSerializer(projects, many=True)
-                return Response(serializer.data, status=200)
+            try:
+                filters = ProjectFilters.from_request(request)
+            except FilterError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            # Admins or others
+            # Clients should see THEIR projects (Active or Closed)
             if request.user.role != "freelancer":
-                projects = FreelanceProject.objects.filter(is_open=True).order_by('-created_at')
-                serializer = FreelanceProjectSerializer(projects, many=True)
-                return Response(serializer.data, status=200)
-
-            profile = request.user.profile
-
-            # Combine freelancer profile text
-            profile_text = " ".join([
-                profile.skills or "",
-                profile.experience_level or "",
-                profile.bio or "",
-                profile.portfolio_links or ""
-            ])
-
-            # Fetch open projects
-            projects = FreelanceProject.objects.filter(is_open=True)
-
-            # Build project text list
-            project_texts = []
-            for proj in projects:
-                text = " ".join([
-                    proj.title or "",
-                    proj.description or "",
-                    getattr(proj, "required_skills", "") or ""
-                ])
-                project_texts.append(text)
-
-            # Apply TF-IDF
-            vectorizer = TfidfVectorizer()
-            vectors = vectorizer.fit_transform([profile_text] + project_texts)
-
-            # Compute cosine similarity
-            similarity_scores = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
-
-            # Sort projects by similarity
-            ranked_projects = [
-                proj for _, proj in sorted(
-                    zip(similarity_scores, projects),
-                    key=lambda x: x[0],
-                    reverse=True
+                if request.user.role == "client":
+                    projects = FreelanceProject.objects.filter(created_by=request.user)
+                else:
+                    # Admins or others
+                    projects = FreelanceProject.objects.filter(is_open=True)
+                projects = filters.apply(projects)
+                try:
+                    page_size = get_page_size(request)
+                    page, next_cursor, previous_cursor = cursor_page(request, projects, page_size)
+                except PaginationError as e:
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                serializer = FreelanceProjectListSerializer(page, many=True)
+                return Response(
+                    cursor_payload(request, serializer.data, next_cursor, previous_cursor),
+                    status=200
                 )
-            ]
 
-            serializer = FreelanceProjectSerializer(ranked_projects, many=True)
-            return Response(serializer.data, status=200)
+            try:
+                limit, offset = get_limit_offset(request)
+            except PaginationError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            end = offset + limit
+
+            # Warm path: reuse the ranking computed for this profile and project set.
+            # Filtered feeds are ranked on demand over the narrowed candidates,
+            # since the cached and precomputed rankings only cover the full feed.
+            version, cached = (None, None) if filters else get_cached_feed(request.user.id)
+            if cached is not None and len(cached[0]) >= min(end, cached[1]):
+                ranked_ids, total = cached
+            else:
+                profile = request.user.profile
+                engine = get_project_engine()
+                # Only projects sharing a skill with the freelancer are scored
+                skill_ids = engine.skills_for(profile)
+                total = engine.count(skill_ids, filters)
+
+                # Prefer the batch job's precomputed ranking while it is fresh
+                ranked_ids = None if filters else get_fresh_recommendations(request.user, profile, version)
+                if ranked_ids is None or len(ranked_ids) < min(end, total):
+                    # Partially select only the leading window of scores, growing
+                    # geometrically so paging forward rarely rescores
+                    prefix = len(cached[0]) if cached is not None else 0
+                    size = end if filters else max(end, 2 * prefix, FEED_PREFETCH)
+                    winners = engine.top_k(
+                        profile_text(profile), size, skill_ids, hybrid_scorer(profile), filters
+                    )
+                    ranked_ids = [pk for pk, _ in winners]
+                    if cached is not None:
+                        # An approximate (IVF) search may reorder the head when
+                        # the window grows; keep the pages already served stable
+                        served = set(cached[0])
+                        ranked_ids = cached[0] + [pk for pk in ranked_ids if pk not in served]
+                if not filters:
+                    set_cached_feed(request.user.id, version, ranked_ids, total)
+
+            # Only the requested window is fetched and serialized
+            window_ids = ranked_ids[offset:end]
+            projects = FreelanceProject.objects.filter(is_open=True).in_bulk(window_ids)
+            ranked_projects = [projects[pk] for pk in window_ids if pk in projects]
+
+            serializer = FreelanceProjectListSerializer(ranked_projects, many=True)
+            return Response(
+                limit_offset_payload(request, serializer.data, total, limit, offset),
+                status=200
+            )
 
         except Exception as e:
             logger.exception(f"Error ranking projects: {str(e)}")
@@ -152,6 +280,82 @@ class FreelanceProjectListView(APIView):
             )
 
 
+class ProjectSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @shared_response_cache()
+    def get(self, request):
+        """Full-text search over open projects, best match first."""
+        try:
+            query = request.query_params.get("q", "").strip()
+            if not query:
+                return Response({'error': 'q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                limit, offset = get_limit_offset(request)
+                ranked_ids, total = search_projects(query, limit, offset)
+            except (PaginationError, SearchQueryError) as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            projects = FreelanceProject.objects.in_bulk(ranked_ids)
+            ranked_projects = [projects[pk] for pk in ranked_ids if pk in projects]
+            serializer = FreelanceProjectListSerializer(ranked_projects, many=True)
+            return Response(
+                limit_offset_payload(request, serializer.data, total, limit, offset),
+                status=status.HTTP_200_OK
+            )
+
+        except Exception as e:
+            logger.exception(f"Unexpected error in ProjectSearchView: {str(e)}")
+            return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ProjectExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Stream the client's projects (every project for admins), archived ones included, as CSV."""
+        is_admin = IsAdminUser().has_permission(request, self)
+        if not is_admin and request.user.role != "client":
+            return Response({'error': 'Only clients and admins can export projects.'}, status=status.HTTP_403_FORBIDDEN)
+        return export_projects(*exportable_projects(request.user, is_admin))
+
+
+class ApplicantExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Stream the applicants of the client's projects, optionally of one
+        `project`, archived ones included, as CSV.
+        """
+        is_admin = IsAdminUser().has_permission(request, self)
+        if not is_admin and request.user.role != "client":
+            return Response({'error': 'Only clients and admins can export applicants.'}, status=status.HTTP_403_FORBIDDEN)
+        applications, archived = exportable_applications(request.user, is_admin)
+        project_id = request.query_params.get("project")
+        if project_id:
+            try:
+                project_id = uuid.UUID(project_id)
+            except ValueError:
+                return Response({'error': 'project must be a project id.'}, status=status.HTTP_400_BAD_REQUEST)
+            applications = applications.filter(project_id=project_id)
+            archived = archived.filter(project_id=project_id)
+        return export_applicants(applications, archived)
+
+
+class ProjectFacetsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @shared_response_cache()
+    def get(self, request):
+        """Open project counts per project type, budget range and skill, for the filter sidebar."""
+        try:
+            return Response(facet_counts(), status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.exception(f"Unexpected error in ProjectFacetsView: {str(e)}")
+            return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class FreelanceProjectDeleteView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -173,35 +377,92 @@ class FreelanceProjectApplyView(APIView):
 
     def post(self, request, project_id):
         try:
-            project = FreelanceProject.objects.get(id=project_id)
-
             if request.user.role != "freelancer":
                 return Response({'error': 'Only freelancers can apply.'}, status=status.HTTP_403_FORBIDDEN)
 
+            project = FreelanceProject.objects.only("id", "is_open").get(id=project_id)
             if not project.is_open:
                 return Response({'error': 'This project is closed.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            if request.user in project.applicants.all():
-                return Response({'message': 'You already applied.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            project.applicants.add(request.user)
+            # Scored once here so clients can sort applicants without rescoring,
+            # unless this worker's engine is cold: loading it would hold the
+            # apply up, so `manage.py score_applications` scores it later
+            profile = Profile.objects.filter(user=request.user).first()
+            match_score = application_match_score(profile, project.pk, warm_only=True)
+
+            # The conditional counter update re-checks is_open and, on databases
+            # with row locks, serializes applies to the same project. The unique
+            # (project, user) index on the through table rejects a duplicate
+            # insert, rolling back the increment with it, so concurrent double
+            # clicks store one application and the cost does not grow with the
+            # number of applicants. The m2m_changed counter is bypassed here.
+            with transaction.atomic():
+                opened = FreelanceProject.objects.filter(pk=project.pk, is_open=True).update(
+                    applicant_count=F("applicant_count") + 1, updated_at=timezone.now()
+                )
+                if not opened:
+                    return Response({'error': 'This project is closed.'}, status=status.HTTP_400_BAD_REQUEST)
+                Application.objects.create(
+                    project_id=project.pk, user_id=request.user.pk, match_score=match_score
+                )
             return Response({'message': 'Applied successfully.'}, status=status.HTTP_200_OK)
 
+        except IntegrityError:
+            return Response({'message': 'You already applied.'}, status=status.HTTP_400_BAD_REQUEST)
         except FreelanceProject.DoesNotExist:
             return Response({'error': 'Project not found.'}, status=status.HTTP_404_NOT_FOUND)
 class ApplicantDetails(APIView):
     permission_classes = [IsAuthenticated]
 
+    orderings = {
+        "recent": ("-applied_at", "-id"),
+        # Applications without a score (closed or unindexed projects) go last
+        "match": (F("match_score").desc(nulls_last=True), "-applied_at", "-id"),
+    }
+
+    @read_from_replica
     def get(self, request, project_id):
+        """
+        Page through the applicants, newest first or best match first with
+        `?ordering=match`, in a constant number of queries. Read only:
+        applications stored without a match score sort last until
+        `manage.py score_applications` scores them.
+        """
         try:
             project = FreelanceProject.objects.get(id=project_id)
             if request.user.role != "client" or project.created_by != request.user:
                 return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
 
-            applicants = project.applicants.all()
-            from .serializer import DetailedApplicantSerializer
-            serializer = DetailedApplicantSerializer(applicants, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            ordering = request.query_params.get("ordering", "recent")
+            if ordering not in self.orderings:
+                return Response(
+                    {'error': f"ordering must be one of: {', '.join(self.orderings)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                limit, offset = get_limit_offset(request)
+            except PaginationError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            applications = (
+                Application.objects.filter(project=project)
+                .select_related("user__profile")
+                .order_by(*self.orderings[ordering])[offset:offset + limit]
+            )
+            results = []
+            for application in applications:
+                data = DetailedApplicantSerializer(application.user).data
+                data["applied_at"] = application.applied_at
+                data["match_score"] = (
+                    None if application.match_score is None else round(application.match_score, 4)
+                )
+                results.append(data)
+
+            # The denormalized counter stands in for a COUNT(*) over the applications
+            return Response(
+                limit_offset_payload(request, results, project.applicant_count, limit, offset),
+                status=status.HTTP_200_OK
+            )
 
         except FreelanceProject.DoesNotExist:
             return Response({'error': 'Project not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -209,6 +470,53 @@ class ApplicantDetails(APIView):
             logger.exception(f"Unexpected error in ApplicantDetails: {str(e)}")
             return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
+class SuggestedFreelancersView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 100
+
+    def get(self, request, project_id):
+        """
+        Rank every freelancer profile against the project and return the top k.
+        """
+        try:
+            project = FreelanceProject.objects.get(id=project_id)
+            if request.user.role != "client" or project.created_by != request.user:
+                return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+
+            try:
+                k = int(request.query_params.get("k", self.default_limit))
+            except ValueError:
+                return Response({'error': 'k must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+            k = max(1, min(k, self.max_limit))
+
+            winners = [
+                (profile_id, score)
+                for profile_id, score in profile_index.top_k(
+                    project_text(project), k, profile_index.skills_for(project)
+                )
+                if score > 0
+            ]
+
+            # Only the winners are loaded from the database
+            profiles = Profile.objects.select_related("user").in_bulk([pk for pk, _ in winners])
+            results = []
+            for profile_id, score in winners:
+                profile = profiles.get(profile_id)
+                if profile is None:
+                    continue
+                data = DetailedApplicantSerializer(profile.user).data
+                data["match_score"] = round(score, 4)
+                results.append(data)
+
+            return Response(results, status=status.HTTP_200_OK)
+
+        except FreelanceProject.DoesNotExist:
+            return Response({'error': 'Project not found.'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.exception(f"Unexpected error in SuggestedFreelancersView: {str(e)}")
+            return Response({'error': 'Unexpected error occurred', 'details': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 class AcceptApplicantView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -287,13 +595,14 @@ class RejectApplicantView(APIView):
                 return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
 
             try:
-                applicant = Profile.objects.get(id=applicant_id, role="freelancer")
-            except Profile.DoesNotExist:
+                applicant = User.objects.get(id=applicant_id, role="freelancer")
+            except User.DoesNotExist:
                 return Response({'error': 'Applicant not found or not a freelancer.'}, status=status.HTTP_404_NOT_FOUND)
 
-            if applicant not in project.applicants.all():
+            if not project.applicants.filter(pk=applicant.pk).exists():
                 return Response({'error': 'This user did not apply for the project.'}, status=status.HTTP_400_BAD_REQUEST)
 
+            # applicant_count is decremented by the m2m_changed handler
             project.applicants.remove(applicant)
             return Response({'message': 'Applicant rejected successfully.'}, status=status.HTTP_200_OK)
 
@@ -313,13 +622,17 @@ class ListAppliedProjectsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        projects = FreelanceProject.objects.filter(
-            applicants=request.user
-        ).select_related("client_company", "created_by")
+        projects = FreelanceProject.objects.filter(applicants=request.user)
+
+        try:
+            page_size = get_page_size(request)
+            page, next_cursor, previous_cursor = cursor_page(request, projects, page_size)
+        except PaginationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = FreelanceProjectSerializer(projects, many=True)
+        serializer = FreelanceProjectListSerializer(page, many=True)
 
-        return Response({
-            "count": projects.count(),
-            "results": serializer.data
-        }, status=status.HTTP_200_OK)
+        return Response(
+            cursor_payload(request, serializer.data, next_cursor, previous_cursor),
+            status=status.HTTP_200_OK
+        )
@@ -0,0 +1,26 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose entries other worker processes never see
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+class SkillbridgeConfig(AppConfig):
+    name = "skillbridge"
+
+    def ready(self):
+        # Listed before the other local apps so every connection they open is tuned
+        from . import sqlite  # noqa: F401
+
+        workers = getattr(settings, "WEB_CONCURRENCY", 1)
+        if workers > 1 and isinstance(caches["default"], PROCESS_LOCAL_CACHES):
+            raise ImproperlyConfigured(
+                f"WEB_CONCURRENCY is {workers} but the default cache is process-local. "
+                "Version counters, ranked feeds, cached listing responses, match index "
+                "sync and read-your-writes pins must be shared by every worker: set "
+                "REDIS_URL (or configure another shared CACHES backend)."
+            )
@@ -0,0 +1,155 @@
+"""
+Primary/replica routing with read-your-writes stickiness.
+
+Writes always go to `default`. Reads go to a replica only inside views
+decorated with `read_from_replica`, and only for users who have not
+written recently: any request that writes pins its user to the primary for
+READ_YOUR_WRITES_SECONDS, longer than replication is expected to lag.
+Pins live in the default cache, which every worker must share (see CACHES
+in settings): the next request may land on any worker. Replicas are the
+DATABASES aliases starting with "replica".
+
+Anything tagged with the cache's version counters (shared response cache
+entries, conditional GET validators) must describe the primary, or a body
+from a lagging replica would be stored or revalidated as current. Such
+code reads inside `use_primary()`, and responses that did read a replica
+are marked so they are neither cached nor given validators.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set while a replica-eligible view runs
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+# Set inside use_primary(); overrides _replica_reads
+_force_primary = contextvars.ContextVar("force_primary", default=False)
+# Set once a read of the current replica-eligible handler went to a replica
+_used_replica = contextvars.ContextVar("used_replica", default=False)
+# Set once the current request has written to the primary
+_wrote = contextvars.ContextVar("wrote", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+def pin_key(user_id):
+    return f"db:pinned:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.set(pin_key(user_id), True, timeout=getattr(settings, "READ_YOUR_WRITES_SECONDS", 10))
+
+
+def is_pinned(user_id):
+    return bool(cache.get(pin_key(user_id)))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _force_primary.get():
+            return None
+        # Reads inside a transaction must see its own uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        alias = instance._state.db if instance is not None and instance._state.db else None
+        if alias is None:
+            replicas = replica_aliases()
+            alias = random.choice(replicas) if replicas else None
+        if alias is not None and alias != DEFAULT_DB_ALIAS:
+            _used_replica.set(True)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def read_from_replica(handler):
+    """
+    Route the reads of an APIView handler to a replica unless the user wrote
+    within the last READ_YOUR_WRITES_SECONDS. Put it innermost, under
+    `conditional` and `shared_response_cache`: responses that read a replica
+    are marked (see `served_from_replica`) for those decorators to skip.
+    """
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        if not replica_aliases() or is_pinned(request.user.pk):
+            return handler(view, request, *args, **kwargs)
+        token = _replica_reads.set(True)
+        used = _used_replica.set(False)
+        try:
+            response = handler(view, request, *args, **kwargs)
+            if _used_replica.get():
+                response.served_from_replica = True
+            return response
+        finally:
+            _used_replica.reset(used)
+            _replica_reads.reset(token)
+    return wrapper
+
+
+def served_from_replica(response):
+    return getattr(response, "served_from_replica", False)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, even within `read_from_replica`."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReadYourWritesMiddleware:
+    """Pin users to the primary after any request in which they wrote."""
+    sync_capable = True
+    # Async-capable so ASGI requests to async views stay on the event loop
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            self._pin_if_wrote(request)
+            return response
+        finally:
+            _wrote.reset(token)
+
+    async def __acall__(self, request):
+        token = _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+            await sync_to_async(self._pin_if_wrote)(request)
+            return response
+        finally:
+            _wrote.reset(token)
+
+    def _pin_if_wrote(self, request):
+        # DRF authenticates inside the view and copies the user back here
+        user = getattr(request, "user", None)
+        if _wrote.get() and user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
@@ -0,0 +1,66 @@
+"""
+JSON renderer and parser backed by orjson, with DRF's stdlib versions as the
+fallback.
+
+Output matches DRF's JSONRenderer with the default settings: types orjson
+does not encode the same way (datetimes, Decimal, lazy strings, querysets,
+numpy values, ...) go through DRF's own encoder, and U+2028/U+2029 are
+escaped. Anything orjson cannot do (indented output, ASCII-only output,
+integers over 64 bits) is rendered by the stdlib path. The differences:
+NaN and infinity render as null instead of raising, small float exponents
+are spelled 1e-7 rather than 1e-07, and integers over 64 bits in request
+bodies parse as floats. Without orjson installed both classes behave
+exactly like DRF's.
+"""
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Let DRF's encoder format datetimes (millisecond precision, "Z" for UTC)
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+UTF8_NAMES = {"utf-8", "utf8"}
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers over 64 bits; the stdlib path handles them or raises DRF's error
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Valid JSON but not valid JavaScript, as in JSONRenderer
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower() not in UTF8_NAMES:
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Re-parse with the stdlib for DRF's usual ParseError message
+            return super().parse(io.BytesIO(body), media_type, parser_context)
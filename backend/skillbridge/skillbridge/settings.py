@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "skillbridge",  # Settings package: SQLite connection tuning and startup checks
     "accounts",  
     'rest_framework_simplejwt.token_blacklist',
     "verification",
@@ -59,7 +61,17 @@ CORS_ALLOW_HEADERS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # orjson-backed JSON, falling back to stdlib json when orjson is not installed
+    'DEFAULT_RENDERER_CLASSES': (
+        'skillbridge.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'skillbridge.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  
@@ -72,6 +84,7 @@ ALLOWED_HOSTS = []
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "skillbridge.db_router.ReadYourWritesMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -112,6 +125,65 @@ DATABASES = {
     }
 }
 
+# Opt-in production SQLite profile: SQLITE_PRODUCTION=1 applies SQLITE_PRAGMAS
+# to every connection (see skillbridge/sqlite.py), starts write transactions
+# with BEGIN IMMEDIATE so concurrent writers wait on the busy timeout instead of
+# failing a lock upgrade, and keeps connections open across requests.
+SQLITE_PRODUCTION = os.getenv("SQLITE_PRODUCTION") == "1"
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 20000,  # ms
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,  # KiB, i.e. 64MB
+    "temp_store": "MEMORY",
+}
+if SQLITE_PRODUCTION:
+    DATABASES["default"].update({
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+    })
+
+# Read replicas as a comma-separated list of SQLite files, e.g.
+# DATABASE_REPLICAS=replica1.sqlite3,replica2.sqlite3; locally they are
+# refreshed from the primary with `manage.py sync_replicas`.
+for index, name in enumerate(filter(None, os.getenv("DATABASE_REPLICAS", "").split(",")), start=1):
+    DATABASES[f"replica_{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / name.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Version counters, ranked feeds, rendered listing responses, match index sync
+# and read-your-writes pins live in the default cache, so every worker process
+# must share it: set REDIS_URL wherever more than one worker runs. The
+# in-process fallback only suits a single runserver.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+# Worker processes serving requests (gunicorn and uvicorn read it too). Startup
+# fails if it is above 1 while the default cache is process-local.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+DATABASE_ROUTERS = ["skillbridge.db_router.PrimaryReplicaRouter"]
+# Seconds a user's reads stay on the primary after they write; the pin is kept
+# in the shared default cache so it holds whichever worker serves the next read
+READ_YOUR_WRITES_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -156,6 +228,31 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Gemini API Configuration
 GEMINI_API_KEY = "your_gemini_api_key_here"  # Set this in your environment variables
 
+# Precomputed project recommendations older than this (seconds) fall back to live scoring
+PROJECT_RECOMMENDATIONS_MAX_AGE = 6 * 60 * 60
+
+# Matching backend for the freelancer project feed: "tfidf" (in-memory sparse index)
+# or "embedding" (memory-mapped dense vectors shared by all workers)
+PROJECT_MATCHING_ENGINE = "tfidf"
+PROJECT_EMBEDDING_STORE = {
+    "PATH": BASE_DIR / "vector_store" / "projects",
+    "DIM": 256,
+    "SEARCH": "ivf",  # or "exact"
+    "NPROBE": 8,
+}
+
+# Weights of the hybrid feed score; missing keys fall back to project.ranking.DEFAULT_WEIGHTS
+PROJECT_RANKING_WEIGHTS = {
+    "similarity": 1.0,
+    "budget_fit": 0.15,
+    "recency": 0.1,
+    "hourly": 0.0,
+}
+
+# Closed projects untouched for this many days are moved to the archive tables
+# by `manage.py archive_projects`
+PROJECT_ARCHIVE_AFTER_DAYS = 365
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
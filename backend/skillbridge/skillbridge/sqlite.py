@@ -0,0 +1,22 @@
+"""
+Connection tuning for the production SQLite profile (SQLITE_PRODUCTION=1).
+
+Every new SQLite connection gets settings.SQLITE_PRAGMAS: WAL journaling so
+readers never block the writer, synchronous=NORMAL (durable at checkpoints,
+safe against corruption in WAL mode), a busy timeout so writers queue for
+the lock instead of failing with "database is locked", and larger page and
+mmap caches. IMMEDIATE transactions and persistent connections are set on
+the DATABASES entry itself.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRODUCTION:
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
@@ -0,0 +1,88 @@
+import io
+import tempfile
+import uuid
+from datetime import date, datetime, time as dt_time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import FastJSONParser, FastJSONRenderer
+
+
+class SQLitePragmaTests(SimpleTestCase):
+    def pragmas(self):
+        """PRAGMA values seen by a new connection to a file database."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = DatabaseWrapper(
+            {**connections["default"].settings_dict, "NAME": f"{directory.name}/db.sqlite3"}, "pragmas"
+        )
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            values = {}
+            for pragma in ("journal_mode", "synchronous", "busy_timeout", "temp_store"):
+                cursor.execute(f"PRAGMA {pragma}")
+                values[pragma] = cursor.fetchone()[0]
+        return values
+
+    @override_settings(SQLITE_PRODUCTION=True)
+    def test_production_profile_tunes_every_connection(self):
+        # synchronous NORMAL is 1 and temp_store MEMORY is 2
+        self.assertEqual(
+            self.pragmas(),
+            {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 20000, "temp_store": 2},
+        )
+
+    @override_settings(SQLITE_PRODUCTION=False)
+    def test_default_profile_leaves_connections_alone(self):
+        self.assertEqual(self.pragmas()["journal_mode"], "delete")
+
+
+class FastJSONTests(SimpleTestCase):
+    data = {
+        "when": datetime(2026, 10, 18, 3, 0, 0, 123456, tzinfo=dt_timezone.utc),
+        "naive": datetime(2026, 10, 18, 3, 0, 0, 123456),
+        "day": date(2026, 10, 18),
+        "at": dt_time(9, 30, 15, 250000),
+        "budget": Decimal("1500.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "text": "line\u2028separator\u2029paragraph \u00e9 \u2603",
+        "nested": [1, 2.5, None, True, {"key": "value"}],
+    }
+
+    def test_renders_the_same_bytes_as_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_integers_over_64_bits_fall_back_to_drf(self):
+        data = {"huge": 3 ** 50}
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_line_separators_are_escaped(self):
+        content = FastJSONRenderer().render({"text": "a\u2028b\u2029c"})
+
+        self.assertEqual(content, b'{"text":"a\\u2028b\\u2029c"}')
+
+    def test_indented_output_falls_back_to_drf(self):
+        context = {"indent": 2}
+
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, "application/json", context),
+            JSONRenderer().render(self.data, "application/json", context),
+        )
+
+    def test_parses_the_same_values_as_drf(self):
+        body = JSONRenderer().render(self.data)
+
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_invalid_json_raises_drfs_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b"{not json"))
@@ -1,3 +1,62 @@
+import asyncio
+import time
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from .models import SkillVerification
+
+ANALYSIS_SECONDS = 0.3
+
+
+async def slow_analysis(source):
+    await asyncio.sleep(ANALYSIS_SECONDS)
+    return f"analysis of {source}"
+
+
+async def final_report(resume_analysis, github_analysis):
+    return {"summary": [resume_analysis, github_analysis]}
+
+
+class AsyncVerificationViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="freelancer@example.com", password=None, role="freelancer")
+        profile = self.user.profile
+        profile.github_url = "https://github.com/example"
+        profile.resume = "resumes/example.pdf"
+        profile.save()
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    @mock.patch("verification.views.agenerate_final_report", final_report)
+    @mock.patch("verification.views.aanalyze_github_profile", slow_analysis)
+    @mock.patch("verification.views.aanalyze_resume", slow_analysis)
+    @mock.patch("verification.views.extract_text_from_pdf_fileobj", return_value="resume text")
+    async def test_start_runs_the_analyses_concurrently(self, extract):
+        started = time.perf_counter()
+        response = await self.async_client.post("/api/verification/start/", headers=self.headers)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 2 * ANALYSIS_SECONDS)
+        verification = await SkillVerification.objects.aget(user=self.user)
+        self.assertEqual(verification.resume_analysis, "analysis of resume text")
+        self.assertEqual(verification.github_analysis, "analysis of https://github.com/example")
+        self.assertEqual(verification.verification_status, "PENDING")
+
+    async def test_recommendation_is_read_with_the_async_orm(self):
+        response = await self.async_client.get("/api/verification/recommendation/", headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+        await SkillVerification.objects.acreate(user=self.user, gemini_recommendation={"level": "Expert"})
+        response = await self.async_client.get("/api/verification/recommendation/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"level": "Expert"})
+
+    async def test_unauthenticated_requests_are_rejected(self):
+        response = await self.async_client.get("/api/verification/recommendation/")
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 401)
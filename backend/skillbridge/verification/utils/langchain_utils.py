@@ -11,7 +11,7 @@ model = ChatGoogleGenerativeAI(
     model="gemini-2.5-flash",   
     api_key=API_KEY
 )
-def analyze_resume(resume_text: str) -> str:
+def _resume_chain():
     template = PromptTemplate(
         input_variables=["resume_text"],
         template="""
@@ -24,9 +24,12 @@ def analyze_resume(resume_text: str) -> str:
         {resume_text}
         """
     )
-    chain = template | model | StrOutputParser()
-    return chain.invoke({"resume_text": resume_text})
-def analyze_github_profile(github_profile: str) -> str:
+    return template | model | StrOutputParser()
+def analyze_resume(resume_text: str) -> str:
+    return _resume_chain().invoke({"resume_text": resume_text})
+async def aanalyze_resume(resume_text: str) -> str:
+    return await _resume_chain().ainvoke({"resume_text": resume_text})
+def _github_chain():
     template = PromptTemplate(
         input_variables=["github_profile"],
         template="""
@@ -39,9 +42,12 @@ def analyze_github_profile(github_profile: str) -> str:
         {github_profile}
         """
     )
-    chain = template | model | StrOutputParser()
-    return chain.invoke({"github_profile": github_profile})
-def generate_final_report(resume_analysis: str, github_analysis: str) -> str:
+    return template | model | StrOutputParser()
+def analyze_github_profile(github_profile: str) -> str:
+    return _github_chain().invoke({"github_profile": github_profile})
+async def aanalyze_github_profile(github_profile: str) -> str:
+    return await _github_chain().ainvoke({"github_profile": github_profile})
+def _final_report_chain():
     template = PromptTemplate(
         input_variables=["resume_analysis", "github_analysis"],
         template="""
@@ -54,9 +60,12 @@ def generate_final_report(resume_analysis: str, github_analysis: str) -> str:
         Final Report:
         """
     )
-    chain = template | model | StrOutputParser()
-    return chain.invoke({"resume_analysis": resume_analysis, "github_analysis": github_analysis})
-def generate_test(resume_analysis: str, github_analysis: str, skills=None, recommendation=None, num_questions=5, role_hint="Developer") -> str:
+    return template | model | StrOutputParser()
+def generate_final_report(resume_analysis: str, github_analysis: str) -> str:
+    return _final_report_chain().invoke({"resume_analysis": resume_analysis, "github_analysis": github_analysis})
+async def agenerate_final_report(resume_analysis: str, github_analysis: str) -> str:
+    return await _final_report_chain().ainvoke({"resume_analysis": resume_analysis, "github_analysis": github_analysis})
+def _test_chain():
     parser = JsonOutputParser()
     template = PromptTemplate(
         input_variables=["resume_analysis", "github_analysis", "skills", "recommendation", "num_questions", "role_hint"],
@@ -91,8 +100,9 @@ def generate_test(resume_analysis: str, github_analysis: str, skills=None, recom
         }}
         """
     )
-    chain = template | model | parser
-    r=chain.invoke({
+    return template | model | parser
+def generate_test(resume_analysis: str, github_analysis: str, skills=None, recommendation=None, num_questions=5, role_hint="Developer") -> str:
+    r=_test_chain().invoke({
         "resume_analysis": resume_analysis,
         "github_analysis": github_analysis,
         "skills": skills,
@@ -101,10 +111,19 @@ def generate_test(resume_analysis: str, github_analysis: str, skills=None, recom
         "role_hint": role_hint
     })
     return r
+async def agenerate_test(resume_analysis: str, github_analysis: str, skills=None, recommendation=None, num_questions=5, role_hint="Developer") -> str:
+    return await _test_chain().ainvoke({
+        "resume_analysis": resume_analysis,
+        "github_analysis": github_analysis,
+        "skills": skills,
+        "recommendation": recommendation,
+        "num_questions": num_questions,
+        "role_hint": role_hint
+    })
 
 from langchain.prompts import PromptTemplate
 import json,re
-def final_analysis(resume_analysis:str,github_analysis:str,previous_recommendation:str,test_score:float,test_result:str):
+def _final_analysis_chain():
     prompt=PromptTemplate(
         input_variables=["resume_analysis","github_analysis","previous_recommendation","test_score","test_result"],
         template="""
@@ -130,6 +149,9 @@ def final_analysis(resume_analysis:str,github_analysis:str,previous_recommendati
         """
     )
     parser=StrOutputParser()
-    chain=prompt|model|parser
-    response=chain.invoke({"resume_analysis":resume_analysis,"github_analysis":github_analysis,"previous_recommendation":previous_recommendation,"test_score":test_score,"test_result":test_result})
+    return prompt|model|parser
+def final_analysis(resume_analysis:str,github_analysis:str,previous_recommendation:str,test_score:float,test_result:str):
+    response=_final_analysis_chain().invoke({"resume_analysis":resume_analysis,"github_analysis":github_analysis,"previous_recommendation":previous_recommendation,"test_score":test_score,"test_result":test_result})
     return response
+async def afinal_analysis(resume_analysis:str,github_analysis:str,previous_recommendation:str,test_score:float,test_result:str):
+    return await _final_analysis_chain().ainvoke({"resume_analysis":resume_analysis,"github_analysis":github_analysis,"previous_recommendation":previous_recommendation,"test_score":test_score,"test_result":test_result})
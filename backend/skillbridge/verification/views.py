@@ -1,13 +1,19 @@
+import asyncio
+
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from django.shortcuts import get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
 from django.contrib.auth import get_user_model
 
 from .models import SkillVerification,SkillTest,TestResult
 from .serializer import VerificationStatusSerializer, AdminVerifySerializer
 from accounts.models import Profile
+from project.async_views import AsyncAPIView
+from project.conditional import conditional
+from skillbridge.db_router import read_from_replica
 from .utils.pdf_utils import (
     extract_text_from_pdf_fileobj
 )
@@ -16,11 +22,15 @@ from .utils.langchain_utils import *
 User = get_user_model()
 
 
-class StartVerificationView(APIView):
+async def _noop():
+    return None
+
+
+class StartVerificationView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
-        profile = get_object_or_404(Profile, user=request.user)
+    async def post(self, request):
+        profile = await aget_object_or_404(Profile, user=request.user)
 
         if not profile.resume and not profile.github_url:
             return Response(
@@ -28,24 +38,27 @@ class StartVerificationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        verification = SkillVerification.objects.filter(user=request.user).order_by('-created_at').first()
+        verification = await SkillVerification.objects.filter(user=request.user).order_by('-created_at').afirst()
 
         if verification:
             verification.verification_status = "PENDING"
         else:
             verification = SkillVerification(user=request.user, verification_status="PENDING")
 
-    
-        resume_text=extract_text_from_pdf_fileobj(profile.resume)
-        resume_analysis=analyze_resume(resume_text) if profile.resume else None
-        github_analysis=analyze_github_profile(profile.github_url) if profile.github_url else None
+        # PDF parsing is blocking file and CPU work; the two analyses are
+        # independent LLM calls, so they run concurrently
+        resume_text = await sync_to_async(extract_text_from_pdf_fileobj)(profile.resume) if profile.resume else None
+        resume_analysis, github_analysis = await asyncio.gather(
+            aanalyze_resume(resume_text) if profile.resume else _noop(),
+            aanalyze_github_profile(profile.github_url) if profile.github_url else _noop(),
+        )
 
-        recommendation = generate_final_report(resume_analysis, github_analysis)
+        recommendation = await agenerate_final_report(resume_analysis, github_analysis)
         
         verification.resume_analysis = resume_analysis or ""
         verification.github_analysis = github_analysis or ""
         verification.gemini_recommendation = recommendation
-        verification.save()
+        await verification.asave()
 
         return Response({"message": "Verification started/updated", "id": verification.id}, status=status.HTTP_200_OK)
 
@@ -81,10 +94,10 @@ class AdminVerifyUserView(APIView):
 
             profile.star_rating = float(star_rating)
             profile.verification_tag = verification_tag
-            profile.save(update_fields=["star_rating", "verification_tag"])
+            profile.save(update_fields=["star_rating", "verification_tag", "updated_at"])
 
             verification.verification_status = "VERIFIED"
-            verification.save(update_fields=["verification_status"])
+            verification.save(update_fields=["verification_status", "updated_at"])
 
             return Response(
                 {"message": "User verified successfully"},
@@ -98,26 +111,26 @@ class AdminVerifyUserView(APIView):
             )
 
 
-class UserRecommendationView(APIView):
+class UserRecommendationView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        profile = get_object_or_404(Profile, user=request.user)
-        verification = SkillVerification.objects.filter(user=request.user).order_by('-created_at').first()
+    async def get(self, request):
+        profile = await aget_object_or_404(Profile, user=request.user)
+        verification = await SkillVerification.objects.filter(user=request.user).order_by('-created_at').afirst()
 
         if not verification or not verification.gemini_recommendation:
             return Response({"error": "No recommendation available"}, status=status.HTTP_404_NOT_FOUND)
 
         return Response(verification.gemini_recommendation, status=status.HTTP_200_OK)
 
-class TestView(APIView):
+class TestView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     
-    def post(self, request):
+    async def post(self, request):
         """Generate a test, store it with correct answers, and return questions only."""
         try:
-            profile = get_object_or_404(Profile, user=request.user)
-            verification = SkillVerification.objects.filter(user=request.user).order_by('-created_at').first()
+            profile = await aget_object_or_404(Profile, user=request.user)
+            verification = await SkillVerification.objects.filter(user=request.user).order_by('-created_at').afirst()
             
             # Fallback if no verification analysis was done yet
             resume_analysis = verification.resume_analysis if verification else ""
@@ -125,7 +138,7 @@ class TestView(APIView):
             recommendation = verification.gemini_recommendation if verification else f"User profile skills: {profile.skills}"
 
             try:
-                test_data = generate_test(
+                test_data = await agenerate_test(
                     resume_analysis=resume_analysis,
                     github_analysis=github_analysis,
                     skills=profile.skills,
@@ -159,7 +172,7 @@ class TestView(APIView):
                     "answers": ["Writing clean, documented code", "Git"]
                 }
 
-            skill_test = SkillTest.objects.create(
+            skill_test = await SkillTest.objects.acreate(
                 user=request.user,
                 questions=test_data["questions"],
                 answers=test_data["answers"]
@@ -178,11 +191,11 @@ class TestView(APIView):
 
 
 
-class SubmitTestView(APIView):
+class SubmitTestView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, test_id):
-        skill_test = get_object_or_404(SkillTest, id=test_id, user=request.user)
+    async def post(self, request, test_id):
+        skill_test = await aget_object_or_404(SkillTest, id=test_id, user=request.user)
         user_answers = request.data.get("answers")
 
         if not isinstance(user_answers, list):
@@ -195,7 +208,7 @@ class SubmitTestView(APIView):
         result = "PASS" if percentage >= 60 else "FAIL"
 
         # Save test result
-        TestResult.objects.create(
+        await TestResult.objects.acreate(
             user=request.user,
             test=skill_test,
             score=score,
@@ -205,10 +218,10 @@ class SubmitTestView(APIView):
         )
 
         # Update verification status to PENDING after test
-        verification = SkillVerification.objects.filter(user=request.user).order_by('-created_at').first()
+        verification = await SkillVerification.objects.filter(user=request.user).order_by('-created_at').afirst()
         if verification:
             # Run final analysis
-            combined_analysis = final_analysis(
+            combined_analysis = await afinal_analysis(
                 resume_analysis=verification.resume_analysis,
                 github_analysis=verification.github_analysis,
                 previous_recommendation=verification.gemini_recommendation,
@@ -217,13 +230,13 @@ class SubmitTestView(APIView):
             )
             verification.gemini_recommendation = combined_analysis
             verification.verification_status = "PENDING"  
-            verification.save()
+            await verification.asave()
 
         
-        profile = Profile.objects.filter(user=request.user).first()
+        profile = await Profile.objects.filter(user=request.user).afirst()
         if profile:
             profile.verification_tag = "Unverified"
-            profile.save()
+            await profile.asave()
 
         return Response({
             "score": score,
@@ -231,9 +244,24 @@ class SubmitTestView(APIView):
             "percentage": percentage,
             "result": result
         }, status=status.HTTP_200_OK)
+def verification_validators(request):
+    # The status also shows the resume, GitHub URL and skills from the profile
+    row = (
+        SkillVerification.objects.filter(user=request.user).order_by("pk")
+        .values_list("pk", "updated_at", "user__profile__updated_at").first()
+    )
+    if row is None:
+        return None
+    pk, updated_at, profile_updated_at = row
+    last_modified = max(filter(None, [updated_at, profile_updated_at]))
+    return ("verification", pk, updated_at.isoformat(), profile_updated_at), last_modified
+
+
 class VerificationStatusView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional(verification_validators)
+    @read_from_replica
     def get(self, request):
         verification = SkillVerification.objects.filter(user=request.user).first()
         if not verification:
@@ -104,6 +104,8 @@ export default function AppliedProjectsPage() {
   const [applications, setApplications] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     if (isAuthenticated) {
@@ -168,6 +170,22 @@ export default function AppliedProjectsPage() {
   //     setLoading(false);
   //   }
   // };
+const cursorFrom = (url) => (url ? new URL(url).searchParams.get('cursor') : null);
+
+const loadMoreApplications = async () => {
+  try {
+    setLoadingMore(true);
+    const response = await projectAPI.getAppliedProjects(nextCursor);
+    setApplications(prev => [...prev, ...(response.results || [])]);
+    setNextCursor(cursorFrom(response.next));
+  } catch (error) {
+    console.error('Error fetching applied projects:', error);
+    setError('Failed to load your applications. Please try again.');
+  } finally {
+    setLoadingMore(false);
+  }
+};
+
 const fetchAppliedProjects = async () => {
   try {
     setLoading(true);
@@ -176,6 +194,7 @@ const fetchAppliedProjects = async () => {
 
     
     setApplications(response.results || []);
+    setNextCursor(cursorFrom(response.next));
 
     setError('');
   } catch (error) {
@@ -287,6 +306,17 @@ const fetchAppliedProjects = async () => {
             {applications.map((application) => (
               <ApplicationCard key={application.id} application={application} />
             ))}
+            {nextCursor && (
+              <div className="text-center">
+                <button
+                  onClick={loadMoreApplications}
+                  disabled={loadingMore}
+                  className="px-6 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
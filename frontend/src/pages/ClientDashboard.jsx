@@ -70,6 +70,11 @@ const ApplicantModal = ({ project, applicants, onClose }) => (
                                                         <FaStar className="mr-1" /> {applicant.profile.star_rating}
                                                     </div>
                                                 )}
+                                                {applicant.match_score != null && (
+                                                    <span className="text-neon-cyan text-xs font-bold">
+                                                        {Math.round(applicant.match_score * 100)}% match
+                                                    </span>
+                                                )}
                                             </div>
                                             <p className="text-sm text-gray-400 mb-4 font-light leading-relaxed max-w-2xl line-clamp-2">
                                                 {applicant.profile?.bio || 'No bio provided.'}
@@ -136,7 +141,7 @@ const ProjectRow = ({ project, onAction }) => (
         <td className="py-6 px-4 text-center">
             <div className="flex items-center justify-center space-x-2">
                 <FaUsers className="text-gray-400" />
-                <span className="text-white font-medium">{project.applicants?.length || 0}</span>
+                <span className="text-white font-medium">{project.applicant_count || 0}</span>
             </div>
         </td>
         <td className="py-6 px-4 text-center">
@@ -179,16 +184,21 @@ export default function ClientDashboard() {
     const [selectedProject, setSelectedProject] = useState(null);
     const [applicants, setApplicants] = useState([]);
     const [loadingApplicants, setLoadingApplicants] = useState(false);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         fetchClientProjects();
     }, []);
 
+    const cursorFrom = (url) => (url ? new URL(url).searchParams.get('cursor') : null);
+
     const fetchClientProjects = async () => {
         try {
             setLoading(true);
             const data = await projectAPI.getClientProjects();
-            setProjects(Array.isArray(data) ? data : []);
+            setProjects(data?.results || []);
+            setNextCursor(cursorFrom(data?.next));
         } catch (err) {
             console.error('Error fetching client projects:', err);
             setError('Failed to load your projects.');
@@ -197,12 +207,27 @@ export default function ClientDashboard() {
         }
     };
 
+    const loadMoreProjects = async () => {
+        try {
+            setLoadingMore(true);
+            const data = await projectAPI.getClientProjects(nextCursor);
+            setProjects(prev => [...prev, ...(data?.results || [])]);
+            setNextCursor(cursorFrom(data?.next));
+        } catch (err) {
+            console.error('Error fetching client projects:', err);
+            setError('Failed to load your projects.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleViewApplicants = async (project) => {
         try {
             setSelectedProject(project);
             setLoadingApplicants(true);
-            const data = await projectAPI.getProjectApplicants(project.id);
-            setApplicants(data);
+            // Best matches first; the endpoint is paginated
+            const data = await projectAPI.getProjectApplicants(project.id, { ordering: 'match' });
+            setApplicants(data?.results || []);
         } catch (err) {
             console.error('Error fetching applicants:', err);
             alert('Failed to load applicants.');
@@ -214,7 +239,7 @@ export default function ClientDashboard() {
     const stats = {
         total: projects.length,
         active: projects.filter(p => p.is_open).length,
-        totalApplicants: projects.reduce((acc, p) => acc + (p.applicants?.length || 0), 0)
+        totalApplicants: projects.reduce((acc, p) => acc + (p.applicant_count || 0), 0)
     };
 
     if (loading) return (
@@ -323,6 +348,17 @@ export default function ClientDashboard() {
                                 </tbody>
                             </table>
                         </div>
+                        {nextCursor && (
+                            <div className="flex justify-center py-6 border-t border-white/5">
+                                <button
+                                    onClick={loadMoreProjects}
+                                    disabled={loadingMore}
+                                    className="text-neon-cyan font-bold tracking-widest uppercase text-xs hover:glow disabled:opacity-50"
+                                >
+                                    {loadingMore ? 'Loading...' : 'Load more'}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 </ScrollReveal>
 
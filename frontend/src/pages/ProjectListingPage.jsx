@@ -164,7 +164,7 @@ export default function ProjectListingPage() {
     try {
       setLoading(true);
       const response = await projectAPI.getProjects(filters);
-      setProjects(response || []);
+      setProjects(response?.results || []);
       setError('');
     } catch (error) {
       console.error('Error fetching projects:', error);
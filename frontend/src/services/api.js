@@ -144,8 +144,10 @@ export const projectAPI = {
   },
 
 
-  getProjectApplicants: async (projectId) => {
-    return apiRequest(`/projects/${projectId}/applicants/`);
+  getProjectApplicants: async (projectId, params = {}) => {
+    const queryParams = new URLSearchParams(params).toString();
+    const endpoint = `/projects/${projectId}/applicants/`;
+    return apiRequest(queryParams ? `${endpoint}?${queryParams}` : endpoint);
   },
 
   createProject: async (projectData) => {
@@ -155,11 +157,11 @@ export const projectAPI = {
     });
   },
 
-  getClientProjects: async () => {
-    return apiRequest('/projects/');
+  getClientProjects: async (cursor) => {
+    return apiRequest(cursor ? `/projects/?cursor=${encodeURIComponent(cursor)}` : '/projects/');
   },
-  getAppliedProjects: async () => {
-    return apiRequest('/projects/applied/');
+  getAppliedProjects: async (cursor) => {
+    return apiRequest(cursor ? `/projects/applied/?cursor=${encodeURIComponent(cursor)}` : '/projects/applied/');
   },
 };
 